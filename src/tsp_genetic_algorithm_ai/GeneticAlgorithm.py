@@ -1,17 +1,48 @@
 import numpy as np
-import math
-import random
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
-from .distances_map import get_distances_map
+from .distance_matrix import build_distance_matrix, get_coordinates, paired_distances, METRICS
+from .dynamic import DistanceBuffer, cheapest_insertion, splice_out
+from .initialization import initial_population
+from .held_karp import held_karp, held_karp_memory, DEFAULT_MAX_MEMORY, EXACT_MAX_STOPS
+from .lower_bound import start_lower_bound
+from .split import split_giant_tour
+from .backends import get_backend, crossover_plan, mutation_plan, mutation_deltas, mutation_probabilities
+from .adaptive import AdaptiveParameters
+from .diversity import PopulationDiversity
+from .history import ConvergenceHistory, DEFAULT_MAX_POINTS
+from .duplicates import TourFingerprint, duplicate_mask, DUPLICATE_CONTROLS
+from .steady_state import FitnessIndex, MODELS, REPLACEMENTS
+from .memory_profile import NULL_PHASE
+from .restarts import StagnationMonitor, mutation_burst, RESTART_STRATEGIES
 from .mock_data import get_mock_data
 from .Route import Route
 
+# Gerações entre recálculos completos do fitness das populações: a avaliação incremental
+# (variações da mutação) acumula erro de arredondamento de geração em geração
+FITNESS_REFRESH_INTERVAL = 50
+
+
+class DeadlineReached(Exception):
+    """Sinaliza que o prazo da execução terminou no meio de uma geração."""
+
+
 class GeneticAlgorithm:
     def __init__(self, population_size, mutation_rate, crossover_rate, 
                  elitism_count=None, selection_method='roulette', 
                  tournament_size=None, num_populations=1, 
-                 migration_interval=10, migration_count=1):
+                 migration_interval=10, migration_count=1,
+                 locations=None, distance_matrix=None, distance_cache=None,
+                 demands=None, vehicle_capacity=None, max_route_length=None,
+                 adaptive=False, track_diversity=False, min_diversity=None,
+                 duplicate_control=None, backend='numpy', seed=None,
+                 initialization=None, solver='ga', lower_bound=None, target_gap=None,
+                 run_store=None, history_points=DEFAULT_MAX_POINTS, deadline=None,
+                 initial_tours=None, verbose=True, mutation_operators=None,
+                 model='generational', steady_state_offspring=2, replacement='worst',
+                 island_execution='threads', memory_profile=None, restart=None, restart_stagnation=None,
+                 restart_diversity=None, metric=None, detour_factor=1.0):
         """
         Inicializa os parâmetros do algoritmo genético.
         
@@ -24,90 +55,486 @@ class GeneticAlgorithm:
         :param num_populations: Número de populações (1 para modo single-population).
         :param migration_interval: Intervalo de gerações para migração (apenas para multi-population).
         :param migration_count: Número de indivíduos que migram de cada população (apenas para multi-population).
+        :param locations: Lista de locais (o primeiro é o depósito). Padrão: get_mock_data().
+        :param distance_matrix: Matriz (n, n) de distâncias na ordem de locations. Padrão: tabela explícita (distances_map).
+        :param distance_cache: DistanceMatrixCache usado para reaproveitar a matriz padrão entre execuções.
+        :param demands: Demanda de cada local, na ordem de locations (ativa o modo multi-veículo).
+        :param vehicle_capacity: Capacidade de cada veículo (modo multi-veículo).
+        :param max_route_length: Distância máxima de cada rota de veículo (modo multi-veículo, opcional).
+        :param adaptive: Se True, cada população ajusta suas taxas e o tamanho do torneio durante a execução.
+        :param track_diversity: Se True, calcula a diversidade de cada população a cada geração.
+        :param min_diversity: Encerra a execução quando a distância média de arestas de todas as populações fica abaixo deste valor (entre 0 e 1).
+        :param duplicate_control: Tratamento das rotas repetidas (perturb ou replace). Também avalia cada rota distinta uma única vez.
+        :param backend: Backend dos operadores (python, numpy ou uma instância). Ver backends.py.
+        :param seed: Semente do gerador aleatório (cada população recebe um gerador derivado dela).
+        :param initialization: Dicionário {estratégia: fração} com a semeadura heurística da população inicial
+            (nearest_neighbor, greedy_edge, space_filling_curve, random_insertion); o restante é aleatório.
+        :param solver: ga (algoritmo genético), exact (Held-Karp) ou auto (exato para instâncias pequenas).
+        :param lower_bound: Calcula o limite inferior de Held-Karp no início da execução (sync ou background,
+            em um processo separado) e informa o gap da melhor rota a cada geração.
+        :param target_gap: Encerra a execução quando o gap em relação ao limite inferior fica abaixo deste valor (ex.: 0.02).
+        :param run_store: RunStore onde cada execução (parâmetros, melhor rota, tempo e convergência) é registrada.
+        :param history_points: Número máximo de pontos do histórico de convergência (memória constante; None desativa).
+        :param deadline: Tempo máximo (s) de cada execução de run; o relógio é verificado entre as etapas de cada geração.
+        :param initial_tours: Rotas fechadas (índices, depósito nas pontas) incluídas na população inicial de cada população.
+        :param verbose: Se True, imprime o número de cada geração.
+        :param mutation_operators: Operador de mutação (swap, inversion ou insertion) ou dicionário {operador: peso}
+            com a probabilidade relativa de cada um (padrão: swap).
+        :param model: generational (a população inteira é substituída a cada geração) ou steady_state
+            (a cada passo poucos filhos substituem, no próprio array, os indivíduos escolhidos por replacement).
+        :param steady_state_offspring: Número de filhos de cada passo do modo steady_state (par).
+        :param replacement: Indivíduo substituído no modo steady_state: worst (o pior da população) ou
+            tournament (o perdedor de um torneio de tournament_size); o filho só entra se for melhor que ele.
+        :param island_execution: Execução das populações no modo multi-population: threads (uma tarefa por
+            população) ou stacked (todas as populações em um único array (populações, indivíduos, posições),
+            com cada fase vetorizada sobre todas elas; mesmos resultados do modo threads).
+        :param memory_profile: MemoryProfiler que mede a memória de cada fase a cada intervalo de gerações
+            (ver memory_profile.py); o registro da geração é passado ao callback em memory.
+        :param restart: Reinício parcial das populações estagnadas, mantendo as elites (max(1, elitism_count)):
+            reinitialize (o restante vira rotas aleatórias), mutation_burst (o restante sofre várias inversões)
+            ou reseed (o restante vira cópias perturbadas da melhor rota global).
+        :param restart_stagnation: Reinicia a população após este número de gerações sem melhora do seu melhor fitness.
+        :param restart_diversity: Reinicia a população quando sua distância média de arestas fica abaixo deste valor.
+        :param metric: Métrica de distance_matrix (haversine, euclidean ou explicit), usada nas distâncias dos locais
+            incluídos com add_location sem distances. Padrão: explicit sem distance_matrix, senão haversine.
+        :param detour_factor: Fator de desvio aplicado a distance_matrix, aplicado também aos locais incluídos.
         """
         self.population_size = population_size
         self.mutation_rate = mutation_rate
+        self.mutation_operators = mutation_operators
+        self.mutation_probabilities = None if mutation_operators is None else mutation_probabilities(mutation_operators)
         self.crossover_rate = crossover_rate
+        if model not in MODELS:
+            raise ValueError(f"model deve ser um de {MODELS}")
+        if replacement not in REPLACEMENTS:
+            raise ValueError(f"replacement deve ser um de {REPLACEMENTS}")
+        if steady_state_offspring < 2 or steady_state_offspring % 2:
+            raise ValueError("steady_state_offspring deve ser um número par maior ou igual a 2")
+        if island_execution not in ('threads', 'stacked'):
+            raise ValueError("island_execution deve ser threads ou stacked")
+        if island_execution == 'stacked' and model != 'generational':
+            raise ValueError("island_execution stacked exige model generational")
+        self.model = model
+        self.island_execution = island_execution
+        self.steady_state_offspring = steady_state_offspring
+        self.replacement = replacement
         self.elitism_count = elitism_count
         self.selection_method = selection_method
         self.tournament_size = tournament_size
         self.num_populations = num_populations
         self.migration_interval = migration_interval
         self.migration_count = migration_count
+        self.adaptive = adaptive
+        self.adaptive_parameters = None
+        if restart is not None and restart not in RESTART_STRATEGIES:
+            raise ValueError(f"restart deve ser um de {RESTART_STRATEGIES}")
+        if restart is not None and restart_stagnation is None and restart_diversity is None:
+            raise ValueError("restart exige restart_stagnation ou restart_diversity")
+        self.restart = restart
+        self.restart_stagnation = restart_stagnation
+        self.restart_diversity = restart_diversity
+        self.stagnation_monitor = None
+        self.track_diversity = track_diversity or min_diversity is not None or (
+            restart is not None and restart_diversity is not None)
+        self.min_diversity = min_diversity
+        self.diversity_trackers = []
+        self.replaced_rows = []  # Posições substituídas no próprio array desde a última medida (modo steady_state)
+
+        self.locations = list(locations) if locations is not None else get_mock_data()
+        if metric is None:
+            metric = 'explicit' if distance_matrix is None else 'haversine'
+        if metric not in METRICS:
+            raise ValueError(f"metric deve ser um de {METRICS}")
+        self.metric = metric
+        self.detour_factor = detour_factor
+        if distance_matrix is None:
+            distance_matrix = build_distance_matrix(self.locations, metric='explicit', cache=distance_cache)
+        self.distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+        # Índice de cada local (pelo id) na matriz de distâncias
+        self.location_index = {location.id: i for i, location in enumerate(self.locations)}
+        # Inserções e remoções de locais pendentes, aplicadas entre duas gerações
+        self.pending_changes = []
+        self.changes_lock = threading.Lock()
+        self.distance_buffer = None
+
+        self.backend = get_backend(backend)
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.rngs = []
+        self.initialization = initialization
+        if solver not in ('ga', 'exact', 'auto'):
+            raise ValueError("solver deve ser ga, exact ou auto")
+        self.solver = solver
+        if lower_bound is None and target_gap is not None:
+            lower_bound = 'background'
+        if lower_bound not in (None, 'sync', 'background'):
+            raise ValueError("lower_bound deve ser sync ou background")
+        self.lower_bound_mode = lower_bound
+        self.target_gap = target_gap
+        self.lower_bound = None
+        self.lower_bound_future = None
+        self.lower_bound_executor = None
+        self.run_store = run_store
+        self.memory_profile = memory_profile
+        self.memory_record = None
+        self.run_id = None
+        self.run_started = None
+        self.generations_run = 0
+        self.history_points = history_points
+        self.history = None
+        self.deadline = deadline
+        self.deadline_at = None
+        self.verbose = verbose
+
+        self.initial_tours = None
+        if initial_tours is not None:
+            self.initial_tours = np.array(initial_tours, dtype=np.intp, ndmin=2)
+            if self.initial_tours.shape[1] != len(self.locations) + 1 or len(self.initial_tours) > population_size:
+                raise ValueError("initial_tours deve ter no máximo population_size rotas fechadas com todos os locais")
+
+        # Modo multi-veículo: o cromossomo continua sendo uma rota gigante, decodificada pelo Split
+        self.demands = np.asarray(demands, dtype=np.float64) if demands is not None else None
+        self.vehicle_capacity = vehicle_capacity
+        self.max_route_length = max_route_length
+        if self.demands is not None and vehicle_capacity is None:
+            raise ValueError("vehicle_capacity é obrigatório quando demands é informado")
+        if self.demands is not None and self.lower_bound_mode is not None:
+            raise ValueError("O limite inferior não suporta o modo multi-veículo")
+        # fitness = fitness_reference - custo, com a referência acima do custo de qualquer rota da instância
+        self.fitness_reference = self.cost_upper_bound()
+
+        # Controle de duplicatas: hash das rotas (independente do sentido se a matriz for simétrica)
+        if duplicate_control is not None and duplicate_control not in DUPLICATE_CONTROLS:
+            raise ValueError(f"duplicate_control deve ser um de {DUPLICATE_CONTROLS}")
+        self.duplicate_control = duplicate_control
+        self.fingerprint = None
+        if duplicate_control is not None:
+            symmetric = bool(np.allclose(self.distance_matrix, self.distance_matrix.T))
+            self.fingerprint = TourFingerprint(len(self.locations), len(self.locations) + 1, symmetric=symmetric)
+        self.evaluations_saved = 0
+        self.evaluations = 0  # Filhos gerados (e avaliados) na execução atual
+        self.stats_lock = threading.Lock()
         
-        self.populations = []  # Lista de populações
-        self.best_individuals = []  # Lista dos melhores indivíduos de cada população
+        # Propriedade das rotas: cada população é dona de dois arrays (atual e reserva) que se alternam
+        # entre gerações; as melhores rotas (por população e global) são cópias somente leitura.
+        self.populations = []  # Lista de populações (arrays de índices, depósito nas pontas)
+        self.spare_populations = []  # Array reserva de cada população, reescrito na próxima geração
+        self.population_fitness = []  # Fitness de cada população atual (None quando precisa ser recalculado)
+        self.best_tours = []  # Lista das melhores rotas (índices) de cada população
+        self.best_individuals = []  # Lista dos melhores indivíduos (Route) de cada população
         self.best_fitnesses = []  # Lista dos melhores fitness de cada população
+        self.global_best_tour = None
         self.global_best_individual = None
         self.global_best_fitness = float('-inf')
         self.stop = None
+
+        # Modo stacked: array (populações, indivíduos, posições) de que self.populations (e os fitness de que
+        # self.population_fitness) são vistas; refeito quando as listas deixam de apontar para ele
+        self.population_stack = None
+        self.population_stack_views = ()
+        self.fitness_stack = None
+        self.fitness_stack_views = ()
+        self.spare_stack = None
         
         # Lock apenas para a migração (apenas para multi-population)
         self.migration_lock = threading.Lock() if num_populations > 1 else None
 
-    def maximum_route_distance_function(self):
+    def maximum_route_distance_function(self, population):
         """Função que retorna a distância máxima da rota."""
-        fitness_values = np.array([])
-        for route in self.current_population:
-            distance = 0
-            for i in range(len(route.locations)-1):
-                distance += get_distances_map(route.locations[i].name, route.locations[i+1].name)
-            fitness_values = np.append(fitness_values, distance)
-
-        fitness_values = 1000 - fitness_values
+        if self.fingerprint is not None:
+            # Avalia apenas a primeira ocorrência de cada rota distinta
+            _, first, inverse = np.unique(self.fingerprint(population), return_index=True, return_inverse=True)
+            with self.stats_lock:
+                self.evaluations_saved += len(population) - len(first)
+            fitness_values = self.tour_costs(population[first])[inverse]
+        else:
+            fitness_values = self.tour_costs(population)
+
+        fitness_values = self.fitness_reference - fitness_values
         return fitness_values
 
+    def cost_upper_bound(self):
+        """
+        Retorna um limite superior do custo de qualquer rota: cada local sai por uma aresta de no máximo a maior
+        distância da sua linha (no modo multi-veículo, o depósito sai uma vez por veículo, no máximo um por local).
+        """
+        row_max = self.distance_matrix.max(axis=1) if len(self.distance_matrix) else np.zeros(1)
+        bound = float(row_max.sum())
+        if self.demands is not None:
+            bound += max(len(row_max) - 2, 0) * float(row_max[0])
+        return bound
+
+    def fitness_distance(self, fitness):
+        """Converte um fitness no custo (distância) da rota correspondente."""
+        return float(self.fitness_reference - fitness)
+
+    def tour_costs(self, tours):
+        """Retorna o custo de cada rota (distância da rota ou, no modo multi-veículo, soma das rotas dos veículos)."""
+        if self.demands is not None:
+            return np.array([self.split_tour(tour)[0] for tour in tours])
+        return self.backend.fitness(self.distance_matrix, tours)
+
+    def make_route(self, tour):
+        """Converte uma rota de índices em um objeto Route."""
+        return Route([self.locations[i] for i in tour])
+
+    def split_tour(self, tour):
+        """Particiona uma rota gigante (com o depósito nas pontas) nas rotas dos veículos."""
+        return split_giant_tour(tour[1:-1], self.distance_matrix, self.demands, self.vehicle_capacity,
+                                self.max_route_length, depot=tour[0])
+
+    def decode_vehicle_routes(self, tour):
+        """Retorna a Route da rota gigante com as rotas de cada veículo preenchidas (modo multi-veículo)."""
+        total_distance, vehicle_tours = self.split_tour(tour)
+        depot = tour[0]
+
+        vehicle_routes = []
+        for vehicle_tour in vehicle_tours:
+            indices = np.array([[depot] + vehicle_tour + [depot]])
+            route = self.make_route(indices[0])
+            route.distance = float(self.backend.fitness(self.distance_matrix, indices)[0])
+            route.load = float(self.demands[vehicle_tour].sum())
+            vehicle_routes.append(route)
+
+        route = self.make_route(tour)
+        route.vehicle_routes = vehicle_routes
+        route.distance = total_distance
+        route.load = float(self.demands[tour[1:-1]].sum())
+        return route
+
     def initialize_populations(self):
         """Inicializa as populações"""
-        self.populations = []
-        for _ in range(self.num_populations):
-            population = []
-            locations = get_mock_data()
-            for _ in range(self.population_size):
-                # Cria uma cópia das locations exceto a primeira
-                remaining_locations = locations[1:].copy()
-                # Embaralha as locations restantes
-                random.shuffle(remaining_locations)
-                # Cria a rota com a primeira location no início e fim            
-                route = [locations[0]] + remaining_locations + [locations[0]]
-                population.append(Route(route))
-                
-            self.populations.append(population)
+        self.rngs = self.rng.spawn(self.num_populations)
+        coordinates = None
+        if all(location.has_coordinates() for location in self.locations):
+            coordinates = get_coordinates(self.locations)
+
+        # Rotas heurísticas (se configuradas) completadas por rotas aleatórias
+        self.populations = [
+            initial_population(self.distance_matrix, self.population_size, rng,
+                               self.initialization, coordinates)
+            for rng in self.rngs
+        ]
+        self.spare_populations = [None] * self.num_populations
+        self.population_fitness = [None] * self.num_populations
+        self.population_stack = self.fitness_stack = self.spare_stack = None
+        if self.initial_tours is not None and self.initial_tours.shape[1] == len(self.locations) + 1:
+            for population in self.populations:
+                population[:len(self.initial_tours)] = self.initial_tours
 
-    def fitness(self):
-        """Calcula a aptidão (fitness) da população atual."""
-        fitness_values = self.maximum_route_distance_function()
+    def fitness(self, population):
+        """Calcula a aptidão (fitness) de uma população."""
+        fitness_values = self.maximum_route_distance_function(population)
         return fitness_values
 
+    def island_parameters(self, population_idx):
+        """Retorna (taxa de mutação, taxa de cruzamento, tamanho do torneio) de uma população."""
+        if self.adaptive_parameters is not None:
+            return self.adaptive_parameters.parameters(population_idx)
+        return self.mutation_rate, self.crossover_rate, self.tournament_size
+
+    def offspring_buffer(self, population, population_idx):
+        """Retorna o array reserva da população (alocado apenas quando ainda não existe ou mudou de formato)."""
+        spare = self.spare_populations[population_idx] if population_idx < len(self.spare_populations) else None
+        if spare is None or spare.shape != population.shape or spare is population:
+            spare = np.empty_like(population)
+        return spare
+
+    def evolve(self, population, population_idx):
+        """
+        Aplica uma geração de operadores genéticos a uma população e retorna a nova população.
+
+        A população recebida não é alterada: os filhos são escritos no array reserva da população,
+        então as elites podem ser lidas diretamente dela no final, sem cópia prévia.
+        """
+        rng = self.rngs[population_idx]
+        fitness_values = self.population_fitness[population_idx]
+        if fitness_values is None:
+            fitness_values = self.fitness(population)
+        mutation_rate, crossover_rate, tournament_size = self.island_parameters(population_idx)
+
+        # Melhor indivíduo da população avaliada
+        self.record_population_best(population, fitness_values, np.argmax(fitness_values), population_idx)
+        self.check_deadline()
+
+        # Seleção e cruzamento: os índices dos pais são compostos com a ordem dos pares,
+        # e as linhas são copiadas uma única vez, direto para o array dos filhos
+        with self.memory_phase('selection'):
+            parents = self.select_indices(fitness_values, rng, tournament_size)
+            order, crosses = crossover_plan(len(parents), crossover_rate, rng)
+            offspring = np.take(population, parents[order], axis=0,
+                                out=self.offspring_buffer(population, population_idx))
+        with self.memory_phase('crossover'):
+            self.backend.recombine(offspring, crosses)
+        self.check_deadline()
+        if self.adaptive_parameters is not None:
+            mating_fitness_values = fitness_values[parents]
+
+        # Avaliação incremental: filhos de pares que não cruzaram herdam o fitness do pai, os cruzados
+        # são avaliados e a mutação soma apenas a variação das arestas alteradas
+        with self.memory_phase('evaluation'):
+            if self.demands is None:
+                new_fitness_values = fitness_values[parents[order]]
+                crossed = np.flatnonzero(np.repeat(crosses, 2))
+                if len(crossed):
+                    new_fitness_values[crossed] = self.fitness(offspring[crossed])
+        with self.memory_phase('mutation'):
+            plan = mutation_plan(*offspring.shape, mutation_rate, rng, self.mutation_probabilities)
+            if self.demands is None:
+                new_fitness_values[plan[0]] -= mutation_deltas(offspring, *plan, self.distance_matrix)
+            self.backend.mutate(offspring, *plan)
+            if self.duplicate_control is not None:
+                replaced = self.eliminate_duplicates(offspring, rng)
+                if self.demands is None and len(replaced):
+                    new_fitness_values[replaced] = self.fitness(offspring[replaced])
+        if self.demands is not None:
+            # No modo multi-veículo o custo depende da divisão em rotas: avaliação completa
+            with self.memory_phase('evaluation'):
+                new_fitness_values = self.fitness(offspring)
+        self.check_deadline()
+
+        if self.adaptive_parameters is not None:
+            # Sucesso medido contra os pais selecionados: isola o efeito de cruzamento e mutação
+            self.adaptive_parameters.update(population_idx, mating_fitness_values, new_fitness_values)
+
+        # Elitismo: os melhores indivíduos da população anterior substituem os piores filhos
+        with self.memory_phase('elitism'):
+            if self.elitism_count and self.elitism_count > 0:
+                elite_indices = np.argsort(fitness_values)[-self.elitism_count:]
+                worst_indices = np.argsort(new_fitness_values)[:self.elitism_count]
+                offspring[worst_indices] = population[elite_indices]
+                new_fitness_values[worst_indices] = fitness_values[elite_indices]
+
+        self.population_fitness[population_idx] = new_fitness_values
+        return offspring
+
+    def evolve_steady_state(self, population, population_idx):
+        """
+        Aplica uma geração do modo steady-state: ceil(P / steady_state_offspring) passos em que poucos pais
+        são selecionados e cada filho substitui, no próprio array, o indivíduo escolhido por replacement
+        (apenas se for melhor que ele). O pior e o melhor indivíduo são consultados em O(log P) (FitnessIndex).
+        """
+        rng = self.rngs[population_idx]
+        fitness_values = self.population_fitness[population_idx]
+        if fitness_values is None:
+            fitness_values = self.fitness(population)
+        mutation_rate, crossover_rate, tournament_size = self.island_parameters(population_idx)
+        index = FitnessIndex(fitness_values)
+        self.population_fitness[population_idx] = fitness_values
+        self.record_population_best(population, fitness_values, index.best(), population_idx)
+
+        # Controle de duplicatas: filhos já presentes na população são descartados
+        fingerprints = None
+        if self.duplicate_control is not None:
+            fingerprints = self.fingerprint(population)
+            present = {}
+            for fingerprint in fingerprints.tolist():
+                present[fingerprint] = present.get(fingerprint, 0) + 1
+
+        size = self.steady_state_offspring
+        steps = -(-len(population) // size)
+        # Sorteios de cruzamento e mutação da geração inteira feitos de uma vez (não dependem do fitness);
+        # a seleção é sorteada a cada passo, sobre a população já alterada pelos passos anteriores
+        crossings = rng.random(steps * size // 2) < crossover_rate
+        rows, first, second, operator = mutation_plan(steps * size, population.shape[1], mutation_rate, rng,
+                                                      self.mutation_probabilities)
+        bounds = np.searchsorted(rows, np.arange(0, steps * size + 1, size)).tolist()
+        mating, produced = [], []
+        for step in range(steps):
+            if self.deadline_passed():
+                # Os passos já aplicados ficam na população: registra o melhor antes de interromper
+                self.record_population_best(population, fitness_values, index.best(), population_idx)
+                raise DeadlineReached()
+            with self.memory_phase('selection'):
+                parents = self.select_indices(fitness_values, rng, tournament_size, size)
+                crosses = crossings[step * size // 2:(step + 1) * size // 2]
+                offspring = population[parents]
+            with self.memory_phase('crossover'):
+                self.backend.recombine(offspring, crosses)
+            start, end = bounds[step], bounds[step + 1]
+            plan = (rows[start:end] - step * size, first[start:end], second[start:end], operator[start:end])
+            with self.memory_phase('evaluation'):
+                if self.demands is None:
+                    offspring_fitness = fitness_values[parents]
+                    crossed = np.flatnonzero(np.repeat(crosses, 2))
+                    if len(crossed):
+                        offspring_fitness[crossed] = self.fitness(offspring[crossed])
+            with self.memory_phase('mutation'):
+                if self.demands is None and end > start:
+                    offspring_fitness[plan[0]] -= mutation_deltas(offspring, *plan, self.distance_matrix)
+                if end > start:
+                    self.backend.mutate(offspring, *plan)
+            if self.demands is not None:
+                with self.memory_phase('evaluation'):
+                    offspring_fitness = self.fitness(offspring)
+            if self.adaptive_parameters is not None:
+                mating.append(fitness_values[parents])
+                produced.append(offspring_fitness)
+
+            child_fingerprints = self.fingerprint(offspring).tolist() if fingerprints is not None else None
+            for child, child_fitness in enumerate(offspring_fitness.tolist()):
+                if child_fingerprints is not None and child_fingerprints[child] in present:
+                    continue
+                if self.replacement == 'worst':
+                    target = index.worst()
+                else:
+                    contestants = rng.integers(0, len(population), tournament_size or self.tournament_size or 2)
+                    target = contestants[np.argmin(fitness_values[contestants])]
+                if child_fitness <= fitness_values[target]:
+                    continue
+                if child_fingerprints is not None:
+                    replaced = int(fingerprints[target])
+                    present[replaced] -= 1
+                    if not present[replaced]:
+                        del present[replaced]
+                    fingerprints[target] = child_fingerprints[child]
+                    present[child_fingerprints[child]] = 1
+                population[target] = offspring[child]
+                fitness_values[target] = child_fitness
+                index.update(target, child_fitness)
+                if self.diversity_trackers:
+                    self.replaced_rows[population_idx].append(target)
+
+        with self.stats_lock:
+            self.evaluations += steps * size
+        if self.adaptive_parameters is not None:
+            self.adaptive_parameters.update(population_idx, np.concatenate(mating), np.concatenate(produced))
+        self.record_population_best(population, fitness_values, index.best(), population_idx)
+        return population
+
+    def record_population_best(self, population, fitness_values, best_idx, population_idx):
+        """Registra o melhor indivíduo de uma população (cópia somente leitura)."""
+        best_tour = population[best_idx].copy()
+        best_tour.flags.writeable = False
+        self.best_tours[population_idx] = best_tour
+        if self.demands is None:
+            # Fitness incremental: o melhor é reavaliado por completo antes de ser registrado
+            self.best_fitnesses[population_idx] = self.fitness(best_tour[None])[0]
+        else:
+            self.best_fitnesses[population_idx] = fitness_values[best_idx]
+        self.best_individuals[population_idx] = self.make_route(best_tour)
+
     def run_population(self, population_idx):
         """Executa o algoritmo genético para uma população específica"""
-        self.current_population = self.populations[population_idx]
-        fitness_values = self.fitness()
-        
-        # Elitismo: mantém os melhores indivíduos da população
-        if self.elitism_count and self.elitism_count > 0:
-            elite_indices = np.argsort(fitness_values)[-self.elitism_count:].tolist()
-            elite_individuals = [self.current_population[i] for i in elite_indices]
-        
-        # Aplica operações genéticas
-        self.selection(fitness_values)
-        self.crossover()
-        self.mutation()
-        
-        # Restaura os melhores indivíduos
-        if self.elitism_count and self.elitism_count > 0:
-            new_fitness_values = self.fitness()
-            worst_indices = np.argsort(new_fitness_values)[:self.elitism_count]
-            for i, idx in enumerate(worst_indices):
-                self.current_population[idx] = elite_individuals[i]
-        
-        # Atualiza a população
-        self.populations[population_idx] = self.current_population
-        
-        # Atualiza o melhor indivíduo da população
-        best_idx = np.argmax(fitness_values)
-        self.best_individuals[population_idx] = self.current_population[best_idx]
-        self.best_fitnesses[population_idx] = fitness_values[best_idx]
+        population = self.populations[population_idx]
+        if self.model == 'steady_state':
+            # Substituição no próprio array: não há população reserva
+            self.evolve_steady_state(population, population_idx)
+            return
+        self.populations[population_idx] = self.evolve(population, population_idx)
+        # A população anterior vira o array reserva da próxima geração
+        self.spare_populations[population_idx] = population
+        with self.stats_lock:
+            self.evaluations += len(population)
+
+    def refresh_fitness(self, generation):
+        """Recalcula por completo o fitness das populações a cada FITNESS_REFRESH_INTERVAL gerações."""
+        if self.demands is not None or generation % FITNESS_REFRESH_INTERVAL:
+            return
+        for population, fitness_values in zip(self.populations, self.population_fitness):
+            if fitness_values is not None:
+                # No próprio array: as linhas do modo stacked continuam apontando para ele
+                fitness_values[:] = self.fitness(population)
 
     def update_global_best(self):
         """Atualiza o melhor indivíduo global baseado nos melhores de cada população"""
@@ -116,8 +543,154 @@ class GeneticAlgorithm:
         
         # Só atualiza se o melhor fitness atual for melhor que o global
         if best_fitness > self.global_best_fitness:
-            self.global_best_individual = self.best_individuals[best_pop_idx]
+            # As melhores rotas são somente leitura: podem ser compartilhadas sem cópia
+            self.global_best_tour = self.best_tours[best_pop_idx]
             self.global_best_fitness = best_fitness
+            if self.demands is not None:
+                self.global_best_individual = self.decode_vehicle_routes(self.global_best_tour)
+            else:
+                self.global_best_individual = self.make_route(self.global_best_tour)
+
+    def stacked_populations(self):
+        """Retorna o array (populações, indivíduos, posições) do modo stacked, refeito se as populações mudaram."""
+        if (self.population_stack is None or len(self.populations) != len(self.population_stack_views)
+                or any(population is not view for population, view in zip(self.populations, self.population_stack_views))):
+            self.set_population_stack(np.stack(self.populations))
+        return self.population_stack
+
+    def set_population_stack(self, stack):
+        """Define o array do modo stacked e aponta self.populations para as suas linhas."""
+        self.population_stack = stack
+        self.populations = list(stack)
+        self.population_stack_views = tuple(self.populations)
+
+    def stacked_fitness(self, stack):
+        """Retorna o array (populações, indivíduos) de fitness do modo stacked, avaliando as populações sem fitness."""
+        if (self.fitness_stack is None or len(self.population_fitness) != len(self.fitness_stack_views)
+                or any(values is not view for values, view in zip(self.population_fitness, self.fitness_stack_views))):
+            missing = [idx for idx, values in enumerate(self.population_fitness) if values is None]
+            fitness_values = np.empty(stack.shape[:2])
+            if missing:
+                fitness_values[missing] = self.fitness(stack[missing].reshape(-1, stack.shape[2])).reshape(len(missing), -1)
+            for idx, values in enumerate(self.population_fitness):
+                if values is not None:
+                    fitness_values[idx] = values
+            self.set_fitness_stack(fitness_values)
+        return self.fitness_stack
+
+    def set_fitness_stack(self, fitness_values):
+        """Define o array de fitness do modo stacked e aponta self.population_fitness para as suas linhas."""
+        self.fitness_stack = fitness_values
+        self.population_fitness = list(fitness_values)
+        self.fitness_stack_views = tuple(self.population_fitness)
+
+    def evolve_stacked(self):
+        """
+        Aplica uma geração de operadores genéticos a todas as populações de uma vez (modo stacked).
+
+        Os sorteios de cada população usam o seu próprio gerador, na mesma ordem de evolve; avaliação,
+        cruzamento, mutação e elitismo são aplicados ao array (populações × indivíduos, posições) inteiro.
+        """
+        stack = self.stacked_populations()
+        fitness_values = self.stacked_fitness(stack)
+        num_populations, size, length = stack.shape
+        population_offsets = np.arange(num_populations)[:, None]
+
+        # Melhor indivíduo de cada população avaliada
+        for idx, best_idx in enumerate(np.argmax(fitness_values, axis=1)):
+            self.record_population_best(stack[idx], fitness_values[idx], best_idx, idx)
+        self.check_deadline()
+
+        # Sorteios de seleção, pares e mutação de cada população
+        with self.memory_phase('selection'):
+            sources, crossings, plans = [], [], []
+            for idx, rng in enumerate(self.rngs):
+                mutation_rate, crossover_rate, tournament_size = self.island_parameters(idx)
+                parents = self.select_indices(fitness_values[idx], rng, tournament_size)
+                order, crosses = crossover_plan(size, crossover_rate, rng)
+                sources.append(parents[order])
+                crossings.append(crosses)
+                rows, first, second, operator = mutation_plan(size, length, mutation_rate, rng,
+                                                              self.mutation_probabilities)
+                plans.append((rows + idx * size, first, second, operator))
+            # Índices dos pais no array achatado (populações × indivíduos)
+            sources = (np.stack(sources) + population_offsets * size).ravel()
+            crosses = np.stack(crossings)
+
+            spare = self.spare_stack
+            if spare is None or spare.shape != stack.shape or spare is stack:
+                spare = np.empty_like(stack)
+            offspring = spare.reshape(-1, length)
+            np.take(stack.reshape(-1, length), sources, axis=0, out=offspring)
+
+        # Cruzamento sobre todas as populações; com P ímpar o último indivíduo de cada população
+        # fica sem par, então os pares são cruzados em uma cópia sem ele
+        with self.memory_phase('crossover'):
+            if size % 2 == 0:
+                self.backend.recombine(offspring, crosses.ravel())
+            else:
+                paired = spare[:, :-1].reshape(-1, length)
+                self.backend.recombine(paired, crosses.ravel())
+                spare[:, :-1] = paired.reshape(num_populations, size - 1, length)
+        self.check_deadline()
+
+        # Avaliação incremental (ver evolve), com os planos de mutação concatenados
+        with self.memory_phase('evaluation'):
+            if self.demands is None:
+                new_fitness_values = fitness_values.ravel()[sources]
+                crossed_mask = np.zeros((num_populations, size), dtype=bool)
+                crossed_mask[:, :2 * (size // 2)] = np.repeat(crosses, 2, axis=1)
+                crossed = np.flatnonzero(crossed_mask)
+                if len(crossed):
+                    new_fitness_values[crossed] = self.fitness(offspring[crossed])
+        with self.memory_phase('mutation'):
+            rows, first, second, operator = (np.concatenate(columns) for columns in zip(*plans))
+            if self.demands is None:
+                new_fitness_values[rows] -= mutation_deltas(offspring, rows, first, second, operator,
+                                                            self.distance_matrix)
+            self.backend.mutate(offspring, rows, first, second, operator)
+            if self.duplicate_control is not None:
+                for idx, rng in enumerate(self.rngs):
+                    replaced = self.eliminate_duplicates(spare[idx], rng)
+                    if self.demands is None and len(replaced):
+                        new_fitness_values[idx * size + replaced] = self.fitness(spare[idx][replaced])
+        if self.demands is not None:
+            with self.memory_phase('evaluation'):
+                new_fitness_values = self.fitness(offspring)
+        new_fitness_values = new_fitness_values.reshape(num_populations, size)
+        self.check_deadline()
+
+        if self.adaptive_parameters is not None:
+            mating_fitness_values = fitness_values.ravel()[sources].reshape(num_populations, size)
+            for idx in range(num_populations):
+                self.adaptive_parameters.update(idx, mating_fitness_values[idx], new_fitness_values[idx])
+
+        # Elitismo de todas as populações de uma vez
+        with self.memory_phase('elitism'):
+            if self.elitism_count and self.elitism_count > 0:
+                elite_indices = np.argsort(fitness_values, axis=1)[:, -self.elitism_count:]
+                worst_indices = np.argsort(new_fitness_values, axis=1)[:, :self.elitism_count]
+                spare[population_offsets, worst_indices] = stack[population_offsets, elite_indices]
+                new_fitness_values[population_offsets, worst_indices] = fitness_values[population_offsets,
+                                                                                       elite_indices]
+
+        # O array anterior vira o reserva da próxima geração
+        self.spare_stack = stack
+        self.set_population_stack(spare)
+        self.set_fitness_stack(new_fitness_values)
+        with self.stats_lock:
+            self.evaluations += num_populations * size
+
+    def migrate_stacked(self):
+        """Realiza a migração em anel de todas as populações de uma vez (modo stacked)."""
+        self.update_global_best()
+        stack = self.stacked_populations()
+        fitness_values = self.stacked_fitness(stack)
+        population_offsets = np.arange(len(stack))[:, None]
+        # A população i recebe as melhores rotas da população i - 1 no lugar das suas piores
+        worst_indices = np.argsort(fitness_values, axis=1)[:, :self.migration_count]
+        stack[population_offsets, worst_indices] = np.roll(np.stack(self.best_tours), 1, axis=0)[:, None]
+        fitness_values[population_offsets, worst_indices] = np.roll(self.best_fitnesses, 1)[:, None]
 
     def migration(self):
         """Realiza migração periódica entre populações"""
@@ -128,234 +701,706 @@ class GeneticAlgorithm:
             # Atualiza o melhor global antes da migração
             self.update_global_best()
             
-            # Cria uma cópia dos melhores indivíduos
-            migrants = self.best_individuals.copy()
-            
-            # Realiza a "dança de cadeiras"
+            # Realiza a "dança de cadeiras" (as melhores rotas são somente leitura e copiadas na atribuição)
             for i in range(self.num_populations):
                 target_pop = (i + 1) % self.num_populations
                 # Substitui os piores indivíduos da população alvo
-                self.current_population = self.populations[target_pop]
-                fitness_values = self.fitness()
+                fitness_values = self.population_fitness[target_pop]
+                if fitness_values is None:
+                    fitness_values = self.fitness(self.populations[target_pop])
+                    self.population_fitness[target_pop] = fitness_values
                 worst_indices = np.argsort(fitness_values)[:self.migration_count]
-                
-                for idx in worst_indices:
-                    self.populations[target_pop][idx] = migrants[i]
+                self.populations[target_pop][worst_indices] = self.best_tours[i]
+                fitness_values[worst_indices] = self.best_fitnesses[i]
+                if self.diversity_trackers:
+                    self.replaced_rows[target_pop].extend(worst_indices.tolist())
+
+    def add_location(self, location, distances=None, demand=None):
+        """
+        Agenda a inclusão de um local; pode ser chamado durante a execução (de outra thread).
+
+        :param location: Location a incluir (id ainda não usado).
+        :param distances: Dicionário {id: distância} com as distâncias até os demais locais (simétricas),
+            ou um par de dicionários (saída, chegada). Padrão: calculadas pelas coordenadas, com a métrica
+            e o fator de desvio da instância (metric e detour_factor).
+        :param demand: Demanda do local (obrigatória no modo multi-veículo).
+        """
+        if distances is None:
+            if self.metric not in ('haversine', 'euclidean'):
+                raise ValueError(f"A instância usa a métrica {self.metric}: informe distances")
+            if not location.has_coordinates():
+                raise ValueError("Informe distances ou as coordenadas do local")
+        if self.demands is not None and demand is None:
+            raise ValueError("demand é obrigatório no modo multi-veículo")
+        # A validação é feita aqui, antes da execução: um erro ao aplicar a alteração perderia as populações
+        with self.changes_lock:
+            added = [change[1] for change in self.pending_changes if change[0] == 'add']
+            if location.id in self.location_index or location.id in {other.id for other in added}:
+                raise ValueError(f"Já existe um local com id {location.id}")
+            others = self.locations + added
+            if distances is None:
+                missing = [other.id for other in others if not other.has_coordinates()]
+                if missing:
+                    raise ValueError(f"Locais sem coordenadas na instância ({missing[:5]}): informe distances")
+            else:
+                for table in (distances if isinstance(distances, tuple) else (distances,)):
+                    missing = [other.id for other in others if other.id not in table]
+                    if missing:
+                        raise ValueError(f"Distância até o local {missing[0]} não informada para {location}")
+            self.pending_changes.append(('add', location, distances, demand))
+
+    def remove_location(self, location_id):
+        """
+        Agenda a remoção de um local; pode ser chamado durante a execução (de outra thread).
+
+        :param location_id: Id do local a remover (o depósito não pode ser removido).
+        """
+        if self.location_index.get(location_id) == 0:
+            raise ValueError("O depósito não pode ser removido")
+        # Mesma validação antecipada de add_location: ids desconhecidos não entram na fila
+        with self.changes_lock:
+            current = set(self.location_index)
+            for change in self.pending_changes:
+                if change[0] == 'add':
+                    current.add(change[1].id)
+                else:
+                    current.discard(change[1])
+            if location_id not in current:
+                raise ValueError(f"Não existe local com id {location_id}")
+            self.pending_changes.append(('remove', location_id))
+
+    def location_distances(self, location, distances):
+        """Retorna as distâncias (saída, chegada) entre um novo local e os locais atuais."""
+        if distances is None:
+            row = paired_distances(get_coordinates(self.locations), (location.latitude, location.longitude),
+                                   self.metric) * self.detour_factor
+            return row, row
+        outgoing, incoming = distances if isinstance(distances, tuple) else (distances, distances)
+        try:
+            return (np.array([outgoing[other.id] for other in self.locations], dtype=np.float64),
+                    np.array([incoming[other.id] for other in self.locations], dtype=np.float64))
+        except KeyError as error:
+            raise ValueError(f"Distância até o local {error.args[0]} não informada para {location}") from None
+
+    def apply_location_changes(self):
+        """
+        Aplica as inclusões e remoções pendentes e repara as populações sem reiniciar a evolução:
+        novos locais entram na posição de menor acréscimo de cada rota e locais removidos são retirados
+        ligando seus vizinhos.
+
+        :return: Número de alterações aplicadas.
+        """
+        with self.changes_lock:
+            changes, self.pending_changes = self.pending_changes, []
+        if not changes:
+            return 0
+
+        if self.distance_buffer is None:
+            # Reserva só as inclusões pendentes: a capacidade cresce sob demanda nas próximas
+            added = sum(change[0] == 'add' for change in changes)
+            self.distance_buffer = DistanceBuffer(self.distance_matrix, capacity=len(self.distance_matrix) + added)
+
+        tours = self.populations + [tour[None] for tour in self.best_tours if tour is not None]
+        if self.global_best_tour is not None:
+            tours.append(self.global_best_tour[None])
+
+        for change in changes:
+            if change[0] == 'add':
+                _, location, distances, demand = change
+                outgoing, incoming = self.location_distances(location, distances)
+                node = self.distance_buffer.add(outgoing, incoming)
+                self.distance_matrix = self.distance_buffer.matrix
+                self.locations.append(location)
+                if self.demands is not None:
+                    self.demands = np.append(self.demands, demand)
+                tours = [cheapest_insertion(group, self.distance_matrix, node) for group in tours]
+            else:
+                node = self.location_index.get(change[1])
+                if node is None:
+                    continue
+                moved = self.distance_buffer.remove(node)
+                self.distance_matrix = self.distance_buffer.matrix
+                self.locations[node] = self.locations[moved]
+                self.locations.pop()
+                if self.demands is not None:
+                    self.demands[node] = self.demands[moved]
+                    self.demands = self.demands[:-1]
+                tours = [splice_out(group, node, moved) for group in tours]
+            self.location_index = {location.id: i for i, location in enumerate(self.locations)}
+
+        self.populations = tours[:len(self.populations)]
+        repaired_bests = iter(tours[len(self.populations):])
+        for repaired in tours[len(self.populations):]:
+            repaired.flags.writeable = False
+        self.best_tours = [next(repaired_bests)[0] if tour is not None else None for tour in self.best_tours]
+
+        # As distâncias mudaram: os fitness e as estruturas dependentes do número de locais são refeitos
+        num_locations = len(self.locations)
+        self.fitness_reference = self.cost_upper_bound()
+        self.population_fitness = [None] * len(self.populations)
+        if self.fingerprint is not None:
+            self.fingerprint = TourFingerprint(num_locations, num_locations + 1, symmetric=self.fingerprint.symmetric)
+        if self.diversity_trackers:
+            self.diversity_trackers = [PopulationDiversity(num_locations) for _ in range(self.num_populations)]
+            self.replaced_rows = [[] for _ in range(self.num_populations)]
+            self.update_diversity()
+        for idx, tour in enumerate(self.best_tours):
+            if tour is not None:
+                self.best_fitnesses[idx] = self.fitness(tour[None])[0]
+                self.best_individuals[idx] = self.make_route(tour)
+        if self.global_best_tour is not None:
+            self.global_best_tour = next(repaired_bests)[0]
+            self.global_best_fitness = self.fitness(self.global_best_tour[None])[0]
+            if self.demands is not None:
+                self.global_best_individual = self.decode_vehicle_routes(self.global_best_tour)
+            else:
+                self.global_best_individual = self.make_route(self.global_best_tour)
+        if self.lower_bound is not None or self.lower_bound_future is not None:
+            self.stop_lower_bound()
+            self.start_lower_bound()
+
+        return len(changes)
 
     def run_single_population(self, generations, update_callback=None):
         """Executa o algoritmo genético em modo single-population"""
-        self.current_population = self.populations[0]
-        
         for generation in range(generations):
-            if self.stop and self.stop():
+            if (self.stop and self.stop()) or self.deadline_passed():
                 break
+            self.apply_location_changes()
+            self.begin_memory_generation(generation + 1)
 
-            print(f"Geração {generation + 1}")
-            
-            # Calcula a aptidão
-            fitness_values = self.fitness()
-            
-            # Elitismo: mantém os melhores indivíduos
-            if self.elitism_count and self.elitism_count > 0:
-                elite_indices = np.argsort(fitness_values)[-self.elitism_count:].tolist()
-                elite_individuals = [self.current_population[i] for i in elite_indices]
-            
-            # Aplica operações genéticas
-            self.selection(fitness_values)
-            self.crossover()
-            self.mutation()
-            
-            # Restaura os melhores indivíduos
-            if self.elitism_count and self.elitism_count > 0:
-                new_fitness_values = self.fitness()
-                worst_indices = np.argsort(new_fitness_values)[:self.elitism_count]
-                for i, idx in enumerate(worst_indices):
-                    self.current_population[idx] = elite_individuals[i]
+            if self.verbose:
+                print(f"Geração {generation + 1}")
+            self.evaluations_saved = 0
             
-            # Atualiza o melhor indivíduo
-            best_idx = np.argmax(fitness_values)
-            self.best_individuals[0] = self.current_population[best_idx]
-            self.best_fitnesses[0] = fitness_values[best_idx]
+            try:
+                self.run_population(0)
+            except DeadlineReached:
+                # A população não foi alterada; a melhor rota avaliada já foi registrada
+                self.update_global_best()
+                break
             
             # Atualiza o melhor global
             self.update_global_best()
+            self.update_diversity()
+            self.apply_restarts(generation + 1)
+            self.refresh_fitness(generation + 1)
             
-            if update_callback:
-                update_callback(
-                    generation=generation + 1,
-                    best_individuals=self.best_individuals,
-                    best_fitnesses=self.best_fitnesses,
-                    global_best_individual=self.global_best_individual,
-                    global_best_fitness=self.global_best_fitness
-                )
+            self.record_generation(generation + 1)
+            self.notify_generation(generation + 1, update_callback)
+
+            if self.diversity_converged() or self.gap_reached():
+                break
+
+        return self.global_best_individual, self.global_best_fitness
+
+    def callback_data(self, generation):
+        """Monta os argumentos passados ao update_callback ao final de cada geração."""
+        data = {
+            "generation": generation,
+            "best_individuals": self.best_individuals,
+            "best_fitnesses": self.best_fitnesses,
+            "global_best_individual": self.global_best_individual,
+            "global_best_fitness": self.global_best_fitness,
+            "global_best_distance": self.fitness_distance(self.global_best_fitness),
+        }
+        if self.adaptive_parameters is not None:
+            data["parameters"] = self.adaptive_parameters.snapshot()
+        if self.fingerprint is not None:
+            data["evaluations_saved"] = self.evaluations_saved
+        if self.diversity_trackers:
+            data["diversity"] = [tracker.metrics() for tracker in self.diversity_trackers]
+        if self.history is not None:
+            data["history"] = self.history
+        if self.lower_bound_mode is not None:
+            data["lower_bound"] = self.current_lower_bound()
+            data["gap"] = self.gap()
+        if self.memory_profile is not None:
+            data["memory"] = self.memory_record
+        if self.stagnation_monitor is not None:
+            data["restarts"] = list(self.stagnation_monitor.counts)
+        return data
+
+    def memory_phase(self, name):
+        """Retorna o contexto de medição de memória de uma fase (sem efeito fora das gerações perfiladas)."""
+        if self.memory_profile is None:
+            return NULL_PHASE
+        return self.memory_profile.phase(name)
+
+    def begin_memory_generation(self, generation):
+        """Inicia a medição de memória da geração (se configurada e no intervalo do MemoryProfiler)."""
+        self.memory_record = None
+        if self.memory_profile is not None:
+            self.memory_profile.begin_generation(generation)
+
+    def notify_generation(self, generation, update_callback=None):
+        """Fecha as medidas de memória da geração, chama o update_callback (fase callback) e grava o registro."""
+        if self.memory_profile is not None:
+            self.memory_record = self.memory_profile.end_generation(self.island_bytes())
+        if update_callback:
+            with self.memory_phase('callback'):
+                update_callback(**self.callback_data(generation))
+        if self.memory_profile is not None:
+            self.memory_profile.write()
+
+    def island_bytes(self):
+        """Retorna os bytes ocupados pelos arrays de cada população (atual, reserva, fitness e melhor rota)."""
+        sizes = []
+        for idx, population in enumerate(self.populations):
+            spare = self.spare_populations[idx] if idx < len(self.spare_populations) else None
+            if self.spare_stack is not None and idx < len(self.spare_stack):
+                spare = self.spare_stack[idx]
+            arrays = (population, spare, self.population_fitness[idx] if idx < len(self.population_fitness) else None,
+                      self.best_tours[idx] if idx < len(self.best_tours) else None)
+            sizes.append(sum(array.nbytes for array in arrays if array is not None))
+        return sizes
+
+    def start_lower_bound(self):
+        """Inicia o cálculo do limite inferior (no processo atual ou em segundo plano)."""
+        self.lower_bound = None
+        self.lower_bound_future = None
+        if self.lower_bound_mode == 'sync':
+            self.lower_bound, _ = start_lower_bound(self.distance_matrix, background=False)
+        elif self.lower_bound_mode == 'background':
+            self.lower_bound_future, self.lower_bound_executor = start_lower_bound(self.distance_matrix)
+
+    def stop_lower_bound(self):
+        """Encerra o processo do limite inferior sem esperar um cálculo ainda em andamento."""
+        if self.lower_bound_executor is not None:
+            self.lower_bound_executor.shutdown(wait=False, cancel_futures=True)
+            self.lower_bound_executor = None
+
+    def current_lower_bound(self):
+        """Retorna o limite inferior, ou None enquanto o cálculo em segundo plano não terminou."""
+        if self.lower_bound is None and self.lower_bound_future is not None and self.lower_bound_future.done():
+            self.lower_bound = self.lower_bound_future.result()
+            self.lower_bound_future = None
+        return self.lower_bound
+
+    def gap(self):
+        """Retorna o gap relativo da melhor rota global em relação ao limite inferior."""
+        bound = self.current_lower_bound()
+        if bound is None or bound <= 0 or self.global_best_tour is None:
+            return None
+        return max(0.0, float((self.fitness_distance(self.global_best_fitness) - bound) / bound))
+
+    def gap_reached(self):
+        """Indica se a melhor rota está dentro do gap alvo em relação ao limite inferior."""
+        if self.target_gap is None:
+            return False
+        gap = self.gap()
+        return gap is not None and gap <= self.target_gap
+
+    def update_diversity(self):
+        """Sincroniza as medidas de diversidade com as populações atuais (apenas as rotas alteradas)."""
+        for idx, (tracker, population) in enumerate(zip(self.diversity_trackers, self.populations)):
+            if self.model == 'steady_state':
+                # Substituição no próprio array: só as posições substituídas são comparadas
+                rows, self.replaced_rows[idx] = self.replaced_rows[idx], []
+                tracker.update(population, rows)
+            else:
+                # Modo generational: a população inteira foi substituída
+                tracker.update(population)
+
+    def apply_restarts(self, generation):
+        """Reinicia parcialmente as populações estagnadas ou com pouca diversidade (entre duas gerações)."""
+        if self.stagnation_monitor is None:
+            return
+        diversities = None
+        if self.restart_diversity is not None:
+            diversities = [tracker.mean_edge_distance() for tracker in self.diversity_trackers]
+        for population_idx, reason in self.stagnation_monitor.triggers(generation, self.best_fitnesses, diversities):
+            rows = self.restart_population(population_idx)
+            self.stagnation_monitor.record(generation, population_idx, self.restart, reason,
+                                           self.best_fitnesses[population_idx])
+            if self.diversity_trackers:
+                self.diversity_trackers[population_idx].update(self.populations[population_idx], rows)
+            if self.verbose:
+                print(f"Reinício da população {population_idx + 1} ({self.restart}, {reason}) na geração {generation}")
+
+    def restart_population(self, population_idx):
+        """Reinicia uma população mantendo as elites (no próprio array) e retorna as posições reiniciadas."""
+        population = self.populations[population_idx]
+        rng = self.rngs[population_idx]
+        fitness_values = self.population_fitness[population_idx]
+        if fitness_values is None:
+            fitness_values = self.fitness(population)
+        keep = min(max(1, self.elitism_count or 0), len(population))
+        rest = np.sort(np.argsort(fitness_values)[:len(population) - keep])
+        if len(rest) == 0:
+            return rest
+
+        if self.restart == 'reinitialize':
+            population[rest, 1:-1] = rng.permuted(population[rest, 1:-1], axis=1)
+        else:
+            source = population[rest] if self.restart == 'mutation_burst' else np.repeat(
+                self.global_best_tour[None], len(rest), axis=0)
+            population[rest] = mutation_burst(source, rng, self.backend)
+
+        # O fitness é mantido no próprio array (no modo stacked ele é uma vista do array de todas as populações)
+        if self.population_fitness[population_idx] is not None:
+            self.population_fitness[population_idx][rest] = self.fitness(population[rest])
+        return rest
+
+    def inject_tours(self, tours):
+        """Substitui os piores indivíduos de cada população por rotas externas (no próprio array, entre duas gerações)."""
+        tours = np.array(tours, dtype=np.intp, ndmin=2)
+        if tours.shape[1] != len(self.locations) + 1:
+            raise ValueError("As rotas injetadas devem ser rotas fechadas com todos os locais")
+        tour_fitness = self.fitness(tours)
+        for population_idx, population in enumerate(self.populations):
+            fitness_values = self.population_fitness[population_idx]
+            if fitness_values is None:
+                fitness_values = self.fitness(population)
+                self.population_fitness[population_idx] = fitness_values
+            count = min(len(tours), len(population))
+            worst_indices = np.argsort(fitness_values)[:count]
+            population[worst_indices] = tours[:count]
+            fitness_values[worst_indices] = tour_fitness[:count]
+            if self.diversity_trackers:
+                self.diversity_trackers[population_idx].update(population, worst_indices)
+            best_idx = int(np.argmax(fitness_values))
+            if fitness_values[best_idx] > self.best_fitnesses[population_idx]:
+                self.record_population_best(population, fitness_values, best_idx, population_idx)
+        self.update_global_best()
+
+    def diversity_converged(self):
+        """Indica se todas as populações ficaram abaixo da diversidade mínima configurada."""
+        if self.min_diversity is None or not self.diversity_trackers:
+            return False
+        return all(tracker.mean_edge_distance() < self.min_diversity for tracker in self.diversity_trackers)
+
+    def use_exact_solver(self):
+        """Indica se a execução deve usar o solver exato (Held-Karp) em vez do algoritmo genético."""
+        if self.solver == 'ga' or self.demands is not None:
+            return False
+        if self.solver == 'exact':
+            return True
+        num_locations = len(self.locations)
+        return num_locations - 1 <= EXACT_MAX_STOPS and held_karp_memory(num_locations) <= DEFAULT_MAX_MEMORY
+
+    def run_exact(self, update_callback=None):
+        """Resolve a instância de forma exata com Held-Karp"""
+        if self.demands is not None:
+            raise ValueError("O solver exato não suporta o modo multi-veículo")
+
+        distance, tour = held_karp(self.distance_matrix)
+        self.global_best_tour = tour
+        self.global_best_fitness = self.fitness_reference - distance
+        self.global_best_individual = self.make_route(tour)
+        self.best_tours = [tour.copy() for _ in range(self.num_populations)]
+        self.best_individuals = [self.global_best_individual] * self.num_populations
+        self.best_fitnesses = [self.global_best_fitness] * self.num_populations
+
+        self.record_generation(1)
+        self.notify_generation(1, update_callback)
 
         return self.global_best_individual, self.global_best_fitness
 
+    def run_parameters(self):
+        """Retorna os parâmetros da execução (registrados no RunStore)."""
+        return {
+            "population_size": self.population_size,
+            "mutation_rate": self.mutation_rate,
+            "mutation_operators": self.mutation_operators,
+            "model": self.model,
+            "steady_state_offspring": self.steady_state_offspring,
+            "replacement": self.replacement,
+            "island_execution": self.island_execution,
+            "restart": self.restart,
+            "restart_stagnation": self.restart_stagnation,
+            "restart_diversity": self.restart_diversity,
+            "crossover_rate": self.crossover_rate,
+            "elitism_count": self.elitism_count,
+            "selection_method": self.selection_method,
+            "tournament_size": self.tournament_size,
+            "num_populations": self.num_populations,
+            "migration_interval": self.migration_interval,
+            "migration_count": self.migration_count,
+            "adaptive": self.adaptive,
+            "duplicate_control": self.duplicate_control,
+            "backend": self.backend.name,
+            "initialization": self.initialization,
+            "solver": self.solver,
+            "vehicle_capacity": self.vehicle_capacity,
+            "max_route_length": self.max_route_length,
+        }
+
+    def deadline_passed(self):
+        """Indica se o prazo da execução (deadline) terminou."""
+        return self.deadline_at is not None and time.perf_counter() >= self.deadline_at
+
+    def check_deadline(self):
+        """Interrompe a geração em andamento (DeadlineReached) se o prazo terminou."""
+        if self.deadline_passed():
+            raise DeadlineReached()
+
+    def start_run_record(self):
+        """Registra o início da execução no RunStore (se configurado)."""
+        self.run_started = time.perf_counter()
+        self.evaluations = 0
+        self.deadline_at = self.run_started + self.deadline if self.deadline is not None else None
+        self.generations_run = 0
+        if self.history_points is not None:
+            # Séries: melhor distância global seguida da melhor distância de cada população. Distâncias, e não
+            # fitness: a referência do fitness muda ao adicionar ou remover locais, o que mudaria a escala dos pontos antigos
+            self.history = ConvergenceHistory(1 + self.num_populations, self.history_points)
+        if self.run_store is not None:
+            from .run_store import instance_key
+
+            self.run_id = self.run_store.start_run(instance_key(self.locations, self.distance_matrix),
+                                                   self.run_parameters(), self.seed)
+
+    def record_generation(self, generation):
+        """Registra a geração no histórico de convergência e a enfileira no RunStore (gravado em segundo plano)."""
+        self.generations_run = generation
+        if self.history is not None:
+            self.history.append(generation, [self.fitness_distance(fitness)
+                                             for fitness in [self.global_best_fitness, *self.best_fitnesses]])
+        if self.run_store is not None and self.global_best_tour is not None:
+            self.run_store.record_generation(self.run_id, generation, self.fitness_distance(self.global_best_fitness),
+                                             time.perf_counter() - self.run_started)
+
+    def finish_run_record(self):
+        """Registra o resultado da execução no RunStore."""
+        if self.run_store is None or self.global_best_tour is None:
+            return
+        # Ids numéricos do NumPy não são serializáveis em JSON
+        ids = [self.locations[i].id for i in self.global_best_tour]
+        ids = [int(location_id) if isinstance(location_id, (int, np.integer)) else str(location_id) for location_id in ids]
+        self.run_store.finish_run(self.run_id, ids,
+                                  self.fitness_distance(self.global_best_fitness), time.perf_counter() - self.run_started,
+                                  self.generations_run)
+
     def run(self, generations, update_callback=None):
         """Executa o algoritmo genético"""
-        self.initialize_populations()
+        self.start_run_record()
+        if self.memory_profile is not None:
+            self.memory_profile.start()
+        try:
+            result = self.run_solver(generations, update_callback)
+        except BaseException:
+            # Um erro ao registrar a execução interrompida não pode mascarar a exceção original
+            try:
+                self.finish_run_record()
+            except Exception:
+                pass
+            raise
+        finally:
+            if self.memory_profile is not None:
+                self.memory_profile.stop()
+        self.finish_run_record()
+        return result
+
+    def run_solver(self, generations, update_callback=None):
+        """Executa o solver configurado (exato ou algoritmo genético)"""
+        if self.use_exact_solver():
+            return self.run_exact(update_callback)
+
+        self.rng = np.random.default_rng(self.seed)
+        self.populations = []
+        self.best_tours = []
+        self.global_best_tour = None
+        self.lower_bound = None
+        self.lower_bound_future = None
+        self.apply_location_changes()
+        self.begin_memory_generation(0)
+        with self.memory_phase('initialize_populations'):
+            self.initialize_populations()
+        if self.adaptive:
+            self.adaptive_parameters = AdaptiveParameters(
+                self.num_populations, self.mutation_rate, self.crossover_rate,
+                self.tournament_size, self.population_size
+            )
+        if self.track_diversity:
+            self.diversity_trackers = [PopulationDiversity(len(self.locations)) for _ in range(self.num_populations)]
+            self.replaced_rows = [[] for _ in range(self.num_populations)]
+        if self.restart is not None:
+            self.stagnation_monitor = StagnationMonitor(self.num_populations, self.restart_stagnation,
+                                                        self.restart_diversity)
+        self.best_tours = [None] * self.num_populations
         self.best_individuals = [None] * self.num_populations
         self.best_fitnesses = [float('-inf')] * self.num_populations
         self.global_best_fitness = float('-inf')
+        self.global_best_tour = None
         self.global_best_individual = None
+        self.notify_generation(0)
         
-        # Se for single-population, usa o modo mais simples
-        if self.num_populations == 1:
-            return self.run_single_population(generations, update_callback)
-        
-        # Modo multi-population com execução paralela
+        self.start_lower_bound()
+        try:
+            # Se for single-population, usa o modo mais simples
+            if self.num_populations == 1:
+                return self.run_single_population(generations, update_callback)
+            if self.island_execution == 'stacked':
+                return self.run_stacked_populations(generations, update_callback)
+            return self.run_multi_population(generations, update_callback)
+        finally:
+            self.stop_lower_bound()
+
+    def run_stacked_populations(self, generations, update_callback=None):
+        """Executa o algoritmo genético em modo multi-population, com todas as populações em um único array"""
+        for generation in range(generations):
+            if (self.stop and self.stop()) or self.deadline_passed():
+                break
+            self.apply_location_changes()
+            self.begin_memory_generation(generation + 1)
+
+            if self.verbose:
+                print(f"Geração {generation + 1}")
+            self.evaluations_saved = 0
+
+            try:
+                self.evolve_stacked()
+            except DeadlineReached:
+                # As populações não foram alteradas; as melhores rotas avaliadas já foram registradas
+                self.update_global_best()
+                break
+
+            self.update_global_best()
+            if (generation + 1) % self.migration_interval == 0:
+                with self.memory_phase('migration'):
+                    self.migrate_stacked()
+            self.update_diversity()
+            self.apply_restarts(generation + 1)
+            self.refresh_fitness(generation + 1)
+
+            self.record_generation(generation + 1)
+            self.notify_generation(generation + 1, update_callback)
+
+            if self.diversity_converged() or self.gap_reached():
+                break
+
+        return self.global_best_individual, self.global_best_fitness
+
+    def run_multi_population(self, generations, update_callback=None):
+        """Executa o algoritmo genético em modo multi-population, com as populações em paralelo"""
         with ThreadPoolExecutor(max_workers=self.num_populations) as executor:
             for generation in range(generations):
-                if self.stop and self.stop():
+                if (self.stop and self.stop()) or self.deadline_passed():
                     break
+                self.apply_location_changes()
+                self.begin_memory_generation(generation + 1)
 
-                print(f"Geração {generation + 1}")
+                if self.verbose:
+                    print(f"Geração {generation + 1}")
+                self.evaluations_saved = 0
                 
-                # Executa as populações em paralelo
-                futures = [executor.submit(self.run_population, i) 
-                          for i in range(self.num_populations)]
-                
-                # Espera todas as populações terminarem
-                for future in futures:
-                    future.result()
+                reached = False
+                if self.memory_profile is not None and self.memory_profile.profiling():
+                    # Gerações perfiladas: uma população por vez, para atribuir a memória de cada fase
+                    try:
+                        for i in range(self.num_populations):
+                            self.run_population(i)
+                    except DeadlineReached:
+                        reached = True
+                else:
+                    # Executa as populações em paralelo
+                    futures = [executor.submit(self.run_population, i)
+                               for i in range(self.num_populations)]
+
+                    # Espera todas as populações terminarem
+                    for future in futures:
+                        try:
+                            future.result()
+                        except DeadlineReached:
+                            reached = True
+                if reached:
+                    self.update_global_best()
+                    break
                 
                 # Atualiza o melhor global após cada geração
                 self.update_global_best()
                 
                 # Realiza migração a cada migration_interval gerações
                 if (generation + 1) % self.migration_interval == 0:
-                    self.migration()
+                    with self.memory_phase('migration'):
+                        self.migration()
                 
-                if update_callback:
-                    update_callback(
-                        generation=generation + 1,
-                        best_individuals=self.best_individuals,
-                        best_fitnesses=self.best_fitnesses,
-                        global_best_individual=self.global_best_individual,
-                        global_best_fitness=self.global_best_fitness
-                    )
+                self.update_diversity()
+                self.apply_restarts(generation + 1)
+                self.refresh_fitness(generation + 1)
+                
+                self.record_generation(generation + 1)
+                self.notify_generation(generation + 1, update_callback)
+
+                if self.diversity_converged() or self.gap_reached():
+                    break
 
         return self.global_best_individual, self.global_best_fitness
 
-    def selection(self, fitness_values):
+    def selection(self, population, fitness_values, rng, tournament_size=None):
         """
         Seleciona os indivíduos para reprodução, com base no método definido.
         """
 
+        return population[self.select_indices(fitness_values, rng, tournament_size)]
+
+    def select_indices(self, fitness_values, rng, tournament_size=None, size=None):
+        """
+        Retorna os índices dos indivíduos selecionados para reprodução, com base no método definido.
+        São selecionados size indivíduos (padrão: population_size).
+        """
+
         # Seleciona o método de seleção
         if self.selection_method == 'roulette':
             # Seleciona os indivíduos para reprodução
-            self.current_population = self.roulette_selection(fitness_values)
+            selected_individuals = self.roulette_selection(fitness_values, rng, size)
         elif self.selection_method == 'tournament':
             # Seleciona os indivíduos para reprodução
-            self.current_population = self.tournament_selection(fitness_values)
+            selected_individuals = self.tournament_selection(fitness_values, rng, tournament_size, size)
+        else:
+            raise ValueError(f"Método de seleção desconhecido: {self.selection_method}")
+
+        return selected_individuals
 
-    def roulette_selection(self, fitness_values):
+    def roulette_selection(self, fitness_values, rng, size=None):
         """
         Implementa a seleção por roleta.
         """
+        if np.any(fitness_values < 0):
+            raise ValueError("A seleção por roleta exige fitness não negativo")
 
-        # Calcula a probabilidade de cada indivíduo
-        probabilities = fitness_values / np.sum(fitness_values)
-        # Seleciona os indivíduos para reprodução
-        selected_individuals = np.random.choice(len(self.current_population), size=self.population_size, p=probabilities)
-        # Retorna os indivíduos selecionados
-        return [self.current_population[i] for i in selected_individuals]
+        return self.backend.roulette_selection(fitness_values, size or self.population_size, rng)
 
-    def tournament_selection(self, fitness_values):
+    def tournament_selection(self, fitness_values, rng, tournament_size=None, size=None):
         """
         Implementa a seleção por torneio.
         """
-        selected = []
-
-        for _ in range(self.population_size):
-            # Sorteia os indivíduos aleatórios da população de acordo com o tamanho do torneio
-            participants_indices = np.random.choice(len(self.current_population), self.tournament_size, replace=False)
-            participants_fitness = fitness_values[participants_indices]
-            
-            # Seleciona o melhor
-            winner_indice = participants_indices[np.argmax(participants_fitness)]
-            selected.append(self.current_population[winner_indice])
-
-        return np.array(selected)
+        tournament_size = tournament_size or self.tournament_size
+        return self.backend.tournament_selection(fitness_values, size or self.population_size, tournament_size, rng)
 
-    def crossover(self):
+    def crossover(self, population, rng, crossover_rate=None):
         """
-        Realiza o cruzamento entre dois pais (one-point ou two-point).
+        Realiza o cruzamento por ciclo entre pares de pais.
         """
-        np.random.shuffle(self.current_population)
-        children = []
-        n = len(self.current_population)
-        i = 0
-        while i < n - 1: # Parar antes do último se for ímpar
-            
-            parent1 = self.current_population[i].locations
-            parent2 = self.current_population[i+1].locations
-
-            if random.random() < self.crossover_rate:
-
-                swap_locations = self.cycle_crossover(parent1, parent2)
-
-                child1 = parent1.copy()
-                child2 = parent2.copy()
-
-                for idx in swap_locations:
-                    child1[idx] = parent2[idx]
-                    child2[idx] = parent1[idx]
-
-                children.extend([Route(child1), Route(child2)])
-
-            else:
-                children.extend([Route(parent1), Route(parent2)])
-            i += 2
-
-        self.current_population = np.array(children)
-
-        if n % 2 == 1:
-            children.append(self.current_population[-1])
-        self.current_population = np.array(children)
-
-    def cycle_crossover(self, parent1, parent2):
-            
-            """
-            Realiza o crossover por ciclo.
-            """
-
-            # Pega os ids das locations
-            parent1_locations_ids = [location.id for location in parent1]
-            parent2_locations_ids = [location.id for location in parent2]
-            
-            # Remove primeiro e último elemento (que são iguais)
-            parent1_locations_ids = parent1_locations_ids[1:-1]
-            parent2_locations_ids = parent2_locations_ids[1:-1]
-            
-            # Define o array de indices de troca como uma lista
-            swap_locations = list(range(len(parent1)))
-            # Remove a fazenda, pois ela é a primeira e a última location
-            swap_locations.remove(0)
-            swap_locations.remove(21)
-            
-            # Remove o primeiro elemento, onde é que se inicia a rota
-            swap_locations.remove(1)
+        crossover_rate = self.crossover_rate if crossover_rate is None else crossover_rate
+        return self.backend.crossover(population, crossover_rate, rng)
 
-            # Define o último id da troca
-            last_location_id = parent2_locations_ids[0]
+    def eliminate_duplicates(self, population, rng):
+        """
+        Substitui ou perturba as rotas repetidas da população (no próprio array).
+        """
+        duplicates = np.flatnonzero(duplicate_mask(self.fingerprint(population)))
+        interior = population.shape[1] - 2
+        if len(duplicates) == 0 or interior < 2:
+            return duplicates
 
-            while last_location_id != parent1_locations_ids[0]:
-                index = parent1_locations_ids.index(last_location_id)
-                swap_locations.remove(index+1)
-                last_location_id = parent2_locations_ids[index]
+        if self.duplicate_control == 'replace':
+            population[duplicates, 1:-1] = rng.permuted(population[duplicates, 1:-1], axis=1)
+        else:
+            # Perturba com duas trocas aleatórias
+            rows = np.repeat(duplicates, 2)
+            first = rng.integers(0, interior, len(rows))
+            second = rng.integers(0, interior - 1, len(rows))
+            second += second >= first
+            for row, a, b in zip(rows, first + 1, second + 1):
+                population[row, a], population[row, b] = population[row, b], population[row, a]
 
-            return swap_locations
+        return duplicates
 
-    def mutation(self):
+    def mutation(self, population, rng, mutation_rate=None):
         """
-        Aplica a mutação no indivíduo.
+        Aplica a mutação nos indivíduos da população (no próprio array).
         """
-        for route in self.current_population:
-            if random.random() < self.mutation_rate:
-                # Seleciona um indivíduo aleatório da população
-                positions = random.sample(range(1, len(route.locations)-1), 2)
-
-                #Troca as posições
-                route.locations[positions[0]], route.locations[positions[1]] = route.locations[positions[1]], route.locations[positions[0]]
\ No newline at end of file
+        mutation_rate = self.mutation_rate if mutation_rate is None else mutation_rate
+        return self.backend.mutation(population, mutation_rate, rng, self.mutation_probabilities)
@@ -4,17 +4,31 @@ class Location:
     Classe que representa um local
     """
 
-    def __init__(self, id, name):
+    def __init__(self, id, name, latitude=None, longitude=None):
         
         """
         Construtor da classe Location
 
         :param id: int com o id do local
         :param name: string com o nome do local
+        :param latitude: float opcional com a latitude do local (graus)
+        :param longitude: float opcional com a longitude do local (graus)
         """
 
         self.id = id
         self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+
+    def has_coordinates(self) -> bool:
+
+        """
+        Método que indica se o local possui coordenadas
+
+        :return: bool indicando se latitude e longitude foram informadas
+        """
+
+        return self.latitude is not None and self.longitude is not None
 
     def __str__(self) -> str:
 
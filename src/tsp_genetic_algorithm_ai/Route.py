@@ -3,15 +3,21 @@ import urllib.parse
 
 class Route:
 
-    def __init__(self, locations):
+    def __init__(self, locations, vehicle_routes=None, distance=None, load=None):
 
         """
         Construtor da classe Route
 
         :param locations: lista de locais
+        :param vehicle_routes: lista opcional de rotas (Route) de cada veículo, no modo multi-veículo
+        :param distance: distância total da rota (opcional)
+        :param load: carga total atendida pela rota (opcional)
         """
 
         self.locations = locations
+        self.vehicle_routes = vehicle_routes
+        self.distance = distance
+        self.load = load
 
     def __str__(self) -> str:
 
@@ -21,6 +27,9 @@ class Route:
         :return: string com a rota
         """
 
+        if self.vehicle_routes:
+            return " | ".join(f"Veículo {i+1}: {route}" for i, route in enumerate(self.vehicle_routes))
+
         route_str = " -> ".join(str(location) for location in self.locations)
         return route_str
 
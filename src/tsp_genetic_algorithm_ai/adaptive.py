@@ -0,0 +1,104 @@
+import numpy as np
+
+
+class AdaptiveParameters:
+
+    """
+    Classe que representa o controle adaptativo dos parâmetros de cada população (ilha)
+
+    Usa uma regra baseada em sucesso (no estilo da regra de 1/5): a taxa de sucesso de
+    uma geração é a fração dos filhos melhores que a aptidão média dos pais selecionados
+    (depois da seleção e antes do cruzamento e da mutação). Acima do alvo a ilha está
+    progredindo e os parâmetros intensificam a busca (menos mutação, mais cruzamento e
+    maior pressão seletiva); abaixo do alvo eles diversificam.
+    """
+
+    def __init__(self, num_populations, mutation_rate, crossover_rate, tournament_size=None,
+                 population_size=None, target_success=0.2, factor=1.2,
+                 mutation_bounds=(0.01, 0.5), crossover_bounds=(0.5, 1.0)):
+
+        """
+        Construtor da classe AdaptiveParameters
+
+        :param num_populations: número de populações (ilhas)
+        :param mutation_rate: taxa de mutação inicial
+        :param crossover_rate: taxa de cruzamento inicial
+        :param tournament_size: tamanho do torneio inicial (padrão: 2)
+        :param population_size: tamanho da população (limita o tamanho do torneio)
+        :param target_success: taxa de sucesso alvo
+        :param factor: fator multiplicativo de ajuste das taxas
+        :param mutation_bounds: limites (mínimo, máximo) da taxa de mutação
+        :param crossover_bounds: limites (mínimo, máximo) da taxa de cruzamento
+        """
+
+        self.target_success = target_success
+        self.factor = factor
+        self.mutation_bounds = mutation_bounds
+        self.crossover_bounds = crossover_bounds
+
+        tournament_size = tournament_size or 2
+        max_tournament = max(2, (population_size or tournament_size) // 5)
+        self.tournament_bounds = (2, max(max_tournament, tournament_size))
+
+        self.mutation_rates = np.full(num_populations, float(np.clip(mutation_rate, *mutation_bounds)))
+        self.crossover_rates = np.full(num_populations, float(np.clip(crossover_rate, *crossover_bounds)))
+        self.tournament_sizes = np.full(num_populations, tournament_size, dtype=int)
+        self.success_rates = np.zeros(num_populations)
+
+    def parameters(self, island):
+
+        """
+        Método que retorna os parâmetros atuais de uma ilha
+
+        :param island: índice da população
+        :return: tupla (taxa de mutação, taxa de cruzamento, tamanho do torneio)
+        """
+
+        return (float(self.mutation_rates[island]), float(self.crossover_rates[island]),
+                int(self.tournament_sizes[island]))
+
+    def update(self, island, parent_fitness, offspring_fitness):
+
+        """
+        Método que ajusta os parâmetros de uma ilha a partir do resultado da geração
+
+        :param island: índice da população
+        :param parent_fitness: array com a aptidão dos pais selecionados (antes do cruzamento e da mutação)
+        :param offspring_fitness: array com a aptidão dos filhos (depois dos operadores)
+        """
+
+        success_rate = float(np.mean(offspring_fitness > np.mean(parent_fitness)))
+        self.success_rates[island] = success_rate
+
+        if success_rate > self.target_success:
+            # Progredindo: intensifica
+            self.mutation_rates[island] /= self.factor
+            self.crossover_rates[island] *= self.factor
+            self.tournament_sizes[island] += 1
+        elif success_rate < self.target_success:
+            # Estagnando: diversifica
+            self.mutation_rates[island] *= self.factor
+            self.crossover_rates[island] /= self.factor
+            self.tournament_sizes[island] -= 1
+
+        self.mutation_rates[island] = np.clip(self.mutation_rates[island], *self.mutation_bounds)
+        self.crossover_rates[island] = np.clip(self.crossover_rates[island], *self.crossover_bounds)
+        self.tournament_sizes[island] = np.clip(self.tournament_sizes[island], *self.tournament_bounds)
+
+    def snapshot(self):
+
+        """
+        Método que retorna os parâmetros atuais de todas as ilhas
+
+        :return: lista de dicionários (um por ilha) com as taxas, o torneio e a taxa de sucesso
+        """
+
+        return [
+            {
+                "mutation_rate": float(self.mutation_rates[i]),
+                "crossover_rate": float(self.crossover_rates[i]),
+                "tournament_size": int(self.tournament_sizes[i]),
+                "success_rate": float(self.success_rates[i]),
+            }
+            for i in range(len(self.mutation_rates))
+        ]
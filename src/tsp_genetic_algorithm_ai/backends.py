@@ -0,0 +1,527 @@
+import bisect
+import itertools
+import numpy as np
+
+# Protocolo de sorteios compartilhado pelos backends (garante resultados idênticos para o mesmo Generator):
+#   roleta:    rng.random(size)                                     -> posição na soma acumulada das aptidões
+#   torneio:   rng.integers(0, P, size=(size, tournament_size))     -> participantes (com reposição)
+#   cruzamento: rng.permutation(P), rng.random(P // 2)              -> pares e quais pares cruzam (crossover_plan)
+#   mutação:   rng.random(P), rng.integers(0, m, P), rng.integers(0, m - 1, P) -> quem muta e as duas posições,
+#              seguido de rng.random(P) -> operador de cada indivíduo, só quando há mais de um operador (mutation_plan)
+
+# Operadores de mutação (índices usados em mutation_plan e mutate)
+MUTATION_OPERATORS = ('swap', 'inversion', 'insertion')
+SWAP, INVERSION, INSERTION = range(len(MUTATION_OPERATORS))
+
+# Número máximo de rotas somadas com np.cumsum (também sequencial, sem laço por coluna); acima dele o laço
+# por coluna é mais rápido
+CUMSUM_MAX_ROWS = 64
+
+
+def crossover_plan(size, crossover_rate, rng):
+
+    """
+    Função que sorteia a formação dos pares e quais pares cruzam (comum a todos os backends)
+
+    :param size: número de indivíduos
+    :param crossover_rate: probabilidade de cada par cruzar
+    :param rng: np.random.Generator
+    :return: tupla (ordem dos indivíduos, array booleano (size // 2,) dos pares que cruzam)
+    """
+
+    order = rng.permutation(size)
+    crosses = rng.random(size // 2) < crossover_rate
+    return order, crosses
+
+
+def mutation_probabilities(operators):
+
+    """
+    Função que converte a escolha dos operadores de mutação em probabilidades
+
+    :param operators: nome de um operador, dicionário {operador: peso} ou None (apenas swap)
+    :return: array (len(MUTATION_OPERATORS),) com a probabilidade de cada operador
+    """
+
+    if operators is None:
+        operators = 'swap'
+    if isinstance(operators, str):
+        operators = {operators: 1.0}
+
+    unknown = set(operators) - set(MUTATION_OPERATORS)
+    if unknown:
+        raise ValueError(f"Operadores de mutação desconhecidos: {sorted(unknown)}. Use {MUTATION_OPERATORS}")
+    weights = np.array([float(operators.get(name, 0.0)) for name in MUTATION_OPERATORS])
+    if np.any(weights < 0) or weights.sum() <= 0:
+        raise ValueError("Os pesos dos operadores de mutação devem ser não negativos, com soma positiva")
+
+    return weights / weights.sum()
+
+
+def mutation_plan(size, length, mutation_rate, rng, probabilities=None):
+
+    """
+    Função que sorteia, para a população inteira, quem muta, o operador e as duas posições (comum a todos os backends)
+
+    :param size: número de indivíduos
+    :param length: número de posições de cada rota fechada (depósito nas pontas)
+    :param mutation_rate: probabilidade de cada indivíduo sofrer mutação
+    :param rng: np.random.Generator
+    :param probabilities: probabilidade de cada operador (ver mutation_probabilities; padrão: apenas swap)
+    :return: tupla de arrays (linhas que mutam, primeira posição, segunda posição, operador), posições distintas
+    """
+
+    interior = length - 2
+    if interior < 2:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, empty, empty
+
+    mutates = rng.random(size) < mutation_rate
+    first = rng.integers(0, interior, size)
+    second = rng.integers(0, interior - 1, size)
+    second += second >= first
+
+    if probabilities is None or np.count_nonzero(probabilities) == 1:
+        operator = np.full(size, SWAP if probabilities is None else int(np.argmax(probabilities)), dtype=np.intp)
+    else:
+        cumulative = np.cumsum(probabilities)
+        operator = np.minimum(np.searchsorted(cumulative, rng.random(size) * cumulative[-1], side='right'),
+                              len(MUTATION_OPERATORS) - 1)
+
+    rows = np.flatnonzero(mutates)
+    return rows, first[rows] + 1, second[rows] + 1, operator[rows]
+
+
+def mutation_deltas(population, rows, first, second, operator, distance_matrix):
+
+    """
+    Função que calcula a variação da distância de cada rota causada pela mutação (antes de aplicá-la)
+
+    Apenas as arestas alteradas são consultadas; na inversão com matriz assimétrica, o
+    trecho invertido é percorrido no sentido oposto e sua diferença entra na variação.
+
+    :param population: array (indivíduos, posições) com as rotas fechadas, ainda sem a mutação
+    :param rows, first, second, operator: plano de mutação (ver mutation_plan)
+    :param distance_matrix: matriz (n, n) de distâncias
+    :return: array (len(rows),) com a distância após a mutação menos a distância antes dela
+    """
+
+    D = distance_matrix
+    tours = population[rows]
+    index = np.arange(len(rows))
+    p, q = np.minimum(first, second), np.maximum(first, second)
+
+    def at(position):
+        return tours[index, position]
+
+    deltas = np.zeros(len(rows))
+
+    swap = operator == SWAP
+    if swap.any():
+        a, b = p[swap], q[swap]
+        t = tours[swap]
+        i = np.arange(len(t))
+        before_a, node_a, after_a = t[i, a - 1], t[i, a], t[i, a + 1]
+        before_b, node_b, after_b = t[i, b - 1], t[i, b], t[i, b + 1]
+        adjacent = b == a + 1
+        # Posições vizinhas compartilham a aresta (a, b), que passa a ser (b, a)
+        removed = D[before_a, node_a] + D[node_b, after_b] + np.where(
+            adjacent, D[node_a, node_b], D[node_a, after_a] + D[before_b, node_b])
+        added = D[before_a, node_b] + D[node_a, after_b] + np.where(
+            adjacent, D[node_b, node_a], D[node_b, after_a] + D[before_b, node_a])
+        deltas[swap] = added - removed
+
+    inversion = operator == INVERSION
+    if inversion.any():
+        a, b = p[inversion], q[inversion]
+        t = tours[inversion]
+        i = np.arange(len(t))
+        deltas[inversion] = (D[t[i, a - 1], t[i, b]] + D[t[i, a], t[i, b + 1]]
+                             - D[t[i, a - 1], t[i, a]] - D[t[i, b], t[i, b + 1]])
+        # Diferença entre percorrer cada aresta interna ao contrário e no sentido original (zero se simétrica)
+        reversal = np.cumsum(D[t[:, 1:], t[:, :-1]] - D[t[:, :-1], t[:, 1:]], axis=1)
+        deltas[inversion] += reversal[i, b - 1] - reversal[i, a - 1]
+
+    insertion = operator == INSERTION
+    if insertion.any():
+        # O local na primeira posição é retirado e reinserido de modo a ocupar a segunda posição
+        a, b = first[insertion], second[insertion]
+        t = tours[insertion]
+        i = np.arange(len(t))
+        node = t[i, a]
+        before, after = t[i, a - 1], t[i, a + 1]
+        removal = D[before, after] - D[before, node] - D[node, after]
+        # Após a retirada, o local entra entre b e b + 1 (se a < b) ou entre b - 1 e b (se a > b)
+        left = np.where(a < b, t[i, b], t[i, b - 1])
+        right = np.where(a < b, t[i, b + 1], t[i, b])
+        deltas[insertion] = removal + D[left, node] + D[node, right] - D[left, right]
+
+    return deltas
+
+
+class PythonBackend:
+
+    """
+    Backend de referência em Python puro
+
+    Implementa os operadores de forma direta, rota a rota, e serve de referência
+    para validar os backends vetorizados.
+    """
+
+    name = 'python'
+
+    def fitness(self, distance_matrix, tours):
+
+        """
+        Método que calcula a distância total de cada rota
+
+        :param distance_matrix: matriz (n, n) de distâncias
+        :param tours: array (indivíduos, posições) com os índices de cada rota
+        :return: array com a distância de cada rota
+        """
+
+        distances = np.empty(len(tours))
+        for i, tour in enumerate(tours.tolist()):
+            distance = 0.0
+            for origin, destination in zip(tour[:-1], tour[1:]):
+                distance += float(distance_matrix[origin, destination])
+            distances[i] = distance
+
+        return distances
+
+    def roulette_selection(self, fitness_values, size, rng):
+
+        """
+        Método que implementa a seleção por roleta
+
+        :param fitness_values: array com a aptidão (não negativa) de cada indivíduo
+        :param size: quantidade de indivíduos selecionados
+        :param rng: np.random.Generator
+        :return: array com os índices selecionados
+        """
+
+        cumulative = list(itertools.accumulate(fitness_values.tolist()))
+        draws = (rng.random(size) * cumulative[-1]).tolist()
+        last = len(cumulative) - 1
+
+        return np.array([min(bisect.bisect_right(cumulative, draw), last) for draw in draws], dtype=np.intp)
+
+    def tournament_selection(self, fitness_values, size, tournament_size, rng):
+
+        """
+        Método que implementa a seleção por torneio
+
+        :param fitness_values: array com a aptidão de cada indivíduo
+        :param size: quantidade de indivíduos selecionados
+        :param tournament_size: número de participantes de cada torneio
+        :param rng: np.random.Generator
+        :return: array com os índices dos vencedores
+        """
+
+        participants = rng.integers(0, len(fitness_values), size=(size, tournament_size))
+        fitness_list = fitness_values.tolist()
+
+        winners = []
+        for row in participants.tolist():
+            winner = row[0]
+            for candidate in row[1:]:
+                if fitness_list[candidate] > fitness_list[winner]:
+                    winner = candidate
+            winners.append(winner)
+
+        return np.array(winners, dtype=np.intp)
+
+    def crossover(self, population, crossover_rate, rng, out=None):
+
+        """
+        Método que realiza o cruzamento por ciclo entre pares de pais
+
+        :param population: array (indivíduos, posições) com as rotas fechadas (depósito nas pontas)
+        :param crossover_rate: probabilidade de cada par cruzar
+        :param rng: np.random.Generator
+        :param out: array opcional (mesmo formato de population, sem sobreposição) onde os filhos são escritos
+        :return: array com os filhos
+        """
+
+        order, crosses = crossover_plan(len(population), crossover_rate, rng)
+        children = np.take(population, order, axis=0, out=out)
+        return self.recombine(children, crosses)
+
+    def recombine(self, children, crosses):
+
+        """
+        Método que aplica o cruzamento por ciclo aos pares (2i, 2i + 1) sorteados, no próprio array
+
+        :param children: array (indivíduos, posições) com os pais já na ordem dos pares
+        :param crosses: array booleano (indivíduos // 2,) indicando quais pares cruzam
+        :return: o próprio array, com os filhos
+        """
+
+        for pair in np.flatnonzero(crosses).tolist():
+            parent1 = children[2 * pair, 1:-1].tolist()
+            parent2 = children[2 * pair + 1, 1:-1].tolist()
+
+            # Percorre o ciclo que começa na primeira posição
+            cycle = set()
+            position = 0
+            while position not in cycle:
+                cycle.add(position)
+                position = parent1.index(parent2[position])
+
+            for position in range(len(parent1)):
+                if position not in cycle:
+                    children[2 * pair, position + 1] = parent2[position]
+                    children[2 * pair + 1, position + 1] = parent1[position]
+
+        return children
+
+    def mutation(self, population, mutation_rate, rng, probabilities=None):
+
+        """
+        Método que aplica a mutação (troca, inversão ou inserção) no próprio array
+
+        :param population: array (indivíduos, posições) com as rotas fechadas
+        :param mutation_rate: probabilidade de cada indivíduo sofrer mutação
+        :param rng: np.random.Generator
+        :param probabilities: probabilidade de cada operador (padrão: apenas swap)
+        :return: o próprio array, com as mutações aplicadas
+        """
+
+        size, length = population.shape
+        return self.mutate(population, *mutation_plan(size, length, mutation_rate, rng, probabilities))
+
+    def mutate(self, population, rows, first, second, operator):
+
+        """
+        Método que aplica um plano de mutação (ver mutation_plan) no próprio array
+
+        :param population: array (indivíduos, posições) com as rotas fechadas
+        :param rows, first, second, operator: plano de mutação
+        :return: o próprio array, com as mutações aplicadas
+        """
+
+        for row, a, b, kind in zip(rows.tolist(), first.tolist(), second.tolist(), operator.tolist()):
+            tour = population[row].tolist()
+            if kind == SWAP:
+                tour[a], tour[b] = tour[b], tour[a]
+            elif kind == INVERSION:
+                a, b = min(a, b), max(a, b)
+                tour[a:b + 1] = tour[a:b + 1][::-1]
+            else:
+                tour.insert(b, tour.pop(a))
+            population[row] = tour
+
+        return population
+
+
+class NumpyBackend:
+
+    """
+    Backend vetorizado com NumPy
+
+    Consome exatamente os mesmos sorteios do backend de referência, processando a
+    população inteira (ou todos os pares) em operações sobre arrays.
+    """
+
+    name = 'numpy'
+
+    def fitness(self, distance_matrix, tours):
+
+        """
+        Método que calcula a distância total de cada rota
+
+        :param distance_matrix: matriz (n, n) de distâncias
+        :param tours: array (indivíduos, posições) com os índices de cada rota
+        :return: array com a distância de cada rota
+        """
+
+        legs = distance_matrix[tours[:, :-1], tours[:, 1:]]
+        if len(tours) <= CUMSUM_MAX_ROWS and legs.shape[1]:
+            return np.cumsum(legs, axis=1)[:, -1]
+
+        # Soma sequencial por coluna: mesma ordem de arredondamento da soma trecho a trecho
+        distances = np.zeros(len(tours))
+        for column in legs.T:
+            distances += column
+
+        return distances
+
+    def roulette_selection(self, fitness_values, size, rng):
+
+        """
+        Método que implementa a seleção por roleta
+
+        :param fitness_values: array com a aptidão (não negativa) de cada indivíduo
+        :param size: quantidade de indivíduos selecionados
+        :param rng: np.random.Generator
+        :return: array com os índices selecionados
+        """
+
+        cumulative = np.cumsum(fitness_values)
+        draws = rng.random(size) * cumulative[-1]
+        selected = np.searchsorted(cumulative, draws, side='right')
+
+        return np.minimum(selected, len(cumulative) - 1)
+
+    def tournament_selection(self, fitness_values, size, tournament_size, rng):
+
+        """
+        Método que implementa a seleção por torneio
+
+        :param fitness_values: array com a aptidão de cada indivíduo
+        :param size: quantidade de indivíduos selecionados
+        :param tournament_size: número de participantes de cada torneio
+        :param rng: np.random.Generator
+        :return: array com os índices dos vencedores
+        """
+
+        participants = rng.integers(0, len(fitness_values), size=(size, tournament_size))
+        winners = np.argmax(fitness_values[participants], axis=1)
+
+        return participants[np.arange(size), winners]
+
+    def crossover(self, population, crossover_rate, rng, out=None):
+
+        """
+        Método que realiza o cruzamento por ciclo entre pares de pais
+
+        :param population: array (indivíduos, posições) com as rotas fechadas (depósito nas pontas)
+        :param crossover_rate: probabilidade de cada par cruzar
+        :param rng: np.random.Generator
+        :param out: array opcional (mesmo formato de population, sem sobreposição) onde os filhos são escritos
+        :return: array com os filhos
+        """
+
+        order, crosses = crossover_plan(len(population), crossover_rate, rng)
+        children = np.take(population, order, axis=0, out=out)
+        return self.recombine(children, crosses)
+
+    def recombine(self, children, crosses):
+
+        """
+        Método que aplica o cruzamento por ciclo aos pares (2i, 2i + 1) sorteados, no próprio array
+
+        :param children: array (indivíduos, posições) com os pais já na ordem dos pares
+        :param crosses: array booleano (indivíduos // 2,) indicando quais pares cruzam
+        :return: o próprio array, com os filhos
+        """
+
+        pairs = np.flatnonzero(crosses)
+        if len(pairs) == 0:
+            return children
+
+        parent1 = children[2 * pairs, 1:-1]
+        parent2 = children[2 * pairs + 1, 1:-1]
+        in_cycle = cycle_positions(parent1, parent2)
+
+        children[2 * pairs, 1:-1] = np.where(in_cycle, parent1, parent2)
+        # parent2 já é uma cópia (indexação avançada): vira o segundo filho sem nova alocação
+        np.copyto(parent2, parent1, where=~in_cycle)
+        children[2 * pairs + 1, 1:-1] = parent2
+
+        return children
+
+    def mutation(self, population, mutation_rate, rng, probabilities=None):
+
+        """
+        Método que aplica a mutação (troca, inversão ou inserção) no próprio array
+
+        :param population: array (indivíduos, posições) com as rotas fechadas
+        :param mutation_rate: probabilidade de cada indivíduo sofrer mutação
+        :param rng: np.random.Generator
+        :param probabilities: probabilidade de cada operador (padrão: apenas swap)
+        :return: o próprio array, com as mutações aplicadas
+        """
+
+        size, length = population.shape
+        return self.mutate(population, *mutation_plan(size, length, mutation_rate, rng, probabilities))
+
+    def mutate(self, population, rows, first, second, operator):
+
+        """
+        Método que aplica um plano de mutação (ver mutation_plan) no próprio array
+
+        A troca é feita elemento a elemento; inversão e inserção são escritas como um mapa
+        de posições de origem por linha, aplicado com uma única leitura indexada.
+
+        :param population: array (indivíduos, posições) com as rotas fechadas
+        :param rows, first, second, operator: plano de mutação
+        :return: o próprio array, com as mutações aplicadas
+        """
+
+        swap = operator == SWAP
+        if swap.any():
+            r, a, b = rows[swap], first[swap], second[swap]
+            population[r, a], population[r, b] = population[r, b], population[r, a]
+
+        position = np.arange(population.shape[1])[None, :]
+        for kind in (INVERSION, INSERTION):
+            selected = operator == kind
+            if not selected.any():
+                continue
+            r, a, b = rows[selected, None], first[selected, None], second[selected, None]
+            if kind == INVERSION:
+                low, high = np.minimum(a, b), np.maximum(a, b)
+                source = np.where((position >= low) & (position <= high), low + high - position, position)
+            else:
+                # O local em a é retirado e os locais entre a e b andam uma posição em direção a a
+                source = np.where(position == b, a, position
+                                  + ((a < b) & (position >= a) & (position < b))
+                                  - ((a > b) & (position > b) & (position <= a)))
+            population[r[:, 0]] = population[r, source]
+
+        return population
+
+
+def cycle_positions(parent1, parent2):
+
+    """
+    Função que marca, para vários pares de uma vez, as posições do ciclo que começa na posição 0
+
+    :param parent1: array (pares, m) com o primeiro pai de cada par
+    :param parent2: array (pares, m) com o segundo pai de cada par
+    :return: array booleano (pares, m), True nas posições do ciclo
+    """
+
+    pairs, length = parent1.shape
+    rows = np.arange(pairs)
+
+    # Posição de cada local no primeiro pai
+    inverse = np.zeros((pairs, int(parent1.max()) + 1), dtype=np.intp)
+    inverse[rows[:, None], parent1] = np.arange(length)
+
+    in_cycle = np.zeros((pairs, length), dtype=bool)
+    position = np.zeros(pairs, dtype=np.intp)
+    active = rows
+
+    # Avança todos os ciclos em paralelo até cada um voltar à posição 0
+    while len(active):
+        in_cycle[active, position[active]] = True
+        position[active] = inverse[active, parent2[active, position[active]]]
+        active = active[position[active] != 0]
+
+    return in_cycle
+
+
+BACKENDS = {
+    PythonBackend.name: PythonBackend,
+    NumpyBackend.name: NumpyBackend,
+}
+
+
+def get_backend(backend):
+
+    """
+    Função que retorna uma instância do backend de operadores
+
+    :param backend: nome do backend (python ou numpy) ou uma instância já criada
+    :return: instância do backend
+    """
+
+    if not isinstance(backend, str):
+        return backend
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {backend}. Use um de {tuple(BACKENDS)}")
+
+    return BACKENDS[backend]()
@@ -0,0 +1,410 @@
+import argparse
+import contextlib
+import io
+import time
+import tracemalloc
+import numpy as np
+from .GeneticAlgorithm import GeneticAlgorithm
+from .held_karp import held_karp, held_karp_memory, DEFAULT_MAX_MEMORY
+from .distance_matrix import candidate_lists, random_instance
+from .initialization import close_tours, nearest_neighbor_tours
+from .local_search import two_opt
+from .memory_profile import MemoryProfiler
+
+# Parâmetros padrão do algoritmo genético nos benchmarks
+DEFAULT_PARAMETERS = {
+    "population_size": 100,
+    "mutation_rate": 0.1,
+    "crossover_rate": 0.8,
+    "elitism_count": 2,
+    "selection_method": "tournament",
+    "tournament_size": 3,
+}
+
+
+def ground_truth(distance_matrix):
+
+    """
+    Função que calcula a distância ótima da instância (Held-Karp) quando ela é pequena o suficiente
+
+    :param distance_matrix: matriz (n, n) de distâncias
+    :return: distância ótima ou None se a instância for grande demais para o solver exato
+    """
+
+    if held_karp_memory(len(distance_matrix)) > DEFAULT_MAX_MEMORY:
+        return None
+    return held_karp(distance_matrix)[0]
+
+
+def reference_distance(distance_matrix):
+
+    """
+    Função que calcula a distância de referência da instância: ótimo (Held-Karp) quando ela é pequena,
+    senão a rota do vizinho mais próximo melhorada pelo 2-opt
+
+    :param distance_matrix: matriz (n, n) de distâncias
+    :return: tupla (distância, True se for o ótimo)
+    """
+
+    optimum = ground_truth(distance_matrix)
+    if optimum is not None:
+        return optimum, True
+    cycle = two_opt(nearest_neighbor_tours(distance_matrix, [0])[0], distance_matrix, candidate_lists(distance_matrix))
+    tour = close_tours(cycle[None])[0]
+    return float(distance_matrix[tour[:-1], tour[1:]].sum()), False
+
+
+def time_to_target(make_ga, target_distance, generations, seeds):
+
+    """
+    Função que mede o tempo até o algoritmo atingir uma distância alvo
+
+    :param make_ga: função (seed) -> GeneticAlgorithm
+    :param target_distance: distância alvo (km)
+    :param generations: número máximo de gerações de cada execução
+    :param seeds: sementes das execuções
+    :return: dicionário com arrays de tempo e geração até o alvo (inf se não atingiu), distância final e
+        avaliações (filhos gerados) por segundo de cada execução
+    """
+
+    times, reached_generations, distances, throughputs = [], [], [], []
+    for seed in seeds:
+        ga = make_ga(seed)
+        reached = {}
+
+        def callback(generation, global_best_distance, **kwargs):
+            if not reached and global_best_distance <= target_distance:
+                reached["time"] = time.perf_counter() - start
+                reached["generation"] = generation
+
+        ga.stop = lambda: bool(reached)
+
+        # A população inicial faz parte do tempo medido
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, best_fitness = ga.run(generations, callback)
+
+        elapsed = time.perf_counter() - start
+        times.append(reached.get("time", np.inf))
+        throughputs.append(ga.evaluations / elapsed)
+        reached_generations.append(reached.get("generation", np.inf))
+        distances.append(ga.fitness_distance(best_fitness))
+
+    return {
+        "time": np.array(times),
+        "generation": np.array(reached_generations),
+        "distance": np.array(distances),
+        "evaluations_per_second": np.array(throughputs),
+    }
+
+
+def compare_initialization(strategies, target_distance, generations=500, seeds=range(10), parameters=None):
+
+    """
+    Função que compara o tempo até o alvo entre inicialização aleatória e semeadura heurística
+
+    :param strategies: dicionário {estratégia: fração} da semeadura heurística
+    :param target_distance: distância alvo (km)
+    :param generations: número máximo de gerações
+    :param seeds: sementes das execuções
+    :param parameters: parâmetros do GeneticAlgorithm (padrão: DEFAULT_PARAMETERS)
+    :return: dicionário {nome: resultado de time_to_target}
+    """
+
+    parameters = {**DEFAULT_PARAMETERS, **(parameters or {})}
+    configurations = {"random": None, "seeded": strategies}
+
+    return {
+        name: time_to_target(
+            lambda seed, initialization=initialization: GeneticAlgorithm(
+                **parameters, initialization=initialization, seed=seed
+            ),
+            target_distance, generations, seeds
+        )
+        for name, initialization in configurations.items()
+    }
+
+
+def compare_models(target_distance, generations=500, seeds=range(10), parameters=None,
+                   locations=None, distance_matrix=None):
+
+    """
+    Função que compara o modelo geracional com o steady-state (substituição do pior e do perdedor de um torneio)
+
+    :param target_distance: distância alvo (km)
+    :param generations: número máximo de gerações (no steady-state, ceil(P / filhos por passo) passos cada)
+    :param seeds: sementes das execuções
+    :param parameters: parâmetros do GeneticAlgorithm (padrão: DEFAULT_PARAMETERS)
+    :param locations: locais da instância (padrão: dados de exemplo)
+    :param distance_matrix: matriz de distâncias da instância
+    :return: dicionário {nome: resultado de time_to_target}
+    """
+
+    parameters = {**DEFAULT_PARAMETERS, **(parameters or {})}
+    configurations = {
+        "generational": {"model": "generational"},
+        "steady_worst": {"model": "steady_state", "replacement": "worst"},
+        "steady_tourn": {"model": "steady_state", "replacement": "tournament"},
+    }
+
+    return {
+        name: time_to_target(
+            lambda seed, configuration=configuration: GeneticAlgorithm(
+                **parameters, **configuration, locations=locations, distance_matrix=distance_matrix,
+                seed=seed, verbose=False
+            ),
+            target_distance, generations, seeds
+        )
+        for name, configuration in configurations.items()
+    }
+
+
+def island_scaling(island_counts, generations=50, parameters=None, locations=None, distance_matrix=None):
+
+    """
+    Função que mede o tempo por geração do modo multi-population conforme o número de populações,
+    com as populações em threads e em um único array (stacked)
+
+    :param island_counts: números de populações medidos
+    :param generations: número de gerações de cada execução
+    :param parameters: parâmetros do GeneticAlgorithm (padrão: DEFAULT_PARAMETERS)
+    :param locations: locais da instância (padrão: dados de exemplo)
+    :param distance_matrix: matriz de distâncias da instância
+    :return: dicionário {modo: array (len(island_counts),) com o tempo médio (s) por geração}
+    """
+
+    parameters = {**DEFAULT_PARAMETERS, **(parameters or {})}
+    results = {}
+    for mode in ('threads', 'stacked'):
+        times = []
+        for num_populations in island_counts:
+            ga = GeneticAlgorithm(**parameters, num_populations=num_populations, island_execution=mode,
+                                  locations=locations, distance_matrix=distance_matrix, seed=0,
+                                  history_points=None, verbose=False)
+            start = time.perf_counter()
+            ga.run(generations)
+            times.append((time.perf_counter() - start) / generations)
+        results[mode] = np.array(times)
+    return results
+
+
+def allocation_profile(parameters=None, generations=200, seed=0):
+
+    """
+    Função que mede, com tracemalloc, a memória alocada em cada geração
+
+    A medição é feita entre o início de uma geração e o da seguinte (inclui callback e
+    registros). O pico é a maior quantidade de memória temporária alocada na geração,
+    e a retenção é o quanto a memória em uso cresceu de uma geração para outra.
+
+    :param parameters: parâmetros do GeneticAlgorithm (padrão: DEFAULT_PARAMETERS)
+    :param generations: número de gerações
+    :param seed: semente da execução
+    :return: dicionário com arrays (gerações,) de pico e retenção em bytes e o tamanho (bytes) de uma população
+    """
+
+    ga = GeneticAlgorithm(**{**DEFAULT_PARAMETERS, **(parameters or {})}, seed=seed)
+    peaks, retained = [], []
+    state = {}
+
+    def measure():
+        current, peak = tracemalloc.get_traced_memory()
+        if state:
+            peaks.append(peak - state["start"])
+            retained.append(current - state["start"])
+        tracemalloc.reset_peak()
+        state["start"] = tracemalloc.get_traced_memory()[0]
+        return False
+
+    ga.stop = measure
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ga.run(generations)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "peak": np.array(peaks),
+        "retained": np.array(retained),
+        "population_bytes": ga.populations[0].nbytes,
+    }
+
+
+def phase_profile(parameters=None, generations=200, interval=10, path=None, seed=0):
+
+    """
+    Função que mede a memória de cada fase do algoritmo genético com um MemoryProfiler
+
+    :param parameters: parâmetros do GeneticAlgorithm (padrão: DEFAULT_PARAMETERS)
+    :param generations: número de gerações
+    :param interval: intervalo de gerações entre medições
+    :param path: arquivo JSON Lines com os registros (opcional)
+    :param seed: semente da execução
+    :return: lista de registros (um por geração perfilada)
+    """
+
+    profiler = MemoryProfiler(interval, path)
+    ga = GeneticAlgorithm(**{**DEFAULT_PARAMETERS, **(parameters or {})}, seed=seed, verbose=False,
+                          memory_profile=profiler)
+    ga.run(generations, lambda **kwargs: None)
+    return profiler.records
+
+
+def print_phase_profile(records):
+
+    """
+    Função que imprime o resumo da memória por fase e a evolução da memória rastreada
+
+    :param records: registros de phase_profile
+    """
+
+    # A inicialização (geração 0) é impressa à parte
+    initialization = records[0]["phases"].get("initialize_populations", {})
+    print(f"Inicialização: {initialization.get('bytes', 0) / 1024:.1f} KiB retidos, "
+          f"pico {initialization.get('peak_bytes', 0) / 1024:.1f} KiB")
+    generations = records[1:]
+    phases = sorted({name for record in generations for name in record["phases"]})
+    print(f"{'Fase':<12}{'Retido méd. (B)':>17}{'Pico máx. (KiB)':>17}{'Blocos méd.':>13}")
+    for name in phases:
+        measures = [record["phases"][name] for record in generations if name in record["phases"]]
+        print(f"{name:<12}{np.mean([m['bytes'] for m in measures]):>17.0f}"
+              f"{max(m['peak_bytes'] for m in measures) / 1024:>17.1f}{np.mean([m['blocks'] for m in measures]):>13.1f}")
+    last = records[-1]
+    print(f"Memória rastreada: {records[0]['traced_bytes'] / 1024:.1f} KiB (geração 0) -> "
+          f"{last['traced_bytes'] / 1024:.1f} KiB (geração {last['generation']})")
+    if last["peak_rss_bytes"] is not None:
+        print(f"Pico de RSS: {last['peak_rss_bytes'] / 2 ** 20:.1f} MiB")
+    print(f"Memória por população: {', '.join(f'{nbytes / 1024:.1f} KiB' for nbytes in last['island_bytes'])}")
+
+
+def print_allocation_profile(profile):
+
+    """
+    Função que imprime o resumo da memória alocada por geração
+
+    :param profile: resultado de allocation_profile
+    """
+
+    # A primeira geração medida inclui a população inicial e os caches
+    peak, retained = profile["peak"][1:], profile["retained"][1:]
+    population_bytes = profile["population_bytes"]
+    print(f"Gerações medidas: {len(peak)} | população: {population_bytes / 1024:.1f} KiB")
+    print(f"Pico de memória temporária por geração (mediana): {np.median(peak) / 1024:.1f} KiB "
+          f"({np.median(peak) / population_bytes:.2f} populações)")
+    print(f"Pico máximo: {peak.max() / 1024:.1f} KiB")
+    print(f"Memória retida por geração (média): {retained.mean():.0f} bytes")
+
+
+def print_results(results, target_distance, optimum=None):
+
+    """
+    Função que imprime a tabela de resultados de um benchmark de tempo até o alvo
+
+    :param results: dicionário {nome: resultado de time_to_target}
+    :param target_distance: distância alvo (km)
+    :param optimum: distância ótima conhecida (inclui a coluna de gap médio)
+    """
+
+    print(f"Alvo: {target_distance:.2f} km")
+    if optimum is not None:
+        print(f"Ótimo (Held-Karp): {optimum:.2f} km")
+    print(f"{'Configuração':<16}{'Atingiu':>10}{'Tempo med. (s)':>16}{'Geração med.':>14}{'Dist. média':>13}"
+          f"{'Aval./s':>11}" + (f"{'Gap médio':>11}" if optimum is not None else ""))
+    for name, result in results.items():
+        hits = np.isfinite(result["time"])
+        median_time = np.median(result["time"][hits]) if hits.any() else np.inf
+        median_generation = np.median(result["generation"][hits]) if hits.any() else np.inf
+        line = (f"{name:<16}{f'{hits.sum()}/{len(hits)}':>10}{median_time:>16.4f}"
+                f"{median_generation:>14.1f}{result['distance'].mean():>13.2f}"
+                f"{result['evaluations_per_second'].mean():>11.0f}")
+        if optimum is not None:
+            line += f"{(result['distance'].mean() / optimum - 1) * 100:>10.2f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do algoritmo genético")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    init_parser = subparsers.add_parser("init", help="Inicialização aleatória x semeadura heurística")
+    init_parser.add_argument("--target", type=float, default=None,
+                             help="Distância alvo (km). Padrão: ótimo (Held-Karp) acrescido de --gap")
+    init_parser.add_argument("--gap", type=float, default=3.0, help="Gap (%%) sobre o ótimo usado como alvo")
+    init_parser.add_argument("--generations", type=int, default=500)
+    init_parser.add_argument("--runs", type=int, default=10)
+    init_parser.add_argument("--nearest-neighbor", type=float, default=0.1)
+    init_parser.add_argument("--greedy-edge", type=float, default=0.02)
+    init_parser.add_argument("--random-insertion", type=float, default=0.1)
+
+    alloc_parser = subparsers.add_parser("alloc", help="Memória alocada por geração (tracemalloc)")
+    alloc_parser.add_argument("--generations", type=int, default=200)
+    alloc_parser.add_argument("--population-size", type=int, default=DEFAULT_PARAMETERS["population_size"])
+    alloc_parser.add_argument("--populations", type=int, default=1)
+
+    steady_parser = subparsers.add_parser("steady", help="Modelo geracional x steady-state")
+    steady_parser.add_argument("--locations", type=int, default=0,
+                               help="Número de locais de uma instância aleatória (padrão: dados de exemplo)")
+    steady_parser.add_argument("--target", type=float, default=None,
+                               help="Distância alvo. Padrão: ótimo (ou vizinho mais próximo + 2-opt) acrescido de --gap")
+    steady_parser.add_argument("--gap", type=float, default=3.0, help="Gap (%%) sobre a referência usado como alvo")
+    steady_parser.add_argument("--generations", type=int, default=500)
+    steady_parser.add_argument("--runs", type=int, default=10)
+    steady_parser.add_argument("--offspring", type=int, default=2, help="Filhos por passo do steady-state")
+
+    islands_parser = subparsers.add_parser("islands", help="Populações em threads x em um único array (stacked)")
+    islands_parser.add_argument("--counts", type=int, nargs="+", default=[2, 4, 8, 16, 32])
+    islands_parser.add_argument("--locations", type=int, default=0,
+                                help="Número de locais de uma instância aleatória (padrão: dados de exemplo)")
+    islands_parser.add_argument("--generations", type=int, default=50)
+
+    phases_parser = subparsers.add_parser("phases", help="Memória por fase (MemoryProfiler)")
+    phases_parser.add_argument("--generations", type=int, default=200)
+    phases_parser.add_argument("--interval", type=int, default=10)
+    phases_parser.add_argument("--populations", type=int, default=1)
+    phases_parser.add_argument("--island-execution", choices=("threads", "stacked"), default="threads")
+    phases_parser.add_argument("--output", default=None, help="Arquivo JSON Lines com os registros de cada geração")
+
+    args = parser.parse_args()
+
+    if args.benchmark == "init":
+        strategies = {
+            "nearest_neighbor": args.nearest_neighbor,
+            "greedy_edge": args.greedy_edge,
+            "random_insertion": args.random_insertion,
+        }
+        optimum = ground_truth(GeneticAlgorithm(**DEFAULT_PARAMETERS).distance_matrix)
+        target = args.target
+        if target is None:
+            if optimum is None:
+                parser.error("--target é obrigatório quando a instância é grande demais para o Held-Karp")
+            target = optimum * (1 + args.gap / 100)
+        results = compare_initialization(strategies, target, args.generations, range(args.runs))
+        print_results(results, target, optimum)
+    elif args.benchmark == "alloc":
+        parameters = {"population_size": args.population_size, "num_populations": args.populations}
+        print_allocation_profile(allocation_profile(parameters, args.generations))
+    elif args.benchmark == "steady":
+        locations, distance_matrix = random_instance(args.locations) if args.locations else (None, None)
+        if distance_matrix is None:
+            distance_matrix = GeneticAlgorithm(**DEFAULT_PARAMETERS).distance_matrix
+        reference, exact = reference_distance(distance_matrix)
+        target = args.target if args.target is not None else reference * (1 + args.gap / 100)
+        if not exact:
+            print(f"Referência (vizinho mais próximo + 2-opt): {reference:.4f}")
+        results = compare_models(target, args.generations, range(args.runs),
+                                 {"steady_state_offspring": args.offspring}, locations, distance_matrix)
+        print_results(results, target, reference if exact else None)
+    elif args.benchmark == "phases":
+        parameters = {"num_populations": args.populations, "island_execution": args.island_execution}
+        print_phase_profile(phase_profile(parameters, args.generations, args.interval, args.output))
+    elif args.benchmark == "islands":
+        locations, distance_matrix = random_instance(args.locations) if args.locations else (None, None)
+        results = island_scaling(args.counts, args.generations, None, locations, distance_matrix)
+        print(f"{'Populações':<12}{'threads (ms)':>14}{'stacked (ms)':>14}{'Aceleração':>12}")
+        for count, threads, stacked in zip(args.counts, results["threads"], results["stacked"]):
+            print(f"{count:<12}{threads * 1000:>14.2f}{stacked * 1000:>14.2f}{threads / stacked:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+import argparse
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .GeneticAlgorithm import GeneticAlgorithm
+from .Location import Location
+from .Route import Route
+from .distance_matrix import candidate_lists, euclidean_matrix, get_coordinates, haversine_matrix, paired_distances
+from .initialization import close_tours, nearest_neighbor_tours
+from .local_search import two_opt
+
+# Número alvo de locais por cluster
+DEFAULT_CLUSTER_SIZE = 200
+
+# Número máximo de iterações do k-means
+KMEANS_ITERATIONS = 30
+
+# Linhas por bloco no cálculo das distâncias aos centros (mantém o temporário pequeno)
+KMEANS_BLOCK_SIZE = 4096
+
+# Locais de cada lado de uma junção entre clusters otimizados no reparo das fronteiras
+REPAIR_WINDOW = 50
+
+# Parâmetros do algoritmo genético de cada cluster
+CLUSTER_PARAMETERS = {
+    "population_size": 60,
+    "mutation_rate": 0.3,
+    "crossover_rate": 0.8,
+    "elitism_count": 2,
+    "selection_method": "tournament",
+    "tournament_size": 3,
+    "mutation_operators": {"swap": 1, "inversion": 2, "insertion": 1},
+    "solver": "auto",
+}
+
+
+def coordinate_matrix(coordinates, metric):
+
+    """
+    Função que monta a matriz de distâncias de um conjunto (pequeno) de pontos
+
+    :param coordinates: array (m, 2) com as coordenadas
+    :param metric: haversine ou euclidean
+    :return: array (m, m) com as distâncias
+    """
+
+    if metric == 'haversine':
+        return haversine_matrix(coordinates)
+    if metric == 'euclidean':
+        return euclidean_matrix(coordinates)
+    raise ValueError(f"A decomposição exige coordenadas: use haversine ou euclidean (recebido {metric})")
+
+
+def clustering_points(coordinates, metric):
+
+    """
+    Função que converte as coordenadas em pontos onde a distância euclidiana aproxima a da métrica
+
+    :param coordinates: array (n, 2) com as coordenadas
+    :param metric: haversine (latitude e longitude, convertidas para a esfera unitária) ou euclidean
+    :return: array (n, d) com os pontos
+    """
+
+    if metric != 'haversine':
+        return np.asarray(coordinates, dtype=np.float64)
+
+    latitude, longitude = np.radians(coordinates).T
+    return np.column_stack((np.cos(latitude) * np.cos(longitude), np.cos(latitude) * np.sin(longitude),
+                            np.sin(latitude)))
+
+
+def nearest_centers(points, centers, block_size=KMEANS_BLOCK_SIZE):
+
+    """
+    Função que atribui cada ponto ao centro mais próximo
+
+    :param points: array (n, d)
+    :param centers: array (k, d)
+    :param block_size: pontos processados por bloco
+    :return: tupla (índice do centro de cada ponto, distância ao quadrado até ele)
+    """
+
+    labels = np.empty(len(points), dtype=np.intp)
+    squared = np.empty(len(points))
+    center_norms = np.einsum('ij,ij->i', centers, centers)
+
+    # |p - c|² = |p|² - 2 p·c + |c|²: um produto de matrizes por bloco
+    for start in range(0, len(points), block_size):
+        block = points[start:start + block_size]
+        distances = center_norms - 2 * block @ centers.T
+        labels[start:start + len(block)] = np.argmin(distances, axis=1)
+        squared[start:start + len(block)] = (distances[np.arange(len(block)), labels[start:start + len(block)]]
+                                             + np.einsum('ij,ij->i', block, block))
+
+    return labels, np.maximum(squared, 0.0)
+
+
+def kmeans(points, k, rng, iterations=KMEANS_ITERATIONS, tolerance=1e-9):
+
+    """
+    Função que agrupa os pontos em k clusters pelo algoritmo de Lloyd (vetorizado)
+
+    Os centros começam em k pontos sorteados; um cluster que fica vazio recebe o ponto
+    mais distante do seu centro.
+
+    :param points: array (n, d)
+    :param k: número de clusters (no máximo n)
+    :param rng: np.random.Generator
+    :param iterations: número máximo de iterações
+    :param tolerance: deslocamento quadrático máximo dos centros que encerra as iterações
+    :return: tupla (cluster de cada ponto, array (k, d) com os centros)
+    """
+
+    n, dimensions = points.shape
+    k = min(k, n)
+    centers = points[rng.choice(n, size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels, squared = nearest_centers(points, centers)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.column_stack([np.bincount(labels, weights=points[:, d], minlength=k) for d in range(dimensions)])
+        new_centers = sums / np.maximum(counts, 1)[:, None]
+
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            new_centers[empty] = points[np.argsort(squared)[-len(empty):]]
+
+        shift = np.max(np.sum((new_centers - centers) ** 2, axis=1))
+        centers = new_centers
+        if shift <= tolerance and not len(empty):
+            break
+
+    labels, _ = nearest_centers(points, centers)
+    return labels, centers
+
+
+def solve_cluster(coordinates, metric, generations, parameters, seed):
+
+    """
+    Função que resolve o ciclo de um cluster (executada nos processos do pool)
+
+    :param coordinates: array (m, 2) com as coordenadas dos locais do cluster
+    :param metric: haversine ou euclidean
+    :param generations: número de gerações do algoritmo genético
+    :param parameters: parâmetros do GeneticAlgorithm
+    :param seed: semente do cluster
+    :return: array (m,) com a ordem (índices locais) do ciclo
+    """
+
+    size = len(coordinates)
+    if size <= 3:
+        return np.arange(size)
+
+    distance_matrix = coordinate_matrix(coordinates, metric)
+    neighbors = candidate_lists(distance_matrix)
+    # Vizinho mais próximo + 2-opt semeia a população: o algoritmo genético parte de uma rota boa
+    seed_cycle = two_opt(nearest_neighbor_tours(distance_matrix, [0])[0], distance_matrix, neighbors)
+    locations = [Location(i, str(i)) for i in range(size)]
+    ga = GeneticAlgorithm(**parameters, locations=locations, distance_matrix=distance_matrix, seed=seed,
+                          initial_tours=close_tours(seed_cycle[None]), history_points=None, verbose=False)
+    ga.run(generations)
+
+    cycle = np.asarray(ga.global_best_tour[:-1])
+    return two_opt(cycle, distance_matrix, neighbors)
+
+
+def order_clusters(centroids, metric, first):
+
+    """
+    Função que define a ordem de visita dos clusters (ciclo pelos centroides)
+
+    :param centroids: array (k, 2) com as coordenadas médias de cada cluster
+    :param metric: haversine ou euclidean
+    :param first: cluster que abre a ordem (o do depósito)
+    :return: array (k,) com a ordem dos clusters
+    """
+
+    if len(centroids) <= 3:
+        order = np.arange(len(centroids))
+    else:
+        distance_matrix = coordinate_matrix(centroids, metric)
+        order = nearest_neighbor_tours(distance_matrix, [first])[0]
+        order = two_opt(order, distance_matrix, candidate_lists(distance_matrix))
+
+    return np.roll(order, -int(np.flatnonzero(order == first)[0]))
+
+
+def cut_cycle(cycle, coordinates, previous, following, metric):
+
+    """
+    Função que abre o ciclo de um cluster no ponto e no sentido de menor custo de ligação
+
+    Remover a aresta (v_i, v_i+1) do ciclo e percorrê-lo de v_i+1 até v_i (ou ao contrário)
+    custa d(previous, entrada) + d(saída, following) - d(v_i, v_i+1); todas as arestas e os
+    dois sentidos são avaliados de uma vez.
+
+    :param cycle: array (m,) com os índices (globais) do ciclo
+    :param coordinates: array (n, 2) com as coordenadas de todos os locais
+    :param previous: coordenadas do ponto de onde a rota chega ao cluster
+    :param following: coordenadas do ponto para onde a rota segue depois do cluster
+    :param metric: haversine ou euclidean
+    :return: array (m,) com o caminho aberto
+    """
+
+    if len(cycle) == 1:
+        return cycle
+
+    points = coordinates[cycle]
+    successors = np.roll(points, -1, axis=0)
+    edge = paired_distances(points, successors, metric)
+    from_previous = paired_distances(points, previous, metric)
+    to_following = paired_distances(points, following, metric)
+
+    # Sentido direto: entra em v_i+1 e sai em v_i; sentido inverso: entra em v_i e sai em v_i+1
+    forward = np.roll(from_previous, -1) + to_following - edge
+    backward = from_previous + np.roll(to_following, -1) - edge
+    i = int(np.argmin(np.minimum(forward, backward)))
+
+    if forward[i] <= backward[i]:
+        return np.roll(cycle, -(i + 1))
+    return np.roll(cycle, -(i + 1))[::-1]
+
+
+def repair_boundaries(cycle, coordinates, junctions, metric, window=REPAIR_WINDOW):
+
+    """
+    Função que otimiza com 2-opt os trechos da rota em volta de cada junção entre clusters
+
+    Cada trecho é um caminho com as pontas fixas: um nó auxiliar, a distância zero das
+    pontas e muito longe dos demais, fecha o caminho em um ciclo para o 2-opt.
+
+    :param cycle: array (n,) com o ciclo completo
+    :param coordinates: array (n, 2) com as coordenadas de todos os locais
+    :param junctions: posições (no ciclo) do primeiro local de cada cluster
+    :param metric: haversine ou euclidean
+    :param window: locais de cada lado da junção incluídos no trecho
+    :return: array (n,) com o ciclo reparado
+    """
+
+    cycle = np.array(cycle, dtype=np.intp)
+    n = len(cycle)
+    length = min(2 * window, n)
+    if length < 4:
+        return cycle
+
+    for junction in junctions:
+        positions = (junction - length // 2 + np.arange(length)) % n
+        nodes = cycle[positions]
+        distances = coordinate_matrix(coordinates[nodes], metric)
+
+        matrix = np.full((length + 1, length + 1), 1e6 * (distances.max() + 1.0))
+        matrix[:length, :length] = distances
+        matrix[length, [0, length - 1, length]] = 0.0
+        matrix[[0, length - 1], length] = 0.0
+
+        improved = two_opt(np.arange(length + 1), matrix, candidate_lists(matrix))
+        path = np.roll(improved, -(int(np.flatnonzero(improved == length)[0]) + 1))[:length]
+        if path[0] != 0:
+            path = path[::-1]
+        cycle[positions] = nodes[path]
+
+    return cycle
+
+
+def solve_decomposed(locations, metric='haversine', cluster_size=DEFAULT_CLUSTER_SIZE, generations=100,
+                     parameters=None, max_workers=None, seed=None, window=REPAIR_WINDOW, coordinates=None):
+
+    """
+    Função que resolve instâncias grandes por decomposição em clusters geográficos
+
+    Os locais são agrupados por k-means em clusters de cerca de cluster_size locais. O
+    ciclo de cada cluster é resolvido pelo GeneticAlgorithm (seguido de 2-opt) em processos
+    paralelos, os clusters são ordenados por um ciclo entre os centroides, os ciclos são
+    abertos e ligados nessa ordem e, por fim, os trechos em volta das junções são reparados
+    com 2-opt. Nenhuma matriz completa de distâncias é montada: o custo de cada cluster é
+    constante e o tempo total cresce aproximadamente de forma linear com o número de locais.
+
+    :param locations: lista de locais com coordenadas (o primeiro é o depósito)
+    :param metric: haversine (latitude e longitude) ou euclidean
+    :param cluster_size: número alvo de locais por cluster
+    :param generations: gerações do algoritmo genético de cada cluster
+    :param parameters: parâmetros do GeneticAlgorithm que substituem CLUSTER_PARAMETERS
+    :param max_workers: número de processos (padrão: número de CPUs; 1 resolve no próprio processo)
+    :param seed: semente do k-means e dos clusters
+    :param window: locais de cada lado das junções otimizados no reparo
+    :param coordinates: array (n, 2) com as coordenadas (padrão: lidas dos locais)
+    :return: dicionário com route, tour (ids), distance, clusters, elapsed e timings (segundos por fase)
+    """
+
+    start = time.perf_counter()
+    timings = {}
+    coordinates = get_coordinates(locations) if coordinates is None else np.asarray(coordinates, dtype=np.float64)
+    n = len(coordinates)
+    rng = np.random.default_rng(seed)
+    parameters = {**CLUSTER_PARAMETERS, **(parameters or {})}
+
+    # 1. Clusters geográficos
+    k = max(1, math.ceil(n / cluster_size))
+    labels, _ = kmeans(clustering_points(coordinates, metric), k, rng)
+    members = [np.flatnonzero(labels == cluster) for cluster in range(k)]
+    members = [cluster for cluster in members if len(cluster)]
+    timings["clustering"] = time.perf_counter() - start
+
+    # 2. Ciclo de cada cluster, em paralelo
+    phase = time.perf_counter()
+    seeds = rng.integers(0, 2 ** 32, len(members))
+    arguments = ([coordinates[cluster] for cluster in members], [metric] * len(members),
+                 [generations] * len(members), [parameters] * len(members), seeds.tolist())
+    if max_workers == 1 or len(members) == 1:
+        local_cycles = list(map(solve_cluster, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            local_cycles = list(executor.map(solve_cluster, *arguments))
+    cycles = [cluster[local] for cluster, local in zip(members, local_cycles)]
+    timings["clusters"] = time.perf_counter() - phase
+
+    # 3. Ordem dos clusters e ligação dos ciclos
+    phase = time.perf_counter()
+    centroids = np.array([coordinates[cluster].mean(axis=0) for cluster in members])
+    depot_cluster = next(i for i, cluster in enumerate(members) if 0 in cluster)
+    order = order_clusters(centroids, metric, depot_cluster)
+
+    paths = []
+    for position, cluster in enumerate(order):
+        previous = coordinates[paths[-1][-1]] if paths else centroids[order[-1]]
+        if position + 1 < len(order):
+            following = centroids[order[position + 1]]
+        else:
+            # O último cluster volta para a entrada do primeiro
+            following = coordinates[paths[0][0]] if paths else centroids[cluster]
+        paths.append(cut_cycle(cycles[cluster], coordinates, previous, following, metric))
+    cycle = np.concatenate(paths)
+    junctions = np.cumsum([0] + [len(path) for path in paths[:-1]])
+    timings["stitching"] = time.perf_counter() - phase
+
+    # 4. Reparo das fronteiras
+    phase = time.perf_counter()
+    if len(paths) > 1:
+        cycle = repair_boundaries(cycle, coordinates, junctions, metric, window)
+    tour = close_tours(cycle[None])[0]
+    distance = float(paired_distances(coordinates[tour[:-1]], coordinates[tour[1:]], metric).sum())
+    timings["repair"] = time.perf_counter() - phase
+
+    return {
+        "route": Route([locations[i] for i in tour], distance=distance),
+        "tour": [locations[i].id for i in tour],
+        "distance": distance,
+        "clusters": len(members),
+        "elapsed": time.perf_counter() - start,
+        "timings": timings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decomposição em clusters para instâncias grandes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 5000, 10000],
+                        help="Tamanhos das instâncias euclidianas aleatórias")
+    parser.add_argument("--cluster-size", type=int, default=DEFAULT_CLUSTER_SIZE)
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{'Locais':>8}{'Clusters':>10}{'Distância':>12}{'Tempo (s)':>11}{'µs/local':>10}  Fases (s)")
+    for size in args.sizes:
+        coordinates = np.random.default_rng(size).random((size, 2))
+        locations = [Location(i, f"Local {i}", *point) for i, point in enumerate(coordinates)]
+        result = solve_decomposed(locations, 'euclidean', args.cluster_size, args.generations,
+                                  max_workers=args.workers, seed=0)
+        phases = " ".join(f"{name}={seconds:.2f}" for name, seconds in result["timings"].items())
+        print(f"{size:>8}{result['clusters']:>10}{result['distance']:>12.3f}{result['elapsed']:>11.2f}"
+              f"{result['elapsed'] / size * 1e6:>10.0f}  {phases}")
+
+
+if __name__ == "__main__":
+    main()
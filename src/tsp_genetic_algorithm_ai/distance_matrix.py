@@ -0,0 +1,241 @@
+import numpy as np
+from .Location import Location
+from .distances_map import get_distances_table
+
+# Raio médio da Terra em km
+EARTH_RADIUS_KM = 6371.0088
+
+METRICS = ('haversine', 'euclidean', 'explicit')
+
+# Linhas processadas por bloco nos cálculos vetorizados
+BLOCK_SIZE = 256
+
+
+def get_coordinates(locations: list[Location]) -> np.ndarray:
+
+    """
+    Função que retorna as coordenadas dos locais em um array
+
+    :param locations: lista de locais
+    :return: array (n, 2) com latitude e longitude de cada local
+    """
+
+    missing = [location.name for location in locations if not location.has_coordinates()]
+    if missing:
+        raise ValueError(f"Locais sem coordenadas: {', '.join(missing)}")
+
+    return np.array([(location.latitude, location.longitude) for location in locations], dtype=np.float64)
+
+
+def haversine_matrix(coordinates: np.ndarray, block_size=BLOCK_SIZE) -> np.ndarray:
+
+    """
+    Função que calcula a matriz de distâncias pela fórmula de haversine
+
+    :param coordinates: array (n, 2) com latitude e longitude em graus
+    :param block_size: quantidade de linhas calculadas por bloco
+    :return: array (n, n) com as distâncias em km
+    """
+
+    radians = np.radians(coordinates)
+    half_latitude = radians[:, 0] / 2
+    half_longitude = radians[:, 1] / 2
+    cos_latitude = np.cos(radians[:, 0])
+
+    # sin((a - b)/2) = sin(a/2)cos(b/2) - cos(a/2)sin(b/2): evita senos sobre n² elementos
+    sin_lat, cos_lat = np.sin(half_latitude), np.cos(half_latitude)
+    sin_lon, cos_lon = np.sin(half_longitude), np.cos(half_longitude)
+
+    n = len(coordinates)
+    matrix = np.empty((n, n), dtype=np.float64)
+    buffer = np.empty((min(block_size, n), n), dtype=np.float64)
+
+    # Calcula em blocos de linhas para manter os temporários pequenos
+    for start in range(0, n, block_size):
+        end = min(n, start + block_size)
+        rows = matrix[start:end]
+        temp = buffer[:end - start]
+
+        # sin²(Δlat/2)
+        np.multiply.outer(sin_lat[start:end], cos_lat, out=rows)
+        np.multiply.outer(cos_lat[start:end], sin_lat, out=temp)
+        rows -= temp
+        np.square(rows, out=rows)
+
+        # cos(lat1)·cos(lat2)·sin²(Δlon/2)
+        np.multiply.outer(sin_lon[start:end], cos_lon, out=temp)
+        temp -= np.multiply.outer(cos_lon[start:end], sin_lon)
+        np.square(temp, out=temp)
+        temp *= cos_latitude[start:end, None]
+        temp *= cos_latitude[None, :]
+        rows += temp
+
+        np.sqrt(rows, out=rows)
+        np.minimum(rows, 1.0, out=rows)
+        np.arcsin(rows, out=rows)
+        rows *= 2 * EARTH_RADIUS_KM
+
+    return matrix
+
+
+def euclidean_matrix(coordinates: np.ndarray, block_size=BLOCK_SIZE) -> np.ndarray:
+
+    """
+    Função que calcula a matriz de distâncias euclidianas (coordenadas planas)
+
+    :param coordinates: array (n, 2) com as coordenadas
+    :param block_size: quantidade de linhas calculadas por bloco
+    :return: array (n, n) com as distâncias
+    """
+
+    x = coordinates[:, 0]
+    y = coordinates[:, 1]
+
+    n = len(coordinates)
+    matrix = np.empty((n, n), dtype=np.float64)
+    buffer = np.empty((min(block_size, n), n), dtype=np.float64)
+
+    for start in range(0, n, block_size):
+        end = min(n, start + block_size)
+        rows = matrix[start:end]
+        temp = buffer[:end - start]
+
+        np.subtract.outer(x[start:end], x, out=rows)
+        np.square(rows, out=rows)
+        np.subtract.outer(y[start:end], y, out=temp)
+        np.square(temp, out=temp)
+        rows += temp
+        np.sqrt(rows, out=rows)
+
+    return matrix
+
+
+def explicit_matrix(locations: list[Location]) -> np.ndarray:
+
+    """
+    Função que monta a matriz de distâncias a partir da tabela explícita (distances_map)
+
+    :param locations: lista de locais
+    :return: array (n, n) com as distâncias da tabela
+    """
+
+    n = len(locations)
+    table = get_distances_table()
+    matrix = np.zeros((n, n), dtype=np.float64)
+    for i, origin in enumerate(locations):
+        for j, destination in enumerate(locations):
+            if i != j:
+                matrix[i, j] = table[(origin.name, destination.name)]
+
+    return matrix
+
+
+def build_distance_matrix(locations: list[Location], metric='haversine', detour_factor=1.0, cache=None) -> np.ndarray:
+
+    """
+    Função que constrói a matriz completa de distâncias entre os locais
+
+    :param locations: lista de locais
+    :param metric: métrica utilizada (haversine, euclidean ou explicit)
+    :param detour_factor: fator multiplicativo de desvio rodoviário aplicado às distâncias calculadas
+    :param cache: DistanceMatrixCache opcional; se informado, a matriz é lida/gravada em disco
+    :return: array (n, n) com as distâncias, na ordem da lista de locais
+    """
+
+    if cache is not None:
+        return cache.get_or_build(locations, metric, detour_factor, builder=build_distance_matrix)
+
+    if metric == 'explicit':
+        return explicit_matrix(locations)
+
+    coordinates = get_coordinates(locations)
+    if metric == 'haversine':
+        matrix = haversine_matrix(coordinates)
+    elif metric == 'euclidean':
+        matrix = euclidean_matrix(coordinates)
+    else:
+        raise ValueError(f"Métrica desconhecida: {metric}. Use uma de {METRICS}")
+
+    if detour_factor != 1.0:
+        matrix *= detour_factor
+
+    return matrix
+
+
+def candidate_lists(distance_matrix, k=10):
+
+    """
+    Função que retorna os k vizinhos mais próximos de cada local, em ordem crescente de distância
+
+    :param distance_matrix: matriz (n, n) de distâncias
+    :param k: número de vizinhos por local
+    :return: array (n, k) com os índices dos vizinhos
+    """
+
+    distance_matrix = np.asarray(distance_matrix)
+    n = len(distance_matrix)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.intp)
+
+    masked = distance_matrix.astype(np.float64, copy=True)
+    np.fill_diagonal(masked, np.inf)
+    nearest = np.argpartition(masked, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(masked, nearest, axis=1), axis=1, kind='stable')
+
+    return np.take_along_axis(nearest, order, axis=1).astype(np.intp)
+
+
+def random_instance(size, seed=0):
+
+    """
+    Função que gera uma instância euclidiana aleatória no quadrado unitário
+
+    :param size: número de locais
+    :param seed: semente da instância
+    :return: tupla (locais, matriz de distâncias)
+    """
+
+    coordinates = np.random.default_rng(seed).random((size, 2))
+    locations = [Location(i, f"Local {i}", *point) for i, point in enumerate(coordinates)]
+    return locations, euclidean_matrix(coordinates)
+
+
+def haversine_distances(point, coordinates: np.ndarray) -> np.ndarray:
+
+    """
+    Função que calcula as distâncias de haversine de um ponto (ou de cada ponto de um array pareado) a vários pontos
+
+    :param point: par (latitude, longitude) em graus, ou array (n, 2) pareado com coordinates
+    :param coordinates: array (n, 2) com latitude e longitude em graus
+    :return: array (n,) com as distâncias em km
+    """
+
+    a = np.radians(np.asarray(point, dtype=np.float64))
+    b = np.radians(np.asarray(coordinates, dtype=np.float64))
+    h = (np.sin((b[..., 0] - a[..., 0]) / 2) ** 2
+         + np.cos(a[..., 0]) * np.cos(b[..., 0]) * np.sin((b[..., 1] - a[..., 1]) / 2) ** 2)
+
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+
+def paired_distances(origins: np.ndarray, destinations: np.ndarray, metric='haversine') -> np.ndarray:
+
+    """
+    Função que calcula a distância entre pares de pontos (origins[i], destinations[i])
+
+    :param origins: array (m, 2) com as coordenadas de origem
+    :param destinations: array (m, 2) (ou (2,), aplicado a todas as origens) com as coordenadas de destino
+    :param metric: métrica utilizada (haversine ou euclidean)
+    :return: array (m,) com as distâncias
+    """
+
+    origins = np.asarray(origins, dtype=np.float64)
+    destinations = np.broadcast_to(np.asarray(destinations, dtype=np.float64), origins.shape)
+
+    if metric == 'euclidean':
+        return np.hypot(*(origins - destinations).T)
+    if metric != 'haversine':
+        raise ValueError(f"Métrica sem coordenadas: {metric}. Use haversine ou euclidean")
+
+    return haversine_distances(origins, destinations)
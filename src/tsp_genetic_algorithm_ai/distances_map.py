@@ -1,3 +1,7 @@
+import hashlib
+from functools import cache
+
+
 def get_distances_map(origin, destination) -> float:
 
     """
@@ -8,7 +12,34 @@ def get_distances_map(origin, destination) -> float:
     :return: float com a distância entre os dois locais
     """
 
-    distances = {
+    return get_distances_table()[(origin, destination)]
+
+
+@cache
+def get_distances_table_digest() -> str:
+
+    """
+    Função que retorna o hash (sha256) do conteúdo da tabela de distâncias, usado nas chaves de cache
+
+    :return: string hexadecimal com o hash dos pares e distâncias da tabela
+    """
+
+    digest = hashlib.sha256()
+    for (origin, destination), distance in sorted(get_distances_table().items()):
+        digest.update(f"{origin}|{destination}|{float(distance)!r}\n".encode())
+    return digest.hexdigest()
+
+
+@cache
+def get_distances_table() -> dict:
+
+    """
+    Função que retorna a tabela de distâncias entre os locais (montada uma única vez, no primeiro uso)
+
+    :return: dicionário {(origem, destino): distância}
+    """
+
+    return {
         ('Fazenda em Delta - MG', 'Zebu Carnes Ramid Mauad'): 36.7,
         ('Fazenda em Delta - MG', 'Zebu Carnes Saudade'): 39.3,
         ('Fazenda em Delta - MG', 'Zebu Carnes Nossa Senhora do Desterro'): 33.1,
@@ -472,4 +503,3 @@ def get_distances_map(origin, destination) -> float:
         ('Villefort', 'ABC Atacado e Varejo Cherém'): 2.6,
         ('Villefort', 'Supermercado ABC - Rua João Alfredo'): 3.8
     }
-    return distances[(origin, destination)]
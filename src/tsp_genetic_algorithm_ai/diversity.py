@@ -0,0 +1,168 @@
+from collections import Counter
+import numpy as np
+
+
+def _x_log_x(values):
+    """Calcula x·log(x) elemento a elemento, com 0·log(0) = 0."""
+    values = np.asarray(values, dtype=np.float64)
+    result = np.zeros_like(values)
+    positive = values > 0
+    result[positive] = values[positive] * np.log(values[positive])
+    return result
+
+
+class PopulationDiversity:
+
+    """
+    Classe que mantém a frequência das arestas de uma população de forma incremental
+
+    O rastreador guarda uma cópia das rotas de cada posição da população. A cada atualização
+    apenas as posições informadas (rows) são comparadas, e só as que mudaram alteram a matriz
+    de frequência e as somas Σc² e Σc·log(c), ajustadas apenas nas arestas afetadas: o custo é
+    O(len(rows)·n). Sem rows (população inteira substituída, como no modo generational) todas
+    as posições são comparadas com uma única comparação vetorizada.
+    """
+
+    def __init__(self, num_locations):
+
+        """
+        Construtor da classe PopulationDiversity
+
+        :param num_locations: número de locais (tamanho da matriz de distâncias)
+        """
+
+        self.num_locations = num_locations
+        self.edge_counts = np.zeros((num_locations, num_locations), dtype=np.int64)
+        self.tour_counts = Counter()
+        self.tours = None
+        self.population_size = 0
+        self.edges_per_tour = 0
+        self.sum_squares = 0.0
+        self.sum_x_log_x = 0.0
+
+    def update(self, tours, rows=None):
+
+        """
+        Método que sincroniza a frequência das arestas com a população atual
+
+        :param tours: array (indivíduos, locais) com os índices de cada rota
+        :param rows: índices das posições que podem ter sido substituídas desde a última atualização
+            (padrão: todas)
+        :return: número de posições cuja rota mudou
+        """
+
+        tours = np.asarray(tours)
+        if self.tours is None or self.tours.shape != tours.shape:
+            # Primeira sincronização (ou população de outro tamanho): todas as rotas saem e entram
+            previous = self.tours if self.tours is not None else tours[:0]
+            self._apply(np.concatenate((previous, tours)), np.repeat([-1, 1], [len(previous), len(tours)]))
+            self.tours = tours.copy()
+            self.tour_counts = Counter(tour.tobytes() for tour in tours)
+            self.population_size = len(tours)
+            self.edges_per_tour = tours.shape[1] - 1 if len(tours) else 0
+            return len(tours)
+
+        if rows is None:
+            changed = np.flatnonzero(np.any(tours != self.tours, axis=1))
+        else:
+            rows = np.unique(np.asarray(rows, dtype=np.intp))
+            changed = rows[np.any(tours[rows] != self.tours[rows], axis=1)]
+        if not len(changed):
+            return 0
+
+        removed, added = self.tours[changed], tours[changed]
+        self._apply(np.concatenate((removed, added)), np.repeat([-1, 1], len(changed)))
+        for tour in removed:
+            key = tour.tobytes()
+            self.tour_counts[key] -= 1
+            if not self.tour_counts[key]:
+                del self.tour_counts[key]
+        for tour in added:
+            self.tour_counts[tour.tobytes()] += 1
+        self.tours[changed] = added
+
+        return len(changed)
+
+    def _apply(self, tours, signs):
+
+        """
+        Método que soma (ou subtrai) as arestas das rotas alteradas
+
+        :param tours: array (rotas, locais) com as rotas que saíram e as que entraram
+        :param signs: array (rotas,) com -1 para as rotas que saíram e 1 para as que entraram
+        """
+
+        if not len(tours):
+            return
+
+        weights = np.repeat(signs, tours.shape[1] - 1)
+
+        # Arestas não direcionadas: (menor índice, maior índice)
+        origin = tours[:, :-1].ravel()
+        destination = tours[:, 1:].ravel()
+        low = np.minimum(origin, destination)
+        high = np.maximum(origin, destination)
+        edges, inverse = np.unique(low * self.num_locations + high, return_inverse=True)
+        delta = np.bincount(inverse, weights=weights).astype(np.int64)
+
+        rows, cols = np.divmod(edges, self.num_locations)
+        old = self.edge_counts[rows, cols]
+        new = old + delta
+        self.edge_counts[rows, cols] = new
+
+        self.sum_squares += float(np.sum(new.astype(np.float64) ** 2 - old.astype(np.float64) ** 2))
+        self.sum_x_log_x += float(np.sum(_x_log_x(new) - _x_log_x(old)))
+
+    def mean_edge_distance(self):
+
+        """
+        Método que retorna a distância média de arestas entre pares de indivíduos
+
+        :return: float em [0, 1] com a fração média de arestas não compartilhadas por par
+        """
+
+        size = self.population_size
+        if size < 2 or self.edges_per_tour == 0:
+            return 0.0
+
+        # Σ_e c(c-1) é o total de arestas compartilhadas somado sobre os pares ordenados
+        shared = (self.sum_squares - size * self.edges_per_tour) / (size * (size - 1))
+        return 1.0 - shared / self.edges_per_tour
+
+    def edge_entropy(self):
+
+        """
+        Método que retorna a entropia das arestas da população
+
+        :return: float com -Σ (c/P)·log(c/P) sobre as arestas presentes
+        """
+
+        size = self.population_size
+        if size == 0:
+            return 0.0
+
+        return self.edges_per_tour * np.log(size) - self.sum_x_log_x / size
+
+    def unique_tours(self):
+
+        """
+        Método que retorna o número de rotas distintas na população
+
+        :return: int com a quantidade de rotas distintas
+        """
+
+        return len(self.tour_counts)
+
+    def metrics(self):
+
+        """
+        Método que retorna todas as medidas de diversidade
+
+        :return: dicionário com mean_edge_distance, edge_entropy e unique_tours
+        """
+
+        return {
+            "mean_edge_distance": float(self.mean_edge_distance()),
+            "edge_entropy": float(self.edge_entropy()),
+            "unique_tours": self.unique_tours(),
+        }
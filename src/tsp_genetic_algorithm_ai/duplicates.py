@@ -0,0 +1,96 @@
+import numpy as np
+
+DUPLICATE_CONTROLS = ('perturb', 'replace')
+
+
+class TourFingerprint:
+
+    """
+    Classe que calcula impressões digitais (hash de Zobrist) de rotas em lote
+
+    Cada par (posição, local) recebe um inteiro aleatório de 64 bits e o hash de uma
+    rota é o XOR desses inteiros, calculado para toda a população em uma única
+    operação vetorizada. Opcionalmente o hash ignora a rotação (o ciclo é girado para
+    começar no menor índice) e o sentido (rota e rota invertida têm o mesmo hash).
+    """
+
+    def __init__(self, num_locations, tour_length, symmetric=True, rotation=False, seed=0):
+
+        """
+        Construtor da classe TourFingerprint
+
+        :param num_locations: número de locais (tamanho da matriz de distâncias)
+        :param tour_length: número de posições de cada rota
+        :param symmetric: se True, rota e rota invertida têm o mesmo hash
+        :param rotation: se True, rotações do mesmo ciclo têm o mesmo hash
+        :param seed: semente da tabela de inteiros aleatórios
+        """
+
+        self.symmetric = symmetric
+        self.rotation = rotation
+        rng = np.random.default_rng(seed)
+        self.table = rng.integers(0, np.iinfo(np.uint64).max, size=(tour_length, num_locations),
+                                  dtype=np.uint64, endpoint=True)
+
+    def _hash(self, tours):
+        """Calcula o XOR das entradas da tabela de cada rota."""
+        positions = np.arange(tours.shape[1])
+        return np.bitwise_xor.reduce(self.table[positions, tours], axis=1)
+
+    def __call__(self, tours):
+
+        """
+        Método que calcula o hash de cada rota
+
+        :param tours: array (indivíduos, posições) com os índices de cada rota
+        :return: array (indivíduos,) de uint64 com os hashes
+        """
+
+        tours = np.asarray(tours)
+        if self.rotation:
+            tours = self._canonical_rotation(tours)
+
+        hashes = self._hash(tours)
+        if self.symmetric:
+            reverse = tours[:, ::-1]
+            if self.rotation:
+                reverse = self._canonical_rotation(reverse)
+            hashes = np.minimum(hashes, self._hash(reverse))
+
+        return hashes
+
+    def _canonical_rotation(self, tours):
+
+        """
+        Método que gira cada ciclo para começar no menor índice
+
+        :param tours: array (indivíduos, posições); se a rota é fechada (último = primeiro), o fechamento é mantido
+        :return: array com as rotas giradas
+        """
+
+        closed = tours.shape[1] > 1 and np.all(tours[:, 0] == tours[:, -1])
+        cycle = tours[:, :-1] if closed else tours
+        length = cycle.shape[1]
+
+        start = np.argmin(cycle, axis=1)
+        columns = (start[:, None] + np.arange(length)) % length
+        rotated = np.take_along_axis(cycle, columns, axis=1)
+
+        if closed:
+            rotated = np.hstack([rotated, rotated[:, :1]])
+        return rotated
+
+
+def duplicate_mask(fingerprints):
+
+    """
+    Função que marca as rotas repetidas de uma população
+
+    :param fingerprints: array com o hash de cada rota
+    :return: array booleano, True nas repetições (a primeira ocorrência fica False)
+    """
+
+    mask = np.ones(len(fingerprints), dtype=bool)
+    _, first = np.unique(fingerprints, return_index=True)
+    mask[first] = False
+    return mask
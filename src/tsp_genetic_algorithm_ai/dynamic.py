@@ -0,0 +1,125 @@
+import numpy as np
+
+# Fator de crescimento da capacidade do DistanceBuffer: o buffer ocupa capacidade², então o fator é pequeno
+GROWTH_FACTOR = 1.25
+
+
+class DistanceBuffer:
+
+    """
+    Classe que mantém a matriz de distâncias em um buffer com capacidade reservada
+
+    Inserir um local escreve apenas uma linha e uma coluna (a capacidade cresce por
+    GROWTH_FACTOR quando acaba), e remover um local move o último local para a posição liberada, copiando
+    também só uma linha e uma coluna.
+    """
+
+    def __init__(self, distance_matrix, capacity=None):
+
+        """
+        Construtor da classe DistanceBuffer
+
+        :param distance_matrix: matriz (n, n) de distâncias inicial
+        :param capacity: número de locais reservado (padrão: n)
+        """
+
+        n = len(distance_matrix)
+        capacity = max(capacity or 0, n)
+        self.buffer = np.zeros((capacity, capacity), dtype=np.float64)
+        self.buffer[:n, :n] = distance_matrix
+        self.size = n
+
+    @property
+    def matrix(self):
+
+        """
+        Propriedade com a matriz de distâncias atual (view do buffer)
+
+        :return: array (n, n) com as distâncias
+        """
+
+        return self.buffer[:self.size, :self.size]
+
+    def add(self, outgoing, incoming):
+
+        """
+        Método que acrescenta um local ao final da matriz
+
+        :param outgoing: array (n,) com as distâncias do novo local até os atuais
+        :param incoming: array (n,) com as distâncias dos locais atuais até o novo
+        :return: índice do novo local
+        """
+
+        if self.size == len(self.buffer):
+            buffer = np.zeros((max(self.size + 4, int(GROWTH_FACTOR * self.size)),) * 2, dtype=np.float64)
+            buffer[:self.size, :self.size] = self.matrix
+            self.buffer = buffer
+
+        index = self.size
+        self.buffer[index, :index] = outgoing
+        self.buffer[:index, index] = incoming
+        self.buffer[index, index] = 0.0
+        self.size += 1
+        return index
+
+    def remove(self, index):
+
+        """
+        Método que remove um local, movendo o último local para a sua posição
+
+        :param index: índice do local removido
+        :return: índice antigo do local movido para index (igual a index se era o último)
+        """
+
+        last = self.size - 1
+        if index != last:
+            self.buffer[index, :self.size] = self.buffer[last, :self.size]
+            self.buffer[:self.size, index] = self.buffer[:self.size, last]
+            self.buffer[index, index] = 0.0
+        self.size -= 1
+        return last
+
+
+def cheapest_insertion(tours, distance_matrix, node):
+
+    """
+    Função que insere um local em todas as rotas, cada uma na posição de menor acréscimo de distância
+
+    :param tours: array (rotas, L) com as rotas fechadas (depósito nas pontas)
+    :param distance_matrix: matriz de distâncias que já inclui o novo local
+    :param node: índice do novo local
+    :return: array (rotas, L + 1) com as rotas reparadas
+    """
+
+    tours = np.asarray(tours)
+    count, length = tours.shape
+    origin, destination = tours[:, :-1], tours[:, 1:]
+    increase = (distance_matrix[origin, node] + distance_matrix[node, destination]
+                - distance_matrix[origin, destination])
+    position = np.argmin(increase, axis=1) + 1
+
+    # Desloca uma posição para a direita tudo a partir do ponto de inserção
+    columns = np.arange(length + 1)
+    source = columns[None, :] - (columns[None, :] >= position[:, None])
+    repaired = np.take_along_axis(tours, np.clip(source, 0, length - 1), axis=1)
+    repaired[np.arange(count), position] = node
+    return repaired
+
+
+def splice_out(tours, node, moved=None):
+
+    """
+    Função que remove um local de todas as rotas, ligando diretamente seus vizinhos
+
+    :param tours: array (rotas, L) com as rotas fechadas (depósito nas pontas)
+    :param node: índice do local removido
+    :param moved: índice antigo do local que passa a ocupar o índice node (ver DistanceBuffer.remove)
+    :return: array (rotas, L - 1) com as rotas reparadas
+    """
+
+    tours = np.asarray(tours)
+    count, length = tours.shape
+    repaired = tours[tours != node].reshape(count, length - 1)
+    if moved is not None and moved != node:
+        repaired[repaired == moved] = node
+    return repaired
@@ -0,0 +1,91 @@
+import numpy as np
+
+# Limite padrão de memória da tabela de programação dinâmica (1 GiB)
+DEFAULT_MAX_MEMORY = 1 << 30
+
+# Maior número de paradas (sem o depósito) resolvido automaticamente pelo modo exato
+EXACT_MAX_STOPS = 20
+
+
+def held_karp_memory(num_locations):
+
+    """
+    Função que estima a memória usada pelo Held-Karp
+
+    :param num_locations: número de locais (incluindo o depósito)
+    :return: bytes da tabela de custos (float64) e de predecessores (int8)
+    """
+
+    stops = num_locations - 1
+    return (1 << stops) * stops * (8 + 1)
+
+
+def held_karp(distance_matrix, depot=0, max_memory=DEFAULT_MAX_MEMORY):
+
+    """
+    Função que resolve o caixeiro viajante de forma exata por programação dinâmica em bitmask
+
+    dp[S, j] é o menor custo de sair do depósito, visitar exatamente o conjunto S e
+    terminar em j. Os subconjuntos são processados por camadas de mesma cardinalidade,
+    e cada camada é calculada de forma vetorizada para cada último local j.
+
+    :param distance_matrix: matriz (n, n) de distâncias (não precisa ser simétrica)
+    :param depot: índice do depósito
+    :param max_memory: memória máxima (bytes) permitida para as tabelas
+    :return: tupla (distância ótima, array (n + 1,) com a rota fechada no depósito)
+    """
+
+    distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+    n = len(distance_matrix)
+    if n <= 2:
+        tour = np.array([depot] + [i for i in range(n) if i != depot] + [depot], dtype=np.intp)
+        return float(distance_matrix[tour[:-1], tour[1:]].sum()), tour
+
+    required = held_karp_memory(n)
+    if required > max_memory:
+        raise MemoryError(f"Held-Karp com {n} locais precisa de {required / 2**20:.0f} MiB "
+                          f"(limite: {max_memory / 2**20:.0f} MiB)")
+
+    stops = np.delete(np.arange(n, dtype=np.intp), depot)
+    m = len(stops)
+    inner = distance_matrix[np.ix_(stops, stops)]
+    start = distance_matrix[depot, stops]
+    back = distance_matrix[stops, depot]
+
+    full = (1 << m) - 1
+    cost = np.full((full + 1, m), np.inf)
+    parent = np.full((full + 1, m), -1, dtype=np.int8)
+    singles = 1 << np.arange(m)
+    cost[singles, np.arange(m)] = start
+
+    # Subconjuntos agrupados por cardinalidade
+    masks = np.arange(full + 1, dtype=np.int64)
+    sizes = np.bitwise_count(masks)
+    order = np.argsort(sizes, kind='stable')
+    bounds = np.searchsorted(sizes[order], np.arange(m + 2))
+
+    for size in range(2, m + 1):
+        layer = order[bounds[size]:bounds[size + 1]]
+        for j in range(m):
+            subsets = layer[(layer >> j) & 1 == 1]
+            previous = subsets ^ (1 << j)
+            candidates = cost[previous] + inner[:, j]
+            best = np.argmin(candidates, axis=1)
+            cost[subsets, j] = candidates[np.arange(len(subsets)), best]
+            parent[subsets, j] = best
+
+    totals = cost[full] + back
+    last = int(np.argmin(totals))
+    distance = float(totals[last])
+
+    # Reconstrói a rota a partir dos predecessores
+    path = []
+    mask = full
+    while last >= 0:
+        path.append(stops[last])
+        previous = int(parent[mask, last])
+        mask ^= 1 << last
+        last = previous
+    path.reverse()
+
+    return distance, np.array([depot] + path + [depot], dtype=np.intp)
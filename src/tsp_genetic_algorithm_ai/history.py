@@ -0,0 +1,119 @@
+import numpy as np
+
+# Número máximo padrão de pontos mantidos no histórico
+DEFAULT_MAX_POINTS = 2048
+
+
+class ConvergenceHistory:
+
+    """
+    Classe que mantém o histórico de convergência com memória constante
+
+    Os pontos ficam em arrays pré-alocados. Cada ponto é um intervalo de gerações com
+    o mínimo e o máximo de cada série no intervalo. Quando os arrays enchem, pontos
+    vizinhos são fundidos dois a dois (dizimação que preserva mínimo e máximo) e cada
+    novo ponto passa a cobrir o dobro de gerações.
+    """
+
+    def __init__(self, num_series, max_points=DEFAULT_MAX_POINTS):
+
+        """
+        Construtor da classe ConvergenceHistory
+
+        :param num_series: número de séries registradas a cada geração
+        :param max_points: número máximo de pontos mantidos (par, no mínimo 2)
+        """
+
+        if max_points < 2 or max_points % 2:
+            raise ValueError("max_points deve ser par e maior ou igual a 2")
+
+        self.num_series = num_series
+        self.max_points = max_points
+        self.first = np.empty(max_points, dtype=np.int64)
+        self.last = np.empty(max_points, dtype=np.int64)
+        self.counts = np.empty(max_points, dtype=np.int64)
+        self.minimum = np.empty((max_points, num_series), dtype=np.float64)
+        self.maximum = np.empty((max_points, num_series), dtype=np.float64)
+        self.size = 0
+        # Número de gerações que cada novo ponto acumula
+        self.stride = 1
+
+    def __len__(self):
+        return self.size
+
+    def append(self, generation, values):
+
+        """
+        Método que registra os valores das séries em uma geração
+
+        :param generation: número da geração
+        :param values: array (num_series,) com o valor de cada série
+        """
+
+        values = np.asarray(values, dtype=np.float64)
+        index = self.size - 1
+
+        # Acumula no último ponto enquanto ele cobre menos que stride gerações
+        if self.size and self.counts[index] < self.stride:
+            np.minimum(self.minimum[index], values, out=self.minimum[index])
+            np.maximum(self.maximum[index], values, out=self.maximum[index])
+            self.last[index] = generation
+            self.counts[index] += 1
+            return
+
+        if self.size == self.max_points:
+            self.decimate()
+
+        index = self.size
+        self.first[index] = self.last[index] = generation
+        self.counts[index] = 1
+        self.minimum[index] = values
+        self.maximum[index] = values
+        self.size += 1
+
+    def decimate(self):
+
+        """
+        Método que funde os pontos dois a dois, liberando metade dos arrays
+        """
+
+        pairs = self.size // 2
+        left, right = slice(0, 2 * pairs, 2), slice(1, 2 * pairs, 2)
+
+        self.first[:pairs] = self.first[left]
+        self.last[:pairs] = self.last[right]
+        self.counts[:pairs] = self.counts[left] + self.counts[right]
+        self.minimum[:pairs] = np.minimum(self.minimum[left], self.minimum[right])
+        self.maximum[:pairs] = np.maximum(self.maximum[left], self.maximum[right])
+
+        # Um ponto sem par é mantido como está
+        if self.size % 2:
+            for array in (self.first, self.last, self.counts, self.minimum, self.maximum):
+                array[pairs] = array[self.size - 1]
+
+        self.size = pairs + self.size % 2
+        self.stride *= 2
+
+    def arrays(self):
+
+        """
+        Método que retorna uma cópia do histórico
+
+        :return: dicionário com first e last (gerações de cada ponto, (k,)) e minimum e maximum ((k, num_series))
+        """
+
+        return {
+            "first": self.first[:self.size].copy(),
+            "last": self.last[:self.size].copy(),
+            "minimum": self.minimum[:self.size].copy(),
+            "maximum": self.maximum[:self.size].copy(),
+        }
+
+    def clear(self):
+
+        """
+        Método que descarta o histórico
+        """
+
+        self.size = 0
+        self.stride = 1
@@ -0,0 +1,288 @@
+import numpy as np
+
+# Estratégias de semeadura disponíveis (além das rotas aleatórias)
+STRATEGIES = ('nearest_neighbor', 'greedy_edge', 'space_filling_curve', 'random_insertion')
+
+# Número de vizinhos candidatos de cada local considerados pelo greedy edge
+GREEDY_CANDIDATES = 10
+
+
+def close_tours(cycles, depot=0):
+
+    """
+    Função que gira ciclos (permutações de todos os locais) para começar e terminar no depósito
+
+    :param cycles: array (rotas, n) com permutações de todos os índices
+    :param depot: índice do depósito
+    :return: array (rotas, n + 1) com o depósito nas pontas
+    """
+
+    cycles = np.asarray(cycles, dtype=np.intp)
+    length = cycles.shape[1]
+    start = np.argmax(cycles == depot, axis=1)
+    columns = (start[:, None] + np.arange(length)) % length
+
+    tours = np.empty((len(cycles), length + 1), dtype=np.intp)
+    tours[:, :-1] = np.take_along_axis(cycles, columns, axis=1)
+    tours[:, -1] = depot
+    return tours
+
+
+def random_tours(size, num_locations, rng, depot=0):
+
+    """
+    Função que gera rotas aleatórias com um único argsort de uma matriz aleatória
+
+    :param size: quantidade de rotas
+    :param num_locations: número de locais (incluindo o depósito)
+    :param rng: np.random.Generator
+    :param depot: índice do depósito
+    :return: array (size, num_locations + 1) com as rotas
+    """
+
+    stops = np.delete(np.arange(num_locations, dtype=np.intp), depot)
+    tours = np.full((size, num_locations + 1), depot, dtype=np.intp)
+    tours[:, 1:-1] = stops[np.argsort(rng.random((size, num_locations - 1)), axis=1)]
+    return tours
+
+
+def nearest_neighbor_tours(distance_matrix, starts):
+
+    """
+    Função que constrói rotas pelo vizinho mais próximo, uma a partir de cada local inicial
+
+    Todas as rotas são construídas em paralelo: a cada passo cada uma avança para o
+    local não visitado mais próximo.
+
+    :param distance_matrix: matriz (n, n) de distâncias
+    :param starts: array com o local inicial de cada rota
+    :return: array (len(starts), n) com os ciclos
+    """
+
+    starts = np.asarray(starts, dtype=np.intp)
+    count, n = len(starts), len(distance_matrix)
+    rows = np.arange(count)
+
+    cycles = np.empty((count, n), dtype=np.intp)
+    cycles[:, 0] = starts
+    visited = np.zeros((count, n), dtype=bool)
+    visited[rows, starts] = True
+    current = starts
+
+    for step in range(1, n):
+        distances = np.where(visited, np.inf, distance_matrix[current])
+        current = np.argmin(distances, axis=1)
+        visited[rows, current] = True
+        cycles[:, step] = current
+
+    return cycles
+
+
+def greedy_edge_tour(distance_matrix, candidates=GREEDY_CANDIDATES):
+
+    """
+    Função que constrói uma rota pela heurística greedy edge (arestas mais curtas primeiro)
+
+    As arestas entre cada local e seus vizinhos candidatos são consideradas em ordem
+    crescente e aceitas se não criam grau 3 nem sub-ciclo. Os fragmentos que sobram
+    são ligados pelo extremo livre mais próximo.
+
+    :param distance_matrix: matriz (n, n) de distâncias
+    :param candidates: número de vizinhos candidatos por local
+    :return: array (n,) com o ciclo
+    """
+
+    n = len(distance_matrix)
+    if n <= 3:
+        return np.arange(n, dtype=np.intp)
+
+    symmetric = np.minimum(distance_matrix, distance_matrix.T)
+    k = min(n - 1, candidates)
+    masked = symmetric + np.diag(np.full(n, np.inf))
+    neighbors = np.argpartition(masked, k - 1, axis=1)[:, :k]
+    origin = np.repeat(np.arange(n), k)
+    destination = neighbors.ravel()
+    low, high = np.minimum(origin, destination), np.maximum(origin, destination)
+    edges = np.unique(low * n + high)
+    low, high = np.divmod(edges, n)
+    order = np.argsort(symmetric[low, high], kind='stable')
+
+    degree = np.zeros(n, dtype=np.intp)
+    parent = list(range(n))
+    adjacency = [[] for _ in range(n)]
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def link(a, b):
+        degree[a] += 1
+        degree[b] += 1
+        adjacency[a].append(b)
+        adjacency[b].append(a)
+        parent[find(a)] = find(b)
+
+    added = 0
+    for a, b in zip(low[order].tolist(), high[order].tolist()):
+        if degree[a] < 2 and degree[b] < 2 and find(a) != find(b):
+            link(a, b)
+            added += 1
+
+    # Liga os fragmentos restantes pelo extremo livre mais próximo
+    while added < n - 1:
+        endpoints = np.flatnonzero(degree < 2)
+        a = int(endpoints[0])
+        roots = np.array([find(int(node)) for node in endpoints])
+        others = endpoints[roots != find(a)]
+        b = int(others[np.argmin(symmetric[a, others])])
+        link(a, b)
+        added += 1
+
+    # Percorre o caminho hamiltoniano a partir de um extremo
+    start = int(np.flatnonzero(degree < 2)[0])
+    cycle = [start]
+    previous, current = -1, start
+    while len(cycle) < n:
+        following = adjacency[current][0] if adjacency[current][0] != previous else adjacency[current][1]
+        previous, current = current, following
+        cycle.append(current)
+
+    return np.array(cycle, dtype=np.intp)
+
+
+def hilbert_index(x, y, order=16):
+
+    """
+    Função que calcula a posição de pontos na curva de Hilbert (vetorizada)
+
+    :param x: array de inteiros em [0, 2**order)
+    :param y: array de inteiros em [0, 2**order)
+    :param order: ordem da curva
+    :return: array com a posição de cada ponto na curva
+    """
+
+    x = np.asarray(x, dtype=np.int64).copy()
+    y = np.asarray(y, dtype=np.int64).copy()
+    index = np.zeros_like(x)
+    last = (1 << order) - 1
+    side = 1 << (order - 1)
+
+    while side > 0:
+        rx = (x & side) > 0
+        ry = (y & side) > 0
+        index += side * side * ((3 * rx) ^ ry)
+
+        # Rotaciona o quadrante
+        flip = ~ry & rx
+        x = np.where(flip, last - x, x)
+        y = np.where(flip, last - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        side >>= 1
+
+    return index
+
+
+def space_filling_curve_tour(coordinates, order=16):
+
+    """
+    Função que ordena os locais pela curva de Hilbert
+
+    :param coordinates: array (n, 2) com as coordenadas dos locais
+    :param order: ordem da curva
+    :return: array (n,) com o ciclo
+    """
+
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    low = coordinates.min(axis=0)
+    span = np.maximum(coordinates.max(axis=0) - low, 1e-12)
+    grid = ((coordinates - low) / span * ((1 << order) - 1)).astype(np.int64)
+
+    return np.argsort(hilbert_index(grid[:, 0], grid[:, 1], order), kind='stable').astype(np.intp)
+
+
+def random_insertion_tour(distance_matrix, rng):
+
+    """
+    Função que constrói uma rota por inserção aleatória: os locais entram em ordem
+    aleatória, cada um na posição de menor acréscimo de distância
+
+    :param distance_matrix: matriz (n, n) de distâncias
+    :param rng: np.random.Generator
+    :return: array (n,) com o ciclo
+    """
+
+    n = len(distance_matrix)
+    order = rng.permutation(n)
+    cycle = np.empty(n, dtype=np.intp)
+    cycle[:2] = order[:2]
+
+    for size in range(2, n):
+        node = order[size]
+        current = cycle[:size]
+        following = np.roll(current, -1)
+        increase = distance_matrix[current, node] + distance_matrix[node, following] - distance_matrix[current, following]
+        position = int(np.argmin(increase)) + 1
+        cycle[position + 1:size + 1] = cycle[position:size]
+        cycle[position] = node
+
+    return cycle
+
+
+def initial_population(distance_matrix, size, rng, strategies=None, coordinates=None, depot=0):
+
+    """
+    Função que gera uma população inicial misturando rotas heurísticas e aleatórias
+
+    :param distance_matrix: matriz (n, n) de distâncias
+    :param size: tamanho da população
+    :param rng: np.random.Generator
+    :param strategies: dicionário {estratégia: fração da população}; o restante é aleatório
+    :param coordinates: array (n, 2) com as coordenadas (necessário para space_filling_curve)
+    :param depot: índice do depósito
+    :return: array (size, n + 1) com as rotas
+    """
+
+    n = len(distance_matrix)
+    strategies = strategies or {}
+    unknown = set(strategies) - set(STRATEGIES)
+    if unknown:
+        raise ValueError(f"Estratégias desconhecidas: {sorted(unknown)}. Use {STRATEGIES}")
+    if sum(strategies.values()) > 1:
+        raise ValueError("A soma das frações das estratégias não pode passar de 1")
+
+    seeded = []
+    for strategy, fraction in strategies.items():
+        count = int(round(fraction * size))
+        if count == 0:
+            continue
+
+        if strategy == 'nearest_neighbor':
+            starts = rng.choice(n, size=count, replace=count > n)
+            cycles = nearest_neighbor_tours(distance_matrix, starts)
+        elif strategy == 'greedy_edge':
+            # A primeira é a greedy pura; as demais usam distâncias levemente perturbadas
+            cycles = [greedy_edge_tour(distance_matrix)]
+            for _ in range(count - 1):
+                noise = rng.uniform(0.9, 1.1, size=distance_matrix.shape)
+                cycles.append(greedy_edge_tour(distance_matrix * noise))
+        elif strategy == 'space_filling_curve':
+            if coordinates is None:
+                raise ValueError("space_filling_curve exige coordenadas em todos os locais")
+            # A primeira usa as coordenadas exatas; as demais, coordenadas com um pequeno ruído
+            coordinates = np.asarray(coordinates, dtype=np.float64)
+            scale = 0.01 * np.ptp(coordinates, axis=0)
+            cycles = [space_filling_curve_tour(coordinates)]
+            for _ in range(count - 1):
+                cycles.append(space_filling_curve_tour(coordinates + rng.normal(0, 1, coordinates.shape) * scale))
+        else:
+            cycles = [random_insertion_tour(distance_matrix, rng) for _ in range(count)]
+
+        seeded.append(close_tours(np.asarray(cycles), depot))
+
+    seeded = np.vstack(seeded)[:size] if seeded else np.empty((0, n + 1), dtype=np.intp)
+    remaining = size - len(seeded)
+
+    return np.vstack([seeded, random_tours(remaining, n, rng, depot)])
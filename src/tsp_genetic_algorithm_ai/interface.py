@@ -112,27 +112,22 @@ class Interface:
         self.fig = plt.figure(figsize=(12, 8))
         gs = self.fig.add_gridspec(2, 1, height_ratios=[1, 1], hspace=0.4)
         
-        # Gráfico de fitness por população
+        # Gráfico de distância por população
         self.ax1 = self.fig.add_subplot(gs[0])
-        self.ax1.set_title("Evolução do Fitness por População")
+        self.ax1.set_title("Evolução da Distância por População")
         self.ax1.set_xlabel("Geração")
-        self.ax1.set_ylabel("Fitness")
+        self.ax1.set_ylabel("Distância (km)")
         self.ax1.grid(True)
         
         # Gráfico do melhor global
         self.ax2 = self.fig.add_subplot(gs[1])
-        self.ax2.set_title("Melhor Fitness Global")
+        self.ax2.set_title("Melhor Distância Global")
         self.ax2.set_xlabel("Geração")
-        self.ax2.set_ylabel("Fitness")
+        self.ax2.set_ylabel("Distância (km)")
         self.ax2.grid(True)
         
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame_graph)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Inicializa as listas para armazenar os dados dos gráficos
-        self.generations = []
-        self.population_fitnesses = []
-        self.global_fitnesses = []
 
     def create_status_labels(self):
         # Frame para informações básicas
@@ -173,9 +168,6 @@ class Interface:
         self.stop_flag = False
         
         # Limpa os gráficos
-        self.generations = []
-        self.population_fitnesses = []
-        self.global_fitnesses = []
         self.ax1.clear()
         self.ax1.set_title("Evolução do Fitness por População")
         self.ax1.set_xlabel("Geração")
@@ -230,7 +222,7 @@ class Interface:
             print(f"Link do Google Maps: {self.current_route.get_google_maps_url()}")
             print("=================\n")
 
-    def update_display(self, generation, best_individuals, best_fitnesses, global_best_individual, global_best_fitness):
+    def update_display(self, generation, best_individuals, best_fitnesses, global_best_individual, global_best_fitness, **kwargs):
         """Atualiza a interface com os resultados do algoritmo"""
         self.generation_label.config(text=f"Geração: {generation}")
         self.best_fitness_label.config(text=f"Melhor Fitness Global: {global_best_fitness:.2f}")
@@ -246,8 +238,8 @@ class Interface:
             route_str = str(global_best_individual)
             self.best_route_label.config(text=f"Melhor Rota: {route_str}")
             
-            # Calcula a distância total
-            total_distance = 1000 - global_best_fitness
+            # Distância total da melhor rota (o fitness é relativo à referência da instância)
+            total_distance = kwargs["global_best_distance"]
             
             self.distance_label.config(text=f"Distância Total: {total_distance:.2f} km")
             
@@ -255,31 +247,36 @@ class Interface:
             self.current_route = global_best_individual
             self.current_distance = total_distance
         
-        # Atualiza os dados dos gráficos
-        self.generations.append(generation)
-        self.population_fitnesses.append(best_fitnesses)
-        self.global_fitnesses.append(global_best_fitness)
+        # Histórico mantido pelo algoritmo (pontos agregados em intervalos de gerações)
+        history = kwargs.get("history")
+        if history is None:
+            self.canvas.draw()
+            self.root.update_idletasks()
+            return
+        data = history.arrays()
         
-        # Atualiza o gráfico de fitness por população
+        # Atualiza o gráfico da melhor distância por população (o histórico guarda distâncias, não fitness)
         self.ax1.clear()
-        self.ax1.set_title("Evolução do Fitness por População")
+        self.ax1.set_title("Evolução da Distância por População")
         self.ax1.set_xlabel("Geração")
-        self.ax1.set_ylabel("Fitness")
+        self.ax1.set_ylabel("Distância (km)")
         self.ax1.grid(True)
         
         for i in range(len(best_fitnesses)):
-            population_fitness = [f[i] for f in self.population_fitnesses]
-            self.ax1.plot(self.generations, population_fitness, label=f"População {i+1}")
+            line, = self.ax1.plot(data["last"], data["minimum"][:, i + 1], label=f"População {i+1}")
+            # Faixa entre o mínimo e o máximo de cada intervalo de gerações
+            self.ax1.fill_between(data["last"], data["minimum"][:, i + 1], data["maximum"][:, i + 1],
+                                  color=line.get_color(), alpha=0.2, linewidth=0)
         
         self.ax1.legend()
         
         # Atualiza o gráfico do melhor global
         self.ax2.clear()
-        self.ax2.set_title("Melhor Fitness Global")
+        self.ax2.set_title("Melhor Distância Global")
         self.ax2.set_xlabel("Geração")
-        self.ax2.set_ylabel("Fitness")
+        self.ax2.set_ylabel("Distância (km)")
         self.ax2.grid(True)
-        self.ax2.plot(self.generations, self.global_fitnesses, 'r-', label="Melhor Global")
+        self.ax2.plot(data["last"], data["minimum"][:, 0], 'r-', label="Melhor Global")
         self.ax2.legend()
         
         self.canvas.draw()
@@ -0,0 +1,77 @@
+import time
+import numpy as np
+
+
+def tour_length(cycle, distance_matrix):
+
+    """
+    Função que calcula o comprimento de um ciclo
+
+    :param cycle: array (n,) com a ordem dos locais (o retorno ao primeiro é implícito)
+    :param distance_matrix: matriz (n, n) de distâncias
+    :return: float com o comprimento do ciclo
+    """
+
+    cycle = np.asarray(cycle)
+    return float(distance_matrix[cycle, np.roll(cycle, -1)].sum())
+
+
+def two_opt(cycle, distance_matrix, neighbors, max_passes=50, deadline=None):
+
+    """
+    Função que melhora um ciclo com movimentos 2-opt restritos às listas de vizinhos candidatos
+
+    Para cada aresta (a, b) do ciclo, só são testadas as arestas (c, d) em que c é
+    vizinho candidato de a mais próximo que b. Supõe distâncias simétricas.
+
+    :param cycle: array (n,) com a ordem dos locais
+    :param distance_matrix: matriz (n, n) de distâncias
+    :param neighbors: array (n, k) com os vizinhos candidatos de cada local (ordem crescente)
+    :param max_passes: número máximo de passadas completas sobre o ciclo
+    :param deadline: instante (time.perf_counter) em que a busca é interrompida, devolvendo o ciclo atual
+    :return: array (n,) com o ciclo melhorado
+    """
+
+    tour = [int(node) for node in cycle]
+    n = len(tour)
+    if n < 4:
+        return np.array(tour, dtype=np.intp)
+
+    position = [0] * n
+    for index, node in enumerate(tour):
+        position[node] = index
+
+    neighbor_lists = np.asarray(neighbors).tolist()
+    neighbor_distances = np.take_along_axis(distance_matrix, np.asarray(neighbors), axis=1).tolist()
+
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n):
+            if deadline is not None and time.perf_counter() >= deadline:
+                return np.array(tour, dtype=np.intp)
+            a = tour[i]
+            b = tour[(i + 1) % n]
+            ab = float(distance_matrix[a, b])
+
+            for c, ac in zip(neighbor_lists[a], neighbor_distances[a]):
+                if ac >= ab:
+                    break
+                j = position[c]
+                d = tour[(j + 1) % n]
+                if c == b or d == a:
+                    continue
+
+                delta = ac + float(distance_matrix[b, d]) - ab - float(distance_matrix[c, d])
+                if delta < -1e-10:
+                    # Remove (a, b) e (c, d) e liga (a, c) e (b, d) invertendo o trecho entre eles
+                    start, end = (i + 1, j) if i < j else (j + 1, i)
+                    tour[start:end + 1] = tour[start:end + 1][::-1]
+                    for index in range(start, end + 1):
+                        position[tour[index]] = index
+                    improved = True
+                    break
+
+        if not improved:
+            break
+
+    return np.array(tour, dtype=np.intp)
@@ -0,0 +1,148 @@
+import numpy as np
+from .distance_matrix import candidate_lists
+from .initialization import nearest_neighbor_tours
+from .local_search import two_opt, tour_length
+
+
+def minimum_one_tree(weights, special=0):
+
+    """
+    Função que calcula a 1-árvore mínima: árvore geradora mínima dos demais locais
+    mais as duas arestas mais baratas do local especial
+
+    :param weights: matriz (n, n) simétrica de pesos
+    :param special: índice do local especial
+    :return: tupla (custo da 1-árvore, array com o grau de cada local)
+    """
+
+    n = len(weights)
+    others = np.delete(np.arange(n), special)
+    sub = weights[np.ix_(others, others)]
+    m = len(others)
+
+    degree = np.zeros(n, dtype=np.int64)
+    total = 0.0
+
+    # Prim denso: cada passo é uma operação vetorizada sobre os locais fora da árvore
+    key = sub[0].copy()
+    link = np.zeros(m, dtype=np.intp)
+    in_tree = np.zeros(m, dtype=bool)
+    in_tree[0] = True
+    key[0] = np.inf
+    for _ in range(m - 1):
+        node = int(np.argmin(key))
+        total += key[node]
+        degree[others[node]] += 1
+        degree[others[link[node]]] += 1
+        in_tree[node] = True
+        key[node] = np.inf
+
+        closer = ~in_tree & (sub[node] < key)
+        key[closer] = sub[node][closer]
+        link[closer] = node
+
+    # Duas arestas mais baratas do local especial
+    special_weights = weights[special, others]
+    cheapest = np.argpartition(special_weights, 1)[:2] if m >= 2 else np.arange(m)
+    total += special_weights[cheapest].sum()
+    degree[special] += len(cheapest)
+    degree[others[cheapest]] += 1
+
+    return float(total), degree
+
+
+def upper_bound_tour(distance_matrix, neighbors):
+
+    """
+    Função que constrói uma rota de referência (vizinho mais próximo + 2-opt com listas de candidatos)
+
+    :param distance_matrix: matriz (n, n) simétrica de distâncias
+    :param neighbors: array (n, k) com os vizinhos candidatos de cada local
+    :return: tupla (comprimento, ciclo)
+    """
+
+    cycle = nearest_neighbor_tours(distance_matrix, [0])[0]
+    cycle = two_opt(cycle, distance_matrix, neighbors)
+    return tour_length(cycle, distance_matrix), cycle
+
+
+def held_karp_bound(distance_matrix, iterations=300, upper_bound=None, candidates=10, patience=10):
+
+    """
+    Função que calcula o limite inferior de Held-Karp (1-árvore com otimização por subgradiente)
+
+    Matrizes assimétricas são simetrizadas com min(d_ij, d_ji), o que mantém o limite válido.
+
+    :param distance_matrix: matriz (n, n) de distâncias
+    :param iterations: número máximo de iterações do subgradiente
+    :param upper_bound: comprimento de uma rota conhecida (padrão: vizinho mais próximo + 2-opt)
+    :param candidates: tamanho das listas de vizinhos candidatos usadas na rota de referência
+    :param patience: iterações sem melhora antes de reduzir o passo pela metade
+    :return: float com o limite inferior do comprimento da rota ótima
+    """
+
+    distances = np.asarray(distance_matrix, dtype=np.float64)
+    distances = np.minimum(distances, distances.T)
+    n = len(distances)
+    if n <= 3:
+        cycle = np.arange(n)
+        return tour_length(cycle, distances)
+
+    if upper_bound is None:
+        upper_bound, _ = upper_bound_tour(distances, candidate_lists(distances, candidates))
+
+    penalties = np.zeros(n)
+    best = -np.inf
+    step_scale = 2.0
+    stalled = 0
+
+    for _ in range(iterations):
+        weights = distances + penalties[:, None] + penalties[None, :]
+        cost, degree = minimum_one_tree(weights)
+        bound = cost - 2 * penalties.sum()
+
+        if bound > best + 1e-9:
+            best = bound
+            stalled = 0
+        else:
+            stalled += 1
+            if stalled >= patience:
+                step_scale /= 2
+                stalled = 0
+
+        subgradient = degree - 2
+        norm = float(subgradient @ subgradient)
+        if norm == 0:
+            # A 1-árvore é uma rota: o limite é exato
+            break
+        if step_scale < 1e-6 or best >= upper_bound - 1e-9:
+            break
+
+        step = step_scale * (upper_bound - bound) / norm
+        penalties += step * subgradient
+
+    return float(best)
+
+
+def start_lower_bound(distance_matrix, background=True, **kwargs):
+
+    """
+    Função que inicia o cálculo do limite inferior
+
+    :param distance_matrix: matriz (n, n) de distâncias
+    :param background: se True, calcula em um processo separado
+    :param kwargs: argumentos de held_karp_bound
+    :return: tupla (future com o resultado, executor a ser encerrado) ou (valor, None) se síncrono
+    """
+
+    if not background:
+        return held_karp_bound(distance_matrix, **kwargs), None
+
+    # Importado aqui: o multiprocessing só é carregado quando o cálculo em segundo plano é usado
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # spawn: o processo filho não herda threads nem locks do processo que está rodando o algoritmo genético
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    future = executor.submit(held_karp_bound, np.asarray(distance_matrix), **kwargs)
+    return future, executor
@@ -1,9 +1,8 @@
 from .GeneticAlgorithm import GeneticAlgorithm
-from .interface import Interface
 from .mock_data import get_mock_data
 from .distances_map import get_distances_map
 
-def print_generation_info(generation, best_individuals, best_fitnesses, global_best_individual, global_best_fitness):
+def print_generation_info(generation, best_individuals, best_fitnesses, global_best_individual, global_best_fitness, **kwargs):
     """Callback para imprimir informações sobre a geração atual"""
     print(f"\nGeração {generation}")
     print("Melhores fitness por população:")
@@ -53,10 +52,13 @@ def main():
     # Imprime o resultado final
     # print("\nResultado Final:")
     # print(f"Melhor fitness encontrado: {best_fitness:.2f}")
-    # print(f"Menor distância encontrada: {1000 - best_fitness:.2f}")
+    # print(f"Menor distância encontrada: {ga.fitness_distance(best_fitness):.2f}")
     # print(f"Melhor rota encontrada: {best_individual}")
     # print(f"Rota no google maps: {best_individual.get_google_maps_url()}")
 
+    # A interface (tkinter e matplotlib) só é importada quando é aberta
+    from .interface import Interface
+
     interface = Interface()
     interface.run()
 
@@ -0,0 +1,209 @@
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from .Location import Location
+from .distances_map import get_distances_table_digest
+
+# Diretório padrão do cache (pode ser sobrescrito pela variável de ambiente)
+DEFAULT_CACHE_DIR = os.environ.get(
+    "TSP_GA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "tsp_genetic_algorithm_ai")
+)
+
+# Tamanho máximo padrão do cache em bytes (512 MiB)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Idade (s) a partir da qual um arquivo temporário é considerado abandonado por uma gravação interrompida
+STALE_TEMP_SECONDS = 3600
+
+
+def location_fingerprint(locations: list[Location], metric, detour_factor=1.0) -> str:
+
+    """
+    Função que calcula a impressão digital de um conjunto ordenado de locais
+
+    :param locations: lista de locais (a ordem faz parte da chave)
+    :param metric: métrica usada para construir a matriz
+    :param detour_factor: fator de desvio rodoviário aplicado à matriz
+    :return: string hexadecimal com o hash (sha256) da chave
+    """
+
+    digest = hashlib.sha256()
+    digest.update(f"{metric}|{float(detour_factor)!r}|{len(locations)}".encode())
+    if metric == 'explicit':
+        # Alterar os valores da tabela muda a chave
+        digest.update(get_distances_table_digest().encode())
+
+    for location in locations:
+        digest.update(f"|{location.id}".encode())
+        if location.has_coordinates():
+            digest.update(np.array([location.latitude, location.longitude], dtype=np.float64).tobytes())
+        if metric == 'explicit':
+            # A tabela explícita é indexada pelo nome
+            digest.update(location.name.encode())
+
+    return digest.hexdigest()
+
+
+class DistanceMatrixCache:
+
+    """
+    Classe que representa um cache em disco de matrizes de distâncias
+
+    As matrizes são gravadas no formato .npy e abertas com memory-map. A evicção
+    remove as entradas usadas há mais tempo até o cache caber em max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+
+        """
+        Construtor da classe DistanceMatrixCache
+
+        :param cache_dir: diretório do cache (padrão: DEFAULT_CACHE_DIR)
+        :param max_bytes: tamanho máximo do cache em bytes
+        """
+
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key) -> Path:
+
+        """
+        Método que retorna o caminho do arquivo de uma chave
+
+        :param key: chave da matriz
+        :return: caminho do arquivo .npy
+        """
+
+        return self.cache_dir / f"{key}.npy"
+
+    def get(self, key):
+
+        """
+        Método que abre uma matriz do cache
+
+        :param key: chave da matriz
+        :return: array somente leitura (memory-map) ou None se não estiver no cache
+        """
+
+        path = self.path(key)
+        try:
+            matrix = np.load(path, mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            return None
+
+        # Marca a entrada como usada recentemente (LRU por mtime)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return matrix
+
+    def put(self, key, matrix):
+
+        """
+        Método que grava uma matriz no cache
+
+        :param key: chave da matriz
+        :param matrix: array (n, n) com as distâncias
+        :return: array somente leitura (memory-map) da matriz gravada
+        """
+
+        matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        if matrix.nbytes > self.max_bytes:
+            return matrix
+
+        # Grava em arquivo temporário e renomeia, para nunca expor um arquivo parcial
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.save(file, matrix)
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self.evict(keep=key)
+        return np.load(self.path(key), mmap_mode='r')
+
+    def evict(self, keep=None):
+
+        """
+        Método que remove as entradas menos usadas até o cache caber em max_bytes
+
+        :param keep: chave que nunca deve ser removida (a recém-gravada)
+        """
+
+        self.remove_stale_temp_files()
+
+        entries = []
+        for path in self.cache_dir.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path.stem == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def remove_stale_temp_files(self, max_age=STALE_TEMP_SECONDS):
+
+        """
+        Método que remove os arquivos temporários deixados por gravações interrompidas
+
+        :param max_age: idade mínima (s) do arquivo; os mais novos podem ser gravações em andamento de outro processo
+        """
+
+        limit = time.time() - max_age
+        for path in self.cache_dir.glob("*.tmp"):
+            try:
+                if path.stat().st_mtime <= limit:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+
+        """
+        Método que remove todas as entradas do cache (e os temporários abandonados)
+        """
+
+        for path in self.cache_dir.glob("*.npy"):
+            path.unlink(missing_ok=True)
+        self.remove_stale_temp_files()
+
+    def get_or_build(self, locations, metric='haversine', detour_factor=1.0, builder=None):
+
+        """
+        Método que retorna a matriz do cache ou a constrói e grava
+
+        :param locations: lista de locais
+        :param metric: métrica da matriz
+        :param detour_factor: fator de desvio rodoviário
+        :param builder: função (locations, metric, detour_factor) -> matriz
+        :return: array (n, n) com as distâncias
+        """
+
+        key = location_fingerprint(locations, metric, detour_factor)
+        matrix = self.get(key)
+        if matrix is not None:
+            return matrix
+
+        matrix = builder(locations, metric, detour_factor)
+        return self.put(key, matrix)
@@ -0,0 +1,202 @@
+import contextlib
+import gc
+import json
+import sys
+import tracemalloc
+
+# Fases do algoritmo genético medidas nas gerações perfiladas
+PHASES = ('initialize_populations', 'selection', 'crossover', 'evaluation', 'mutation', 'elitism', 'migration',
+          'callback')
+
+# Contexto usado fora das gerações perfiladas (não mede nada)
+NULL_PHASE = contextlib.nullcontext()
+
+# Número padrão de linhas de código listadas na diferença entre snapshots
+DEFAULT_TOP = 10
+
+
+def peak_rss():
+
+    """
+    Função que retorna o pico de memória residente (RSS) do processo
+
+    :return: pico em bytes ou None se a plataforma não oferece o módulo resource
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é informado em bytes no macOS e em KiB no Linux
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryProfiler:
+
+    """
+    Classe que mede a memória alocada pelo algoritmo genético a cada interval gerações
+
+    Nas gerações perfiladas, cada fase registra a variação e o pico da memória rastreada pelo
+    tracemalloc e a variação de blocos alocados pelo Python (sys.getallocatedblocks). Ao final
+    da geração, um snapshot do tracemalloc é comparado com o da geração perfilada anterior e as
+    linhas de código que mais cresceram são registradas (memória retida entre as gerações).
+    Cada registro é gravado imediatamente como uma linha JSON no arquivo path.
+
+    O tracemalloc fica ativo durante toda a execução, o que também deixa as gerações não
+    perfiladas mais lentas: use apenas para diagnóstico.
+    """
+
+    def __init__(self, interval=10, path=None, top=DEFAULT_TOP):
+
+        """
+        Construtor da classe MemoryProfiler
+
+        :param interval: intervalo de gerações entre medições (a inicialização, geração 0, é sempre medida)
+        :param path: arquivo JSON Lines que recebe um registro por geração perfilada (opcional)
+        :param top: número de linhas de código listadas na diferença entre snapshots
+        """
+
+        if interval < 1:
+            raise ValueError("interval deve ser maior ou igual a 1")
+        self.interval = interval
+        self.path = path
+        self.top = top
+        self.records = []
+        self.current = None
+        self.snapshot = None
+        self.file = None
+        self.started_tracing = False
+
+    def start(self):
+
+        """
+        Método que inicia o rastreamento (chamado no início de cada execução)
+        """
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        self.records = []
+        self.current = None
+        self.snapshot = None
+        if self.path is not None:
+            self.file = open(self.path, 'w', encoding='utf-8')
+
+    def stop(self):
+
+        """
+        Método que encerra o rastreamento e fecha o arquivo
+        """
+
+        self.current = None
+        self.snapshot = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def profiling(self):
+
+        """
+        Método que indica se a geração atual está sendo perfilada
+
+        :return: True entre begin_generation e write de uma geração perfilada
+        """
+
+        return self.current is not None
+
+    def begin_generation(self, generation):
+
+        """
+        Método que inicia a medição de uma geração, se ela cair no intervalo
+
+        :param generation: número da geração (0 para a inicialização)
+        :return: True se a geração será perfilada
+        """
+
+        if generation % self.interval or not tracemalloc.is_tracing():
+            self.current = None
+            return False
+        self.current = {"generation": generation, "phases": {}}
+        return True
+
+    def phase(self, name):
+
+        """
+        Método que retorna o contexto de medição de uma fase
+
+        :param name: nome da fase (ver PHASES)
+        :return: gerenciador de contexto (NULL_PHASE fora das gerações perfiladas)
+        """
+
+        if self.current is None:
+            return NULL_PHASE
+        return self.measure(name)
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            phase = self.current["phases"].setdefault(name, {"bytes": 0, "peak_bytes": 0, "blocks": 0, "calls": 0})
+            phase["bytes"] += current - start
+            phase["peak_bytes"] = max(phase["peak_bytes"], peak - start)
+            phase["blocks"] += sys.getallocatedblocks() - blocks
+            phase["calls"] += 1
+
+    def end_generation(self, island_bytes):
+
+        """
+        Método que fecha as medidas da geração perfilada (a fase callback ainda pode ser medida até write)
+
+        :param island_bytes: lista com os bytes ocupados pelos arrays de cada população
+        :return: registro da geração (dicionário) ou None se a geração não foi perfilada
+        """
+
+        record = self.current
+        if record is None:
+            return None
+        _, peak = tracemalloc.get_traced_memory()
+        record["traced_peak_bytes"] = max([peak] + [phase["peak_bytes"] for phase in record["phases"].values()])
+        record["peak_rss_bytes"] = peak_rss()
+        record["island_bytes"] = [int(nbytes) for nbytes in island_bytes]
+
+        # Memória em uso sem a do próprio profiler (registros e snapshots), e as linhas de código cuja
+        # memória retida mais cresceu desde a geração perfilada anterior; o lixo com ciclos é coletado
+        # antes para não ser confundido com memória retida
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        record["traced_bytes"] = sum(trace.size for trace in snapshot.traces)
+        if self.snapshot is not None:
+            differences = snapshot.compare_to(self.snapshot, 'lineno')[:self.top]
+            record["retained"] = [
+                {"location": f"{difference.traceback[0].filename}:{difference.traceback[0].lineno}",
+                 "bytes": difference.size_diff, "blocks": difference.count_diff}
+                for difference in differences if difference.size_diff
+            ]
+        self.snapshot = snapshot
+        return record
+
+    def write(self):
+
+        """
+        Método que encerra a geração perfilada: guarda o registro e o grava no arquivo (uma linha JSON)
+        """
+
+        record, self.current = self.current, None
+        if record is None:
+            return
+        self.records.append(record)
+        if self.file is not None:
+            self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
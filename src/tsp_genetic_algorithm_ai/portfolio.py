@@ -0,0 +1,428 @@
+import argparse
+import multiprocessing
+import queue
+import time
+import numpy as np
+from .GeneticAlgorithm import GeneticAlgorithm
+from .Route import Route
+from .distance_matrix import build_distance_matrix, candidate_lists, random_instance
+from .initialization import close_tours, nearest_neighbor_tours
+from .local_search import two_opt, tour_length
+
+# Motores do portfólio: parâmetros do GeneticAlgorithm de cada um (None é a busca local sem algoritmo genético)
+DEFAULT_ENGINES = {
+    "tournament": {
+        "population_size": 100, "mutation_rate": 0.2, "crossover_rate": 0.8, "elitism_count": 2,
+        "selection_method": "tournament", "tournament_size": 3,
+        "mutation_operators": {"swap": 1, "inversion": 2, "insertion": 1},
+    },
+    "roulette": {
+        "population_size": 100, "mutation_rate": 0.3, "crossover_rate": 0.9, "elitism_count": 2,
+        "selection_method": "roulette", "mutation_operators": "inversion",
+    },
+    "islands": {
+        "population_size": 50, "mutation_rate": 0.2, "crossover_rate": 0.8, "elitism_count": 1,
+        "selection_method": "tournament", "tournament_size": 3, "num_populations": 4,
+        "migration_interval": 10, "island_execution": "stacked", "duplicate_control": "replace",
+    },
+    "restarts": {
+        "population_size": 60, "mutation_rate": 0.2, "crossover_rate": 0.8, "elitism_count": 2,
+        "selection_method": "tournament", "tournament_size": 3, "mutation_operators": {"inversion": 1},
+        "restart": "reseed", "restart_stagnation": 50,
+    },
+    "local_search": None,
+}
+
+# Intervalo (s) entre as trocas da melhor rota global (incumbente) de cada motor
+SHARE_INTERVAL = 0.25
+
+# Tempo (s) além do prazo que o processo principal espera pelo resultado de cada motor antes de encerrá-lo
+GRACE_SECONDS = 5.0
+
+
+class Incumbent:
+
+    """
+    Classe que guarda, em memória compartilhada entre os processos, a melhor rota encontrada pelo portfólio
+
+    A rota (fechada, depósito nas pontas), sua distância, o motor que a encontrou e um contador de
+    versões ficam em arrays sem lock (multiprocessing.RawArray); as leituras e escritas são protegidas
+    por um único Lock. O contador de versões permite que um motor saiba, sem copiar a rota, se a
+    incumbente mudou desde a última leitura.
+    """
+
+    def __init__(self, num_positions, context):
+
+        """
+        Construtor da classe Incumbent
+
+        :param num_positions: número de posições da rota fechada (locais + 1)
+        :param context: contexto do multiprocessing em que os processos são criados
+        """
+
+        self.lock = context.Lock()
+        self.distance = context.RawValue('d', float('inf'))
+        self.engine = context.RawValue('i', -1)
+        self.version = context.RawValue('q', 0)
+        self.tour = context.RawArray('q', num_positions)
+
+    def offer(self, distance, tour, engine):
+
+        """
+        Método que substitui a incumbente se a rota oferecida for melhor
+
+        :param distance: distância da rota
+        :param tour: rota fechada (índices, depósito nas pontas)
+        :param engine: índice do motor que encontrou a rota
+        :return: nova versão da incumbente ou None se a rota não foi aceita
+        """
+
+        with self.lock:
+            if distance >= self.distance.value:
+                return None
+            np.frombuffer(self.tour, dtype=np.int64)[:] = tour
+            self.distance.value = distance
+            self.engine.value = engine
+            self.version.value += 1
+            return self.version.value
+
+    def read(self):
+
+        """
+        Método que retorna uma cópia da incumbente
+
+        :return: tupla (distância, rota fechada, índice do motor, versão); rota None se nenhuma foi oferecida
+        """
+
+        with self.lock:
+            if self.engine.value < 0:
+                return float('inf'), None, -1, 0
+            tour = np.frombuffer(self.tour, dtype=np.int64).astype(np.intp)
+            return self.distance.value, tour, self.engine.value, self.version.value
+
+
+class Exchange:
+
+    """
+    Classe que faz as trocas periódicas de um motor com a incumbente
+
+    A cada share_interval segundos (ou imediatamente, se o alvo foi alcançado) o motor publica
+    sua melhor rota, se ela for melhor que a incumbente, ou recebe a incumbente, se outro motor
+    publicou uma rota melhor desde a última troca.
+    """
+
+    def __init__(self, index, incumbent, stop, target, share_interval):
+
+        """
+        Construtor da classe Exchange
+
+        :param index: índice do motor
+        :param incumbent: Incumbent compartilhado
+        :param stop: multiprocessing.Event que encerra todos os motores
+        :param target: distância alvo (opcional)
+        :param share_interval: intervalo (s) entre as trocas
+        """
+
+        self.index = index
+        self.incumbent = incumbent
+        self.stop = stop
+        self.target = target
+        self.share_interval = share_interval
+        self.next_share = time.perf_counter() + share_interval
+        self.version = 0
+        self.published = 0
+        self.adopted = 0
+
+    def exchange(self, distance, tour, force=False):
+
+        """
+        Método que troca a melhor rota do motor com a incumbente, se o intervalo terminou
+
+        :param distance: distância da melhor rota do motor
+        :param tour: melhor rota fechada do motor (None se ainda não há)
+        :param force: se True, troca mesmo antes do intervalo (usado ao final da execução)
+        :return: rota fechada da incumbente a adotar ou None
+        """
+
+        reached = self.target is not None and distance <= self.target
+        now = time.perf_counter()
+        if not (force or reached or now >= self.next_share):
+            return None
+        self.next_share = now + self.share_interval
+
+        version = None if tour is None else self.incumbent.offer(distance, tour, self.index)
+        if version is not None:
+            self.published += 1
+            self.version = version
+            if reached:
+                self.stop.set()
+            return None
+        if force or self.incumbent.version.value == self.version:
+            return None
+        best_distance, best_tour, _, self.version = self.incumbent.read()
+        if self.target is not None and best_distance <= self.target:
+            self.stop.set()
+        if best_tour is None or best_distance >= distance:
+            return None
+        self.adopted += 1
+        return best_tour
+
+
+def shared_matrix(buffer, num_locations):
+
+    """
+    Função que retorna a matriz de distâncias guardada em memória compartilhada, sem cópia
+
+    :param buffer: multiprocessing.RawArray de float64 com n * n posições
+    :param num_locations: número de locais (n)
+    :return: array (n, n) apoiado no buffer
+    """
+
+    return np.frombuffer(buffer, dtype=np.float64).reshape(num_locations, num_locations)
+
+
+def double_bridge(cycle, rng):
+
+    """
+    Função que perturba um ciclo com um double-bridge (troca de dois segmentos, que o 2-opt não desfaz)
+
+    :param cycle: array (n,) com a ordem dos locais
+    :param rng: np.random.Generator
+    :return: novo array (n,) com o ciclo perturbado
+    """
+
+    if len(cycle) < 8:
+        return rng.permutation(cycle)
+    a, b, c = np.sort(rng.choice(np.arange(1, len(cycle)), 3, replace=False))
+    return np.concatenate((cycle[:a], cycle[b:c], cycle[a:b], cycle[c:]))
+
+
+def run_engine(engine, parameters, locations, matrix_buffer, incumbent, stop, results, deadline_at, target,
+               share_interval, seed):
+
+    """
+    Função executada em cada processo do portfólio: roda um motor até o prazo, o alvo ou o sinal de parada
+
+    :param engine: tupla (índice, nome) do motor
+    :param parameters: parâmetros do GeneticAlgorithm (None para a busca local)
+    :param locations: lista de locais (o primeiro é o depósito)
+    :param matrix_buffer: matriz de distâncias em memória compartilhada (ver shared_matrix)
+    :param incumbent: Incumbent compartilhado entre os motores
+    :param stop: multiprocessing.Event que encerra todos os motores
+    :param results: multiprocessing.Queue que recebe o resultado do motor
+    :param deadline_at: prazo em segundos desde a época (time.time), comum a todos os processos
+    :param target: distância alvo (opcional) que encerra o portfólio ao ser alcançada
+    :param share_interval: intervalo (s) entre as trocas com a incumbente
+    :param seed: semente do motor
+    """
+
+    index, name = engine
+    start = time.perf_counter()
+    # O relógio de parede é comum aos processos; o prazo local é convertido para time.perf_counter
+    end = start + deadline_at - time.time()
+    result = {"engine": name}
+    try:
+        distance_matrix = shared_matrix(matrix_buffer, len(locations))
+        runner = run_local_search if parameters is None else run_genetic_algorithm
+        result.update(runner(index, parameters, locations, distance_matrix, incumbent, stop, end, target,
+                             share_interval, seed))
+    except Exception as error:
+        result["error"] = repr(error)
+    result["elapsed"] = time.perf_counter() - start
+    results.put(result)
+
+
+def run_genetic_algorithm(index, parameters, locations, distance_matrix, incumbent, stop, end, target,
+                          share_interval, seed):
+
+    """
+    Função que roda um motor GeneticAlgorithm, trocando sua melhor rota com a incumbente ao final das gerações
+
+    A rota incumbente recebida substitui o pior indivíduo de cada população (GeneticAlgorithm.inject_tours).
+
+    :return: dicionário com distance, tour (índices), iterations (gerações), published e adopted
+    """
+
+    ga = GeneticAlgorithm(**parameters, locations=locations, distance_matrix=distance_matrix, seed=seed,
+                          history_points=None, verbose=False)
+    ga.stop = stop.is_set
+    ga.deadline = max(0.0, end - time.perf_counter())
+    exchange = Exchange(index, incumbent, stop, target, share_interval)
+
+    def share(global_best_distance, **kwargs):
+        tour = exchange.exchange(global_best_distance, ga.global_best_tour)
+        if tour is not None:
+            ga.inject_tours(tour)
+
+    ga.run(np.iinfo(np.int64).max, share)
+    distance = ga.fitness_distance(ga.global_best_fitness)
+    exchange.exchange(distance, ga.global_best_tour, force=True)
+    return {"distance": distance, "tour": np.asarray(ga.global_best_tour), "iterations": ga.generations_run,
+            "published": exchange.published, "adopted": exchange.adopted}
+
+
+def run_local_search(index, parameters, locations, distance_matrix, incumbent, stop, end, target,
+                     share_interval, seed):
+
+    """
+    Função que roda a busca local de referência: vizinho mais próximo + 2-opt seguido de 2-opt iterado
+    (double-bridge), aceitando apenas melhoras e adotando a incumbente quando ela é melhor
+
+    :return: dicionário com distance, tour (índices), iterations (perturbações), published e adopted
+    """
+
+    rng = np.random.default_rng(seed)
+    neighbors = candidate_lists(distance_matrix)
+    exchange = Exchange(index, incumbent, stop, target, share_interval)
+    cycle = two_opt(nearest_neighbor_tours(distance_matrix, [0])[0], distance_matrix, neighbors, deadline=end)
+    distance = tour_length(cycle, distance_matrix)
+    iterations = 0
+
+    while not stop.is_set() and time.perf_counter() < end:
+        adopted = exchange.exchange(distance, close_tours(cycle[None])[0])
+        if adopted is not None:
+            cycle = adopted[:-1]
+            distance = tour_length(cycle, distance_matrix)
+        candidate = two_opt(double_bridge(cycle, rng), distance_matrix, neighbors, deadline=end)
+        candidate_distance = tour_length(candidate, distance_matrix)
+        if candidate_distance < distance:
+            cycle, distance = candidate, candidate_distance
+        iterations += 1
+
+    tour = close_tours(cycle[None])[0]
+    exchange.exchange(distance, tour, force=True)
+    return {"distance": distance, "tour": tour, "iterations": iterations,
+            "published": exchange.published, "adopted": exchange.adopted}
+
+
+def solve_portfolio(locations, budget, distance_matrix=None, metric=None, engines=None, target=None,
+                    share_interval=SHARE_INTERVAL, seed=None):
+
+    """
+    Função que resolve a instância com um portfólio de motores em processos paralelos
+
+    Cada motor (um GeneticAlgorithm configurado de forma diferente ou a busca local de referência)
+    roda em seu próprio processo sobre a mesma matriz de distâncias, guardada uma única vez em
+    memória compartilhada. A cada share_interval segundos cada motor publica sua melhor rota na
+    incumbente compartilhada ou adota a incumbente, se outro motor encontrou uma rota melhor.
+    A execução termina no prazo ou assim que algum motor alcança a distância alvo.
+
+    :param locations: lista de locais (o primeiro é o depósito)
+    :param budget: prazo em segundos (inclui a criação dos processos)
+    :param distance_matrix: matriz (n, n) de distâncias (padrão: construída a partir dos locais)
+    :param metric: métrica da matriz construída (padrão: haversine se todos os locais têm coordenadas, senão explicit)
+    :param engines: dicionário {nome: parâmetros do GeneticAlgorithm ou None (busca local)} (padrão: DEFAULT_ENGINES)
+    :param target: distância alvo que encerra o portfólio (opcional)
+    :param share_interval: intervalo (s) entre as trocas de cada motor com a incumbente
+    :param seed: semente (cada motor recebe uma semente derivada dela)
+    :return: dicionário com route, tour (ids), distance, winner, target_reached, engines (resultado de cada motor)
+        e elapsed
+    """
+
+    start = time.perf_counter()
+    deadline_at = time.time() + budget
+    engines = DEFAULT_ENGINES if engines is None else engines
+    if not engines:
+        raise ValueError("O portfólio precisa de pelo menos um motor")
+
+    if distance_matrix is None:
+        if metric is None:
+            metric = 'haversine' if all(location.has_coordinates() for location in locations) else 'explicit'
+        distance_matrix = build_distance_matrix(locations, metric)
+    distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+    n = len(locations)
+
+    # spawn: os processos não herdam threads nem o estado do processo principal
+    context = multiprocessing.get_context('spawn')
+    matrix_buffer = context.RawArray('d', n * n)
+    shared_matrix(matrix_buffer, n)[:] = distance_matrix
+    incumbent = Incumbent(n + 1, context)
+    stop = context.Event()
+    results = context.Queue()
+
+    names = list(engines)
+    seeds = np.random.SeedSequence(seed).generate_state(len(names)).tolist()
+    processes = [
+        context.Process(target=run_engine, daemon=True,
+                        args=((index, name), engines[name], locations, matrix_buffer, incumbent, stop, results,
+                              deadline_at, target, share_interval, seeds[index]))
+        for index, name in enumerate(names)
+    ]
+    for process in processes:
+        process.start()
+
+    # Cada motor para sozinho no prazo ou quando o alvo é alcançado (por ele ou por outro motor)
+    reported = {}
+    try:
+        while len(reported) < len(processes):
+            timeout = max(0.0, deadline_at - time.time()) + GRACE_SECONDS
+            try:
+                result = results.get(timeout=timeout)
+            except queue.Empty:
+                break
+            reported[result["engine"]] = result
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=GRACE_SECONDS)
+            if process.is_alive():
+                process.terminate()
+
+    distance, tour, winner, _ = incumbent.read()
+    if tour is None:
+        raise RuntimeError("Nenhum motor do portfólio terminou: " +
+                           "; ".join(result.get("error", "") for result in reported.values()))
+    summaries = [
+        {key: value for key, value in reported.get(name, {"engine": name, "error": "sem resultado"}).items()
+         if key != "tour"}
+        for name in names
+    ]
+    return {
+        "route": Route([locations[i] for i in tour], distance=distance),
+        "tour": [locations[i].id for i in tour],
+        "distance": distance,
+        "winner": names[winner],
+        "target_reached": target is not None and distance <= target,
+        "engines": summaries,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Portfólio de motores em processos paralelos")
+    parser.add_argument("--size", type=int, default=200, help="Número de locais da instância euclidiana aleatória")
+    parser.add_argument("--budget", type=float, default=10.0, help="Prazo em segundos")
+    parser.add_argument("--target", type=float, default=None, help="Distância alvo que encerra o portfólio")
+    parser.add_argument("--engines", nargs="+", default=list(DEFAULT_ENGINES), choices=list(DEFAULT_ENGINES))
+    parser.add_argument("--share-interval", type=float, default=SHARE_INTERVAL)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", action="store_true",
+                        help="Também roda cada motor sozinho (sem trocas) com o mesmo prazo")
+    args = parser.parse_args()
+
+    locations, distance_matrix = random_instance(args.size, args.seed)
+    engines = {name: DEFAULT_ENGINES[name] for name in args.engines}
+    result = solve_portfolio(locations, args.budget, distance_matrix, engines=engines, target=args.target,
+                             share_interval=args.share_interval, seed=args.seed)
+
+    print(f"{'Motor':<14}{'Distância':>11}{'Iterações':>11}{'Publicadas':>12}{'Adotadas':>10}{'Tempo (s)':>11}")
+    for engine in result["engines"]:
+        if "error" in engine:
+            print(f"{engine['engine']:<14}  erro: {engine['error']}")
+            continue
+        print(f"{engine['engine']:<14}{engine['distance']:>11.4f}{engine['iterations']:>11}"
+              f"{engine['published']:>12}{engine['adopted']:>10}{engine['elapsed']:>11.2f}")
+    print(f"Portfólio: {result['distance']:.4f} ({result['winner']}) em {result['elapsed']:.2f} s"
+          + (", alvo alcançado" if result["target_reached"] else ""))
+
+    if args.compare:
+        print("\nCada motor sozinho:")
+        for name, parameters in engines.items():
+            alone = solve_portfolio(locations, args.budget, distance_matrix, engines={name: parameters},
+                                    target=args.target, seed=args.seed)
+            print(f"{name:<14}{alone['distance']:>11.4f}{alone['elapsed']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import numpy as np
+from .backends import mutation_plan, MUTATION_OPERATORS, INVERSION
+
+# Estratégias de reinício parcial de uma população estagnada
+RESTART_STRATEGIES = ('reinitialize', 'mutation_burst', 'reseed')
+
+# Inversões aplicadas a cada rota em uma explosão de mutação, por posição interna (mínimo de MIN_BURST_INVERSIONS)
+BURST_INVERSIONS_PER_POSITION = 0.1
+MIN_BURST_INVERSIONS = 2
+
+
+def mutation_burst(tours, rng, backend):
+
+    """
+    Função que perturba fortemente as rotas com várias inversões aleatórias de segmentos (no próprio array)
+
+    :param tours: array (rotas, posições) com as rotas fechadas (depósito nas pontas)
+    :param rng: np.random.Generator
+    :param backend: backend que aplica as inversões (ver backends.py)
+    :return: o próprio array
+    """
+
+    interior = tours.shape[1] - 2
+    if len(tours) == 0 or interior < 2:
+        return tours
+    probabilities = np.zeros(len(MUTATION_OPERATORS))
+    probabilities[INVERSION] = 1.0
+    rounds = max(MIN_BURST_INVERSIONS, int(BURST_INVERSIONS_PER_POSITION * interior))
+    for _ in range(rounds):
+        backend.mutate(tours, *mutation_plan(len(tours), tours.shape[1], 1.0, rng, probabilities))
+    return tours
+
+
+class StagnationMonitor:
+
+    """
+    Classe que detecta as populações (ilhas) que devem ser reiniciadas
+
+    Uma população é reiniciada quando seu melhor fitness não melhora há stagnation gerações
+    ou quando sua diversidade (distância média de arestas) fica abaixo de min_diversity. Após
+    um reinício a contagem de estagnação da população recomeça.
+    """
+
+    def __init__(self, num_populations, stagnation=None, min_diversity=None):
+
+        """
+        Construtor da classe StagnationMonitor
+
+        :param num_populations: número de populações
+        :param stagnation: número de gerações sem melhora que dispara o reinício
+        :param min_diversity: diversidade (entre 0 e 1) abaixo da qual a população é reiniciada
+        """
+
+        self.stagnation = stagnation
+        self.min_diversity = min_diversity
+        self.best_fitnesses = [float('-inf')] * num_populations
+        self.last_improvements = [0] * num_populations
+        self.counts = [0] * num_populations
+        self.log = []
+
+    def triggers(self, generation, best_fitnesses, diversities=None):
+
+        """
+        Método que atualiza o histórico de cada população e retorna as que devem ser reiniciadas
+
+        :param generation: número da geração
+        :param best_fitnesses: melhor fitness de cada população na geração
+        :param diversities: distância média de arestas de cada população (opcional)
+        :return: lista de tuplas (população, motivo), motivo stagnation ou diversity
+        """
+
+        triggered = []
+        for idx, fitness in enumerate(best_fitnesses):
+            if fitness > self.best_fitnesses[idx]:
+                self.best_fitnesses[idx] = fitness
+                self.last_improvements[idx] = generation
+            if self.stagnation is not None and generation - self.last_improvements[idx] >= self.stagnation:
+                triggered.append((idx, 'stagnation'))
+            elif (self.min_diversity is not None and diversities is not None
+                  and diversities[idx] < self.min_diversity):
+                triggered.append((idx, 'diversity'))
+        return triggered
+
+    def record(self, generation, population_idx, strategy, reason, best_fitness):
+
+        """
+        Método que registra um reinício
+
+        :param generation: número da geração
+        :param population_idx: índice da população reiniciada
+        :param strategy: estratégia aplicada (ver RESTART_STRATEGIES)
+        :param reason: motivo (stagnation ou diversity)
+        :param best_fitness: melhor fitness da população no momento do reinício
+        """
+
+        self.counts[population_idx] += 1
+        self.last_improvements[population_idx] = generation
+        self.log.append({
+            "generation": generation,
+            "population": population_idx,
+            "strategy": strategy,
+            "reason": reason,
+            "best_fitness": float(best_fitness),
+        })
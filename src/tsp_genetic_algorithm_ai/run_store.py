@@ -0,0 +1,305 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+import numpy as np
+
+# Banco padrão do histórico de execuções (pode ser sobrescrito pela variável de ambiente)
+DEFAULT_DB_PATH = os.environ.get(
+    "TSP_GA_RUNS_DB",
+    os.path.join(os.path.expanduser("~"), ".cache", "tsp_genetic_algorithm_ai", "runs.sqlite3")
+)
+
+# Número máximo de linhas gravadas em uma única transação
+BATCH_SIZE = 512
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    instance TEXT NOT NULL,
+    parameters_key TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    seed INTEGER,
+    started_at REAL NOT NULL,
+    best_tour TEXT,
+    distance REAL,
+    elapsed REAL,
+    generations INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_instance_parameters ON runs (instance, parameters_key);
+CREATE TABLE IF NOT EXISTS generations (
+    run_id TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    distance REAL NOT NULL,
+    elapsed REAL NOT NULL,
+    PRIMARY KEY (run_id, generation)
+) WITHOUT ROWID;
+"""
+
+
+def instance_key(locations, distance_matrix):
+
+    """
+    Função que calcula a chave de uma instância (ids dos locais e matriz de distâncias)
+
+    :param locations: lista de locais
+    :param distance_matrix: matriz (n, n) de distâncias
+    :return: string hexadecimal com o hash da instância
+    """
+
+    digest = hashlib.sha256()
+    digest.update("|".join(str(location.id) for location in locations).encode())
+    digest.update(np.ascontiguousarray(distance_matrix, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def parameters_key(parameters):
+
+    """
+    Função que calcula a chave de um conjunto de parâmetros
+
+    :param parameters: dicionário de parâmetros (valores serializáveis em JSON)
+    :return: string hexadecimal com o hash dos parâmetros
+    """
+
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class RunStore:
+
+    """
+    Classe que grava o histórico de execuções em um banco SQLite
+
+    As gravações são enfileiradas e feitas por uma thread em segundo plano, que agrupa
+    as linhas em transações com executemany; o laço de gerações nunca espera por I/O.
+    finish_run espera a fila esvaziar, e os erros de gravação são relançados por flush e close.
+    """
+
+    def __init__(self, path=None, batch_size=BATCH_SIZE):
+
+        """
+        Construtor da classe RunStore
+
+        :param path: caminho do banco (padrão: DEFAULT_DB_PATH); ":memory:" não é suportado
+        :param batch_size: número máximo de linhas por transação
+        """
+
+        self.path = str(path or DEFAULT_DB_PATH)
+        self.batch_size = batch_size
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        with self.connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+        self.queue = queue.Queue()
+        # Erros de gravação da thread em segundo plano, relançados em flush e close
+        self.errors = []
+        self.errors_lock = threading.Lock()
+        self.writer = threading.Thread(target=self._write_loop, name="RunStoreWriter", daemon=True)
+        self.writer.start()
+
+    def connect(self):
+
+        """
+        Método que abre uma conexão com o banco
+
+        :return: sqlite3.Connection
+        """
+
+        return sqlite3.connect(self.path, timeout=30)
+
+    def start_run(self, instance, parameters, seed=None):
+
+        """
+        Método que registra o início de uma execução
+
+        :param instance: chave da instância (ver instance_key)
+        :param parameters: dicionário com os parâmetros da execução
+        :param seed: semente da execução
+        :return: id da execução
+        """
+
+        run_id = uuid.uuid4().hex
+        self.queue.put(("start", (run_id, instance, parameters_key(parameters),
+                                  json.dumps(parameters, sort_keys=True), seed, time.time())))
+        return run_id
+
+    def record_generation(self, run_id, generation, distance, elapsed):
+
+        """
+        Método que registra a melhor distância de uma geração
+
+        :param run_id: id da execução
+        :param generation: número da geração
+        :param distance: melhor distância global na geração
+        :param elapsed: tempo (s) desde o início da execução
+        """
+
+        self.queue.put(("generation", (run_id, int(generation), float(distance), float(elapsed))))
+
+    def finish_run(self, run_id, best_tour, distance, elapsed, generations):
+
+        """
+        Método que registra o resultado de uma execução e espera a gravação de tudo o que foi enfileirado
+
+        :param run_id: id da execução
+        :param best_tour: lista com os ids dos locais da melhor rota
+        :param distance: distância da melhor rota
+        :param elapsed: duração da execução (s)
+        :param generations: número de gerações executadas
+        """
+
+        self.queue.put(("finish", (json.dumps(best_tour), float(distance), float(elapsed), int(generations), run_id)))
+        # A thread de gravação é daemon: sem esperar aqui, as linhas enfileiradas se perderiam na saída do interpretador
+        self.flush()
+
+    def _write_loop(self):
+
+        """
+        Método executado pela thread de gravação: agrupa os itens da fila em transações
+        """
+
+        connection = self.connect()
+        statements = {
+            "start": "INSERT INTO runs (id, instance, parameters_key, parameters, seed, started_at) "
+                     "VALUES (?, ?, ?, ?, ?, ?)",
+            "generation": "INSERT OR REPLACE INTO generations (run_id, generation, distance, elapsed) "
+                          "VALUES (?, ?, ?, ?)",
+            "finish": "UPDATE runs SET best_tour = ?, distance = ?, elapsed = ?, generations = ? WHERE id = ?",
+        }
+
+        running = True
+        while running:
+            # Espera o primeiro item e junta o que mais estiver na fila, até batch_size
+            items = [self.queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Mantém a ordem entre tipos diferentes (o início da execução antes do resultado)
+            try:
+                with connection:
+                    kind, rows = None, []
+                    for item in items + [("close", None)]:
+                        if item[0] != kind and rows:
+                            connection.executemany(statements[kind], rows)
+                            rows = []
+                        kind = item[0]
+                        if kind != "close":
+                            rows.append(item[1])
+            except sqlite3.Error as error:
+                with self.errors_lock:
+                    self.errors.append(error)
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+
+            running = not any(item[0] == "close" for item in items)
+
+        connection.close()
+
+    def flush(self):
+
+        """
+        Método que espera até que todas as gravações enfileiradas estejam no banco
+
+        Relança (uma vez) o primeiro erro de gravação ocorrido desde a última chamada.
+        """
+
+        self.queue.join()
+        self.raise_errors()
+
+    def raise_errors(self):
+
+        """
+        Método que relança o primeiro erro de gravação pendente e descarta os demais
+        """
+
+        with self.errors_lock:
+            errors, self.errors = self.errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+
+        """
+        Método que grava o que falta e encerra a thread de gravação
+        """
+
+        if self.writer.is_alive():
+            self.queue.put(("close", None))
+            self.writer.join()
+        self.raise_errors()
+
+    def query_runs(self, instance=None, parameters=None):
+
+        """
+        Método que consulta as execuções concluídas
+
+        :param instance: chave da instância (opcional)
+        :param parameters: dicionário de parâmetros ou chave de parâmetros (opcional)
+        :return: dicionário de arrays (id, seed, distance, elapsed, generations, started_at) e lista de best_tour
+        """
+
+        self.flush()
+        conditions, values = ["distance IS NOT NULL"], []
+        if instance is not None:
+            conditions.append("instance = ?")
+            values.append(instance)
+        if parameters is not None:
+            conditions.append("parameters_key = ?")
+            values.append(parameters if isinstance(parameters, str) else parameters_key(parameters))
+
+        with self.connect() as connection:
+            rows = connection.execute(
+                "SELECT id, seed, distance, elapsed, generations, started_at, best_tour FROM runs "
+                f"WHERE {' AND '.join(conditions)} ORDER BY started_at", values
+            ).fetchall()
+
+        columns = list(zip(*rows)) if rows else [()] * 7
+        return {
+            "id": np.array(columns[0], dtype=object),
+            "seed": np.array([np.nan if seed is None else seed for seed in columns[1]], dtype=np.float64),
+            "distance": np.array(columns[2], dtype=np.float64),
+            "elapsed": np.array(columns[3], dtype=np.float64),
+            "generations": np.array(columns[4], dtype=np.int64),
+            "started_at": np.array(columns[5], dtype=np.float64),
+            "best_tour": [json.loads(tour) for tour in columns[6]],
+        }
+
+    def convergence(self, run_ids):
+
+        """
+        Método que retorna as curvas de convergência de várias execuções
+
+        :param run_ids: ids das execuções
+        :return: array (execuções, gerações) com a melhor distância por geração (nan após o fim de cada execução)
+        """
+
+        self.flush()
+        run_ids = list(run_ids)
+        position = {run_id: i for i, run_id in enumerate(run_ids)}
+        if not run_ids:
+            return np.empty((0, 0))
+
+        with self.connect() as connection:
+            rows = connection.execute(
+                f"SELECT run_id, generation, distance FROM generations "
+                f"WHERE run_id IN ({', '.join('?' * len(run_ids))})", run_ids
+            ).fetchall()
+
+        if not rows:
+            return np.full((len(run_ids), 0), np.nan)
+
+        ids, generation, distance = zip(*rows)
+        generation = np.array(generation, dtype=np.int64)
+        curves = np.full((len(run_ids), generation.max()), np.nan)
+        curves[[position[run_id] for run_id in ids], generation - 1] = distance
+        return curves
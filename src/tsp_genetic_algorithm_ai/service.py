@@ -0,0 +1,528 @@
+import argparse
+import collections
+import inspect
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from .GeneticAlgorithm import GeneticAlgorithm
+from .Location import Location
+from .distance_matrix import build_distance_matrix
+from .matrix_cache import location_fingerprint
+from .mock_data import get_mock_data
+from .solver import solve
+
+# Prazo padrão e máximo (s) de uma requisição
+DEFAULT_DEADLINE = 1.0
+MAX_DEADLINE = 60.0
+
+# Número de instâncias enviadas nas requisições mantidas em memória por processo
+WORKER_CACHE_SIZE = 16
+
+# Número de requisições concluídas usadas nas estatísticas de latência
+LATENCY_WINDOW = 1024
+
+# Janela (s) da vazão recente
+THROUGHPUT_WINDOW = 60.0
+
+# Parâmetros do GeneticAlgorithm que não podem ser enviados em parameters (definidos pelo serviço ou pela requisição)
+RESERVED_PARAMETERS = {"locations", "distance_matrix", "distance_cache", "run_store", "initial_tours", "verbose",
+                       "seed", "history_points", "deadline", "memory_profile"}
+
+# Parâmetros aceitos pelo construtor do GeneticAlgorithm
+GA_PARAMETERS = set(inspect.signature(GeneticAlgorithm).parameters)
+
+# Instâncias carregadas em cada processo: {nome ou impressão digital: (locais, matriz de distâncias)}
+_instances = {}
+_preloaded = set()
+
+
+def warm_worker(instances):
+
+    """
+    Função de inicialização dos processos do pool: carrega as instâncias e aquece o solver
+
+    :param instances: dicionário {nome: (locais, matriz de distâncias ou None)}
+    """
+
+    for name, (locations, distance_matrix) in instances.items():
+        if distance_matrix is None:
+            distance_matrix = build_distance_matrix(locations, metric='explicit')
+        _instances[name] = (locations, np.asarray(distance_matrix, dtype=np.float64))
+        _preloaded.add(name)
+
+    # Uma execução curta paga as importações e as primeiras chamadas do NumPy antes da primeira requisição
+    locations, distance_matrix = next(iter(_instances.values()))
+    solve(locations, 0.01, distance_matrix=distance_matrix, seed=0)
+
+
+def ping():
+
+    """
+    Função executada nos processos do pool para confirmar que estão prontos
+
+    :return: pid do processo
+    """
+
+    return os.getpid()
+
+
+def location_from_dict(data):
+
+    """
+    Função que converte um local recebido em JSON
+
+    :param data: dicionário com id, name e, opcionalmente, latitude e longitude
+    :return: Location
+    """
+
+    return Location(data["id"], data.get("name", str(data["id"])), data.get("latitude"), data.get("longitude"))
+
+
+def load_instance(request):
+
+    """
+    Função que obtém os locais e a matriz de distâncias de uma requisição (executada nos processos do pool)
+
+    :param request: dicionário da requisição (instance, ou locations com distance_matrix ou metric opcionais)
+    :return: tupla (locais, matriz de distâncias)
+    """
+
+    if "locations" not in request:
+        name = request.get("instance", "default")
+        if name not in _instances:
+            raise ValueError(f"Instância desconhecida: {name}")
+        return _instances[name]
+
+    locations = [location_from_dict(location) for location in request["locations"]]
+    if len(locations) < 2:
+        raise ValueError("locations deve ter pelo menos dois locais")
+
+    if request.get("distance_matrix") is not None:
+        distance_matrix = np.asarray(request["distance_matrix"], dtype=np.float64)
+        if distance_matrix.shape != (len(locations), len(locations)):
+            raise ValueError("distance_matrix deve ser (n, n) para n locais")
+        return locations, distance_matrix
+
+    metric = request.get("metric")
+    if metric is None:
+        metric = 'haversine' if all(location.has_coordinates() for location in locations) else 'explicit'
+    key = location_fingerprint(locations, metric)
+
+    # Cache LRU: a instância mais recente fica no fim do dicionário
+    if key in _instances:
+        _instances[key] = _instances.pop(key)
+    else:
+        _instances[key] = (locations, build_distance_matrix(locations, metric))
+        cached = [name for name in _instances if name not in _preloaded]
+        for name in cached[:-WORKER_CACHE_SIZE]:
+            del _instances[name]
+
+    return _instances[key]
+
+
+def solve_request(request):
+
+    """
+    Função que resolve uma requisição (executada nos processos do pool)
+
+    Com generations, o GeneticAlgorithm roda com os parâmetros enviados (limitado pelo
+    prazo); sem generations, a requisição é resolvida por solve dentro do prazo.
+
+    :param request: dicionário da requisição (ver SolveHandler), com deadline_at (instante de chegada + prazo,
+        em time.time) quando enviada pelo SolveService
+    :return: dicionário com tour (ids), distance, mode, generations e elapsed
+    """
+
+    start = time.perf_counter()
+    # O prazo conta desde a chegada da requisição ao serviço (deadline_at, relógio de parede): a espera na fila
+    # é descontada
+    deadline = request["deadline"]
+    if request.get("deadline_at") is not None:
+        deadline = min(deadline, request["deadline_at"] - time.time())
+        if deadline <= 0:
+            raise TimeoutError("O prazo terminou antes de a requisição sair da fila")
+
+    locations, distance_matrix = load_instance(request)
+    parameters = request.get("parameters") or {}
+    if not isinstance(parameters, dict):
+        raise ValueError("parameters deve ser um objeto JSON")
+    reserved = RESERVED_PARAMETERS & parameters.keys()
+    if reserved:
+        raise ValueError(f"Parâmetros não permitidos em parameters: {sorted(reserved)}")
+    unknown = parameters.keys() - GA_PARAMETERS
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos: {sorted(unknown)}")
+    seed = request.get("seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+        raise ValueError("seed deve ser um inteiro não negativo")
+    # A carga da instância também consome o prazo
+    remaining = deadline - (time.perf_counter() - start)
+    if remaining <= 0:
+        raise TimeoutError("O prazo terminou durante a carga da instância")
+    if request.get("generations") is None:
+        result = solve(locations, remaining, distance_matrix=distance_matrix, seed=seed, parameters=parameters)
+        tour, distance, mode, generations = result["tour"], result["distance"], result["mode"], result["generations"]
+    else:
+        ga = GeneticAlgorithm(**parameters, locations=locations, distance_matrix=distance_matrix, seed=seed,
+                              history_points=None, verbose=False)
+        ga.deadline = deadline - (time.perf_counter() - start)
+        _, best_fitness = ga.run(int(request["generations"]))
+        if ga.global_best_tour is None:
+            raise ValueError("O prazo terminou antes da primeira geração")
+        tour = [locations[i].id for i in ga.global_best_tour]
+        distance, mode, generations = ga.fitness_distance(best_fitness), ga.solver, ga.generations_run
+
+    return {
+        "tour": tour,
+        "distance": float(distance),
+        "mode": mode,
+        "generations": int(generations),
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+class ServiceUnavailable(Exception):
+
+    """
+    Exceção de uma requisição recusada pelo controle de admissão
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ServiceMetrics:
+
+    """
+    Classe que acumula as estatísticas de vazão e latência do serviço
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+
+        """
+        Construtor da classe ServiceMetrics
+
+        :param window: número de requisições concluídas mantidas para as estatísticas de latência
+        """
+
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.counts = {"accepted": 0, "rejected": 0, "completed": 0, "failed": 0, "expired": 0}
+        # (instante de conclusão, latência total, espera na fila, tempo de solução)
+        self.completed = collections.deque(maxlen=window)
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def record(self, latency, solve_time):
+
+        """
+        Método que registra uma requisição concluída
+
+        :param latency: tempo (s) entre a chegada da requisição e a resposta
+        :param solve_time: tempo (s) gasto no processo do pool
+        """
+
+        with self.lock:
+            self.counts["completed"] += 1
+            self.completed.append((time.monotonic(), latency, max(latency - solve_time, 0.0), solve_time))
+
+    def snapshot(self):
+
+        """
+        Método que retorna as estatísticas atuais
+
+        :return: dicionário com contagens, vazão (requisições/s) e percentis de latência (s)
+        """
+
+        with self.lock:
+            now = time.monotonic()
+            counts = dict(self.counts)
+            samples = np.array(self.completed, dtype=np.float64).reshape(-1, 4)
+
+        uptime = now - self.started
+        recent = samples[samples[:, 0] >= now - THROUGHPUT_WINDOW]
+        window = min(uptime, THROUGHPUT_WINDOW)
+
+        def summary(values):
+            if not len(values):
+                return {"count": 0}
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            return {"count": len(values), "mean": float(values.mean()), "p50": float(p50), "p90": float(p90),
+                    "p99": float(p99), "max": float(values.max())}
+
+        return {
+            "uptime": uptime,
+            "requests": counts,
+            "throughput": {
+                "overall": counts["completed"] / uptime if uptime > 0 else 0.0,
+                "recent": len(recent) / window if window > 0 else 0.0,
+            },
+            "latency": summary(samples[:, 1]),
+            "queue_wait": summary(samples[:, 2]),
+            "solve_time": summary(samples[:, 3]),
+        }
+
+
+class SolveService:
+
+    """
+    Classe que mantém o pool de processos aquecidos e o controle de admissão
+
+    Cada processo carrega as instâncias e executa uma solução curta ao iniciar, de modo
+    que as requisições não pagam a inicialização do Python, do NumPy nem a montagem das
+    matrizes. Até workers requisições são resolvidas ao mesmo tempo e até queue_size
+    esperam na fila; as demais são recusadas, assim como as que não cumpririam max_latency.
+    """
+
+    def __init__(self, workers=None, queue_size=None, instances=None, max_deadline=MAX_DEADLINE):
+
+        """
+        Construtor da classe SolveService
+
+        :param workers: número de processos do pool (padrão: número de CPUs)
+        :param queue_size: número máximo de requisições esperando na fila (padrão: 2 * workers)
+        :param instances: dicionário {nome: (locais, matriz de distâncias ou None)} carregado nos processos
+                          (padrão: a instância padrão, com o nome default)
+        :param max_deadline: prazo máximo (s) aceito em uma requisição
+        """
+
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size if queue_size is not None else 2 * self.workers
+        self.max_deadline = max_deadline
+        self.metrics = ServiceMetrics()
+        self.lock = threading.Lock()
+        self.pending = 0
+        # Soma dos prazos das requisições admitidas e ainda não concluídas
+        self.pending_seconds = 0.0
+
+        instances = instances or {"default": (get_mock_data(), None)}
+        # spawn: o servidor tem threads, que não devem ser copiadas por fork
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=warm_worker, initargs=(instances,))
+
+    def warm_up(self):
+
+        """
+        Método que inicia todos os processos do pool e espera que estejam prontos
+        """
+
+        for future in [self.executor.submit(ping) for _ in range(self.workers)]:
+            future.result()
+
+    def estimated_wait(self):
+
+        """
+        Método que estima a espera na fila de uma nova requisição
+
+        :return: tempo estimado (s)
+        """
+
+        with self.lock:
+            return self._wait()
+
+    def _wait(self):
+        # Chamado com self.lock adquirido: a fila anda workers requisições por vez
+        return 0.0 if self.pending < self.workers else self.pending_seconds / self.workers
+
+    def admit(self, deadline, max_latency=None):
+
+        """
+        Método que reserva uma vaga para uma requisição ou a recusa
+
+        :param deadline: prazo (s) da requisição
+        :param max_latency: latência máxima (s) aceita pelo cliente (opcional)
+        """
+
+        with self.lock:
+            wait = self._wait()
+            if self.pending >= self.workers + self.queue_size:
+                reason = "Fila cheia"
+            elif max_latency is not None and wait + deadline > max_latency:
+                reason = f"Espera estimada de {wait:.3f} s não cumpre max_latency"
+            else:
+                self.pending += 1
+                self.pending_seconds += deadline
+                return
+        self.metrics.count("rejected")
+        raise ServiceUnavailable(reason, retry_after=max(1, int(np.ceil(wait))))
+
+    def release(self, deadline):
+        with self.lock:
+            self.pending -= 1
+            self.pending_seconds -= deadline
+
+    def solve(self, request):
+
+        """
+        Método que resolve uma requisição em um processo do pool
+
+        :param request: dicionário da requisição (ver SolveHandler)
+        :return: resultado de solve_request acrescido de queue_wait e latency
+        """
+
+        arrived = time.perf_counter()
+        arrived_at = time.time()
+        deadline = float(request.get("deadline", DEFAULT_DEADLINE))
+        if not 0 < deadline <= self.max_deadline:
+            raise ValueError(f"deadline deve estar em (0, {self.max_deadline}]")
+        max_latency = request.get("max_latency")
+
+        self.admit(deadline, None if max_latency is None else float(max_latency))
+        self.metrics.count("accepted")
+        try:
+            result = self.executor.submit(solve_request, {**request, "deadline": deadline,
+                                                          "deadline_at": arrived_at + deadline}).result()
+        except TimeoutError:
+            self.metrics.count("expired")
+            raise
+        except Exception:
+            self.metrics.count("failed")
+            raise
+        finally:
+            self.release(deadline)
+
+        latency = time.perf_counter() - arrived
+        self.metrics.record(latency, result["elapsed"])
+        return {**result, "queue_wait": max(latency - result["elapsed"], 0.0), "latency": latency}
+
+    def status(self):
+
+        """
+        Método que retorna as métricas do serviço
+
+        :return: dicionário de ServiceMetrics.snapshot acrescido do estado do pool e da fila
+        """
+
+        with self.lock:
+            pending = self.pending
+        return {
+            **self.metrics.snapshot(),
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": min(pending, self.workers),
+            "queued": max(pending - self.workers, 0),
+            "estimated_wait": self.estimated_wait(),
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class SolveHandler(BaseHTTPRequestHandler):
+
+    """
+    Classe que atende as requisições HTTP do serviço
+
+    POST /solve recebe um JSON com:
+        instance (nome de uma instância carregada, padrão default) ou locations
+        (lista de {id, name, latitude, longitude}) com distance_matrix ou metric opcionais;
+        deadline (s, contado desde a chegada: a espera na fila é descontada), seed,
+        parameters (parâmetros do GeneticAlgorithm, exceto RESERVED_PARAMETERS), generations
+        (opcional: roda o algoritmo genético com parameters em vez do modo escolhido
+        para o prazo) e max_latency (s, opcional: recusa se a espera estimada não couber).
+    Requisições inválidas recebem 400; recusadas pelo controle de admissão (fila cheia ou max_latency), 429;
+    cujo prazo terminou antes de a resolução começar, 503. Ambas trazem Retry-After.
+    GET /metrics retorna vazão, latência e estado da fila; GET /health indica se o serviço está no ar.
+    """
+
+    server_version = "TSPSolveService/0.1"
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self.send_json(200, self.server.service.status())
+        elif self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        else:
+            self.send_json(404, {"error": f"Caminho desconhecido: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/solve":
+            self.send_json(404, {"error": f"Caminho desconhecido: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("O corpo da requisição deve ser um objeto JSON")
+            self.send_json(200, self.server.service.solve(request))
+        except ServiceUnavailable as error:
+            # Recusada na admissão: o cliente deve tentar de novo mais tarde
+            self.send_json(429, {"error": str(error)}, {"Retry-After": str(error.retry_after)})
+        except TimeoutError as error:
+            # O prazo terminou antes de a resolução começar: o serviço está sobrecarregado
+            retry_after = max(1, int(np.ceil(self.server.service.estimated_wait())))
+            self.send_json(503, {"error": str(error)}, {"Retry-After": str(retry_after)})
+        except (ValueError, TypeError, KeyError) as error:
+            self.send_json(400, {"error": str(error)})
+        except Exception as error:
+            self.send_json(500, {"error": f"{type(error).__name__}: {error}"})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(host="127.0.0.1", port=8000, workers=None, queue_size=None, instances=None, verbose=False):
+
+    """
+    Função que cria o servidor HTTP com o pool de processos já aquecido
+
+    :param host: endereço do servidor
+    :param port: porta do servidor (0 escolhe uma porta livre)
+    :param workers: número de processos do pool
+    :param queue_size: número máximo de requisições na fila
+    :param instances: instâncias carregadas nos processos (ver SolveService)
+    :param verbose: se True, registra cada requisição no stderr
+    :return: ThreadingHTTPServer com o atributo service (SolveService)
+    """
+
+    service = SolveService(workers, queue_size, instances)
+    service.warm_up()
+    server = ThreadingHTTPServer((host, port), SolveHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON do solver com pool de processos aquecidos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.workers, args.queue_size, verbose=args.verbose)
+    print(f"Servidor em http://{args.host}:{server.server_address[1]} ({server.service.workers} processos)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import time
+import numpy as np
+from .GeneticAlgorithm import GeneticAlgorithm
+from .Route import Route
+from .distance_matrix import build_distance_matrix, candidate_lists
+from .held_karp import held_karp, held_karp_memory, DEFAULT_MAX_MEMORY
+from .initialization import close_tours, nearest_neighbor_tours
+from .local_search import two_opt
+
+# Segundos por operação do Held-Karp (2^m · m² para m paradas), com folga sobre o valor medido
+HELD_KARP_SECONDS_PER_OPERATION = 1e-8
+
+# Fração máxima do prazo que a estimativa do Held-Karp pode ocupar
+EXACT_BUDGET_FRACTION = 0.5
+
+# Tempo mínimo (s) que precisa sobrar após a construção para valer a pena iniciar o algoritmo genético
+MIN_GA_SECONDS = 0.005
+
+# Folga (s) reservada para montar o resultado antes do prazo
+SAFETY_MARGIN = 0.002
+
+# Segundos por célula da matriz nas etapas O(n²) não interrompíveis (vizinho mais próximo, listas de candidatos,
+# tabela do controle de duplicatas), com folga sobre o valor medido
+SECONDS_PER_MATRIX_CELL = 1e-8
+
+# Segundos por gene (indivíduo × local) de uma fase do algoritmo genético; o relógio só é consultado entre fases,
+# então o prazo do algoritmo genético é antecipado em uma fase
+SECONDS_PER_GENE_PHASE = 1e-7
+
+# Tamanho da população conforme o prazo: (prazo máximo em segundos, tamanho)
+POPULATION_BY_BUDGET = ((0.1, 30), (1.0, 60), (float('inf'), 100))
+
+
+def held_karp_seconds(num_locations):
+
+    """
+    Função que estima o tempo do Held-Karp
+
+    :param num_locations: número de locais (incluindo o depósito)
+    :return: tempo estimado em segundos
+    """
+
+    stops = max(num_locations - 1, 1)
+    return HELD_KARP_SECONDS_PER_OPERATION * (1 << stops) * stops * stops
+
+
+def choose_mode(num_locations, budget):
+
+    """
+    Função que escolhe o modo de operação para o prazo
+
+    :param num_locations: número de locais (incluindo o depósito)
+    :param budget: prazo em segundos
+    :return: exact (Held-Karp cabe no prazo) ou ga (construção + 2-opt + algoritmo genético)
+    """
+
+    if (held_karp_memory(num_locations) <= DEFAULT_MAX_MEMORY
+            and held_karp_seconds(num_locations) <= EXACT_BUDGET_FRACTION * budget):
+        return 'exact'
+    return 'ga'
+
+
+def ga_parameters(num_locations, budget):
+
+    """
+    Função que escolhe os parâmetros do algoritmo genético para o prazo
+
+    :param num_locations: número de locais (incluindo o depósito)
+    :param budget: tempo disponível em segundos
+    :return: dicionário de parâmetros do GeneticAlgorithm
+    """
+
+    population_size = next(size for limit, size in POPULATION_BY_BUDGET if budget <= limit)
+    # O controle de duplicatas monta uma tabela (n + 1, n): só compensa se couber folgado no prazo
+    duplicate_control = "replace" if 10 * SECONDS_PER_MATRIX_CELL * num_locations ** 2 <= budget else None
+    return {
+        "population_size": population_size,
+        "mutation_rate": 0.2,
+        "crossover_rate": 0.8,
+        "elitism_count": 2,
+        "selection_method": "tournament",
+        "tournament_size": 3,
+        "duplicate_control": duplicate_control,
+    }
+
+
+def solve(locations, deadline, distance_matrix=None, metric=None, seed=None, parameters=None):
+
+    """
+    Função que resolve a instância dentro de um prazo, devolvendo sempre a melhor rota encontrada até ele
+
+    Instâncias cujo Held-Karp cabe no prazo são resolvidas de forma exata. Nas demais,
+    uma rota construída (vizinho mais próximo + 2-opt) é obtida primeiro e usada como
+    semente do algoritmo genético, que roda até o prazo.
+
+    :param locations: lista de locais (o primeiro é o depósito)
+    :param deadline: prazo em segundos, positivo (inclui a montagem da matriz de distâncias)
+    :param distance_matrix: matriz (n, n) de distâncias (padrão: construída a partir dos locais)
+    :param metric: métrica da matriz construída (padrão: haversine se todos os locais têm coordenadas, senão explicit)
+    :param seed: semente do algoritmo genético
+    :param parameters: parâmetros do GeneticAlgorithm que substituem os escolhidos para o prazo
+    :return: dicionário com route, tour (ids), distance, mode, generations, elapsed e budget_used
+    """
+
+    if not deadline > 0:
+        raise ValueError(f"O prazo deve ser positivo: {deadline}")
+
+    start = time.perf_counter()
+    deadline_at = start + deadline
+
+    if distance_matrix is None:
+        if metric is None:
+            metric = 'haversine' if all(location.has_coordinates() for location in locations) else 'explicit'
+        distance_matrix = build_distance_matrix(locations, metric)
+    distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+
+    n = len(locations)
+    mode = choose_mode(n, deadline_at - time.perf_counter())
+    generations = 0
+
+    def remaining():
+        return deadline_at - SAFETY_MARGIN - time.perf_counter()
+
+    if mode == 'exact':
+        distance, tour = held_karp(distance_matrix)
+    else:
+        # Cada etapa só começa se a estimativa couber no tempo restante; a rota atual é sempre válida
+        matrix_seconds = SECONDS_PER_MATRIX_CELL * n * n
+        cycle = np.arange(n, dtype=np.intp)
+        if matrix_seconds <= remaining():
+            cycle = nearest_neighbor_tours(distance_matrix, [0])[0]
+        if 2 * matrix_seconds <= remaining():
+            cycle = two_opt(cycle, distance_matrix, candidate_lists(distance_matrix),
+                            deadline=deadline_at - SAFETY_MARGIN)
+        tour = close_tours(cycle[None])[0]
+        distance = float(distance_matrix[tour[:-1], tour[1:]].sum())
+
+        if remaining() >= MIN_GA_SECONDS + matrix_seconds and n > 3:
+            ga_kwargs = {**ga_parameters(n, remaining()), **(parameters or {})}
+            ga = GeneticAlgorithm(**ga_kwargs, locations=locations, distance_matrix=distance_matrix, seed=seed,
+                                  initial_tours=tour, history_points=None, verbose=False)
+            # O prazo do algoritmo genético é medido depois da sua construção
+            phase_seconds = SECONDS_PER_GENE_PHASE * ga_kwargs["population_size"] * ga.num_populations * n
+            ga.deadline = remaining() - phase_seconds
+            ga.run(np.iinfo(np.int64).max)
+            generations = ga.generations_run
+            if ga.global_best_tour is not None and ga.fitness_distance(ga.global_best_fitness) < distance:
+                tour = np.asarray(ga.global_best_tour)
+                distance = ga.fitness_distance(ga.global_best_fitness)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "route": Route([locations[i] for i in tour], distance=distance),
+        "tour": [locations[i].id for i in tour],
+        "distance": distance,
+        "mode": mode,
+        "generations": generations,
+        "elapsed": elapsed,
+        "budget_used": elapsed / deadline,
+    }
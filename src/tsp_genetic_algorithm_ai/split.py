@@ -0,0 +1,128 @@
+from collections import deque
+import numpy as np
+
+
+def split_giant_tour(tour, distance_matrix, demands, capacity, max_route_length=None, depot=0):
+
+    """
+    Função que particiona uma rota gigante (sem o depósito) em rotas de veículos
+
+    O particionamento é ótimo para a ordem dada: cada veículo atende um trecho
+    contíguo da rota gigante, saindo e voltando ao depósito. Sem limite de
+    comprimento o Split roda em O(n) com uma deque (mínimo em janela deslizante);
+    com limite de comprimento usa o Split de Bellman limitado pela capacidade.
+
+    :param tour: sequência de índices dos locais (sem o depósito)
+    :param distance_matrix: matriz (n, n) de distâncias
+    :param demands: array com a demanda de cada local (indexado como a matriz)
+    :param capacity: capacidade de cada veículo
+    :param max_route_length: distância máxima de cada rota de veículo (opcional)
+    :param depot: índice do depósito na matriz
+    :return: tupla (distância total, lista de rotas, cada uma uma lista de índices sem o depósito)
+    """
+
+    tour = np.asarray(tour, dtype=np.intp)
+    n = len(tour)
+    if n == 0:
+        return 0.0, []
+
+    tour_demands = np.asarray(demands, dtype=np.float64)[tour]
+    if np.any(tour_demands > capacity):
+        raise ValueError("Há locais com demanda maior que a capacidade do veículo")
+
+    # Prefixos 1-indexados: load[j] é a carga de tour[0..j-1]; along[j] a distância de tour[0] até tour[j-1]
+    load = np.zeros(n + 1)
+    np.cumsum(tour_demands, out=load[1:])
+    along = np.zeros(n + 1)
+    np.cumsum(distance_matrix[tour[:-1], tour[1:]], out=along[2:])
+    from_depot = np.asarray(distance_matrix[depot, tour], dtype=np.float64)
+    to_depot = np.asarray(distance_matrix[tour, depot], dtype=np.float64)
+
+    if max_route_length is None:
+        potential, predecessor = _split_linear(n, load, along, from_depot, to_depot, capacity)
+    else:
+        potential, predecessor = _split_bellman(n, load, along, from_depot, to_depot, capacity, max_route_length)
+
+    if not np.isfinite(potential[n]):
+        raise ValueError("Não existe particionamento viável para as restrições informadas")
+
+    # Reconstrói as rotas a partir dos predecessores
+    routes = []
+    j = n
+    while j > 0:
+        i = predecessor[j]
+        routes.append(tour[i:j].tolist())
+        j = i
+    routes.reverse()
+
+    return float(potential[n]), routes
+
+
+def _split_linear(n, load, along, from_depot, to_depot, capacity):
+
+    """
+    Split em tempo linear (Vidal, 2016) para frota ilimitada e restrição de capacidade
+
+    p[j] = min_i p[i] + d(0, t[i+1]) - D[i+1] + D[j] + d(t[j], 0), sobre os i da janela
+    em que a carga cabe no veículo. Como a janela só avança, o mínimo é mantido por uma deque.
+    """
+
+    potential = np.full(n + 1, np.inf)
+    potential[0] = 0.0
+    predecessor = np.zeros(n + 1, dtype=np.intp)
+
+    # Termo que depende apenas de i
+    def head(i):
+        return potential[i] + from_depot[i] - along[i + 1]
+
+    window = deque([0])
+    for j in range(1, n + 1):
+        # Remove da frente os predecessores que estouram a capacidade
+        while window and load[j] - load[window[0]] > capacity:
+            window.popleft()
+
+        i = window[0]
+        potential[j] = head(i) + along[j] + to_depot[j - 1]
+        predecessor[j] = i
+
+        if j < n:
+            # Mantém a deque com valores de head crescentes
+            value = head(j)
+            while window and head(window[-1]) >= value:
+                window.pop()
+            window.append(j)
+
+    return potential, predecessor
+
+
+def _split_bellman(n, load, along, from_depot, to_depot, capacity, max_route_length):
+
+    """
+    Split de Bellman com parada antecipada por capacidade e comprimento de rota
+
+    Cada predecessor só examina os trechos seguintes enquanto a carga e o trecho
+    interno cabem nos limites, o que mantém o custo próximo de linear para rotas curtas.
+    """
+
+    potential = np.full(n + 1, np.inf)
+    potential[0] = 0.0
+    predecessor = np.zeros(n + 1, dtype=np.intp)
+
+    for i in range(n):
+        if not np.isfinite(potential[i]):
+            continue
+        for j in range(i + 1, n + 1):
+            if load[j] - load[i] > capacity:
+                break
+            inner = along[j] - along[i + 1]
+            if inner > max_route_length:
+                break
+            length = from_depot[i] + inner + to_depot[j - 1]
+            if length > max_route_length:
+                continue
+            cost = potential[i] + length
+            if cost < potential[j]:
+                potential[j] = cost
+                predecessor[j] = i
+
+    return potential, predecessor
@@ -0,0 +1,85 @@
+import heapq
+
+# Modelos de substituição da população
+MODELS = ('generational', 'steady_state')
+
+# Critérios de escolha do indivíduo substituído no modo steady-state
+REPLACEMENTS = ('worst', 'tournament')
+
+
+class FitnessIndex:
+
+    """
+    Classe que mantém o pior e o melhor indivíduo de uma população com custo O(log P)
+
+    Usa dois heaps (mínimo e máximo) de entradas (fitness, índice, versão). Ao atualizar
+    um indivíduo, a entrada antiga não é removida: ela fica obsoleta (versão diferente) e
+    é descartada quando chega ao topo. Os heaps são reconstruídos quando as entradas
+    obsoletas passam do triplo do tamanho da população.
+    """
+
+    def __init__(self, fitness_values):
+
+        """
+        Construtor da classe FitnessIndex
+
+        :param fitness_values: array (P,) com o fitness de cada indivíduo
+        """
+
+        self.fitness = [float(value) for value in fitness_values]
+        self.versions = [0] * len(self.fitness)
+        self.rebuild()
+
+    def rebuild(self):
+
+        """
+        Método que reconstrói os heaps apenas com as entradas válidas
+        """
+
+        self.minimum = [(value, index, self.versions[index]) for index, value in enumerate(self.fitness)]
+        self.maximum = [(-value, index, self.versions[index]) for index, value in enumerate(self.fitness)]
+        heapq.heapify(self.minimum)
+        heapq.heapify(self.maximum)
+
+    def top(self, heap):
+        while heap[0][2] != self.versions[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+    def worst(self):
+
+        """
+        Método que retorna o índice do indivíduo de menor fitness
+
+        :return: índice na população
+        """
+
+        return self.top(self.minimum)
+
+    def best(self):
+
+        """
+        Método que retorna o índice do indivíduo de maior fitness
+
+        :return: índice na população
+        """
+
+        return self.top(self.maximum)
+
+    def update(self, index, value):
+
+        """
+        Método que registra o novo fitness de um indivíduo
+
+        :param index: índice na população
+        :param value: novo fitness
+        """
+
+        value = float(value)
+        self.fitness[index] = value
+        self.versions[index] += 1
+        heapq.heappush(self.minimum, (value, index, self.versions[index]))
+        heapq.heappush(self.maximum, (-value, index, self.versions[index]))
+
+        if len(self.minimum) > 4 * len(self.fitness):
+            self.rebuild()
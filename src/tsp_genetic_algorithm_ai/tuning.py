@@ -0,0 +1,273 @@
+import argparse
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .GeneticAlgorithm import GeneticAlgorithm
+from .distance_matrix import build_distance_matrix, random_instance
+from .mock_data import get_mock_data
+
+# Valores candidatos de cada parâmetro (a grade completa é o produto cartesiano)
+SEARCH_SPACE = {
+    "population_size": [50, 100, 200, 400],
+    "mutation_rate": [0.02, 0.05, 0.1, 0.2, 0.3],
+    "crossover_rate": [0.6, 0.7, 0.8, 0.9, 1.0],
+    "elitism_count": [0, 1, 2, 5, 10],
+    "tournament_size": [2, 3, 5, 7],
+    "num_populations": [1, 2, 4],
+    "migration_interval": [5, 10, 20, 40],
+    "migration_count": [1, 2, 5],
+}
+
+# Parâmetros fixos de todas as configurações avaliadas
+BASE_PARAMETERS = {
+    "selection_method": "tournament",
+}
+
+
+def grid_size(space):
+
+    """
+    Função que calcula o número de configurações da grade completa
+
+    :param space: dicionário {parâmetro: valores candidatos}
+    :return: número de configurações
+    """
+
+    return math.prod(len(values) for values in space.values())
+
+
+def sample_configurations(space, count, rng):
+
+    """
+    Função que sorteia configurações distintas do espaço de busca
+
+    :param space: dicionário {parâmetro: valores candidatos}
+    :param count: número de configurações
+    :param rng: np.random.Generator
+    :return: lista de dicionários de parâmetros
+    """
+
+    count = min(count, grid_size(space))
+    configurations, seen = [], set()
+    while len(configurations) < count:
+        configuration = {name: values[rng.integers(len(values))] for name, values in space.items()}
+        key = tuple(sorted(configuration.items()))
+        if key not in seen:
+            seen.add(key)
+            configurations.append(configuration)
+
+    return configurations
+
+
+def evaluate(configuration, locations, distance_matrix, generations, seed):
+
+    """
+    Função que executa uma configuração (chamada nos processos do pool)
+
+    :param configuration: dicionário de parâmetros do GeneticAlgorithm
+    :param locations: lista de locais da instância
+    :param distance_matrix: matriz de distâncias da instância
+    :param generations: número de gerações
+    :param seed: semente da execução
+    :return: tupla (melhor distância, tempo de CPU em segundos)
+    """
+
+    start = time.process_time()
+    ga = GeneticAlgorithm(**BASE_PARAMETERS, **configuration, locations=locations,
+                          distance_matrix=distance_matrix, seed=seed, verbose=False)
+    _, best_fitness = ga.run(generations)
+
+    return ga.fitness_distance(best_fitness), time.process_time() - start
+
+
+def successive_halving(locations, distance_matrix, configurations, min_generations=25, max_generations=400,
+                       eta=3, seeds=(0, 1), max_workers=None):
+
+    """
+    Função que seleciona a melhor configuração por successive halving
+
+    Cada rodada avalia as configurações restantes com todas as sementes e mantém
+    a melhor fração 1/eta (pela distância média), multiplicando o número de gerações
+    por eta, até restar uma configuração ou atingir max_generations.
+
+    As avaliações não são retomadas: cada rodada executa as configurações restantes
+    desde a geração 0 (o resultado de uma rodada é o de uma execução independente com
+    aquele número de gerações). cpu_time inclui essas gerações repetidas, e
+    rerun_cpu_time estima quanto dele foi gasto refazendo as gerações das rodadas anteriores.
+
+    :param locations: lista de locais da instância
+    :param distance_matrix: matriz de distâncias da instância
+    :param configurations: lista de dicionários de parâmetros
+    :param min_generations: gerações da primeira rodada
+    :param max_generations: gerações máximas de uma avaliação
+    :param eta: fator de redução das configurações (e de aumento das gerações) por rodada
+    :param seeds: sementes usadas em cada avaliação
+    :param max_workers: número de processos do pool (padrão: número de CPUs)
+    :return: dicionário com a melhor configuração, as rodadas, o tempo de CPU usado e o gasto com gerações repetidas
+    """
+
+    remaining = list(configurations)
+    generations = min_generations
+    previous_generations = 0
+    rounds = []
+    cpu_time = rerun_cpu_time = 0.0
+    # Custo de CPU por geração e indivíduo, usado para estimar a grade completa
+    unit_costs = []
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            futures = [[executor.submit(evaluate, configuration, locations, distance_matrix, generations, seed)
+                        for seed in seeds] for configuration in remaining]
+            results = np.array([[future.result() for future in row] for row in futures])
+            distances, cpu = results[..., 0], results[..., 1]
+            cpu_time += cpu.sum()
+            # As gerações já executadas na rodada anterior são refeitas desde o início
+            rerun_cpu_time += cpu.sum() * previous_generations / generations
+
+            scale = np.array([c["population_size"] * c["num_populations"] * generations for c in remaining])
+            unit_costs.extend((cpu / scale[:, None]).ravel())
+
+            scores = distances.mean(axis=1)
+            order = np.argsort(scores, kind="stable")
+            rounds.append({
+                "generations": generations,
+                "configurations": len(remaining),
+                "best_distance": float(scores[order[0]]),
+                "cpu_time": float(cpu.sum()),
+            })
+
+            if len(remaining) == 1 or generations >= max_generations:
+                break
+
+            keep = max(1, len(remaining) // eta)
+            remaining = [remaining[i] for i in order[:keep]]
+            previous_generations = generations
+            generations = min(max_generations, generations * eta)
+
+    return {
+        "best_configuration": remaining[order[0]],
+        "best_distance": float(scores[order[0]]),
+        "rounds": rounds,
+        "cpu_time": float(cpu_time),
+        "rerun_cpu_time": float(rerun_cpu_time),
+        "unit_cost": float(np.median(unit_costs)),
+    }
+
+
+def configurations_cost(configurations, unit_cost, generations, num_seeds):
+
+    """
+    Função que estima o tempo de CPU de avaliar configurações com o orçamento máximo
+
+    :param configurations: lista de dicionários de parâmetros
+    :param unit_cost: tempo de CPU por geração e indivíduo
+    :param generations: gerações de cada avaliação
+    :param num_seeds: sementes por configuração
+    :return: tempo de CPU estimado em segundos
+    """
+
+    individuals = sum(c["population_size"] * c["num_populations"] for c in configurations)
+    return unit_cost * individuals * generations * num_seeds
+
+
+def full_budget_cost(space, unit_cost, generations, num_seeds):
+
+    """
+    Função que estima o tempo de CPU de avaliar a grade completa com o orçamento máximo
+
+    :param space: dicionário {parâmetro: valores candidatos}
+    :param unit_cost: tempo de CPU por geração e indivíduo
+    :param generations: gerações de cada avaliação
+    :param num_seeds: sementes por configuração
+    :return: tempo de CPU estimado em segundos
+    """
+
+    # O custo de uma configuração é proporcional a population_size * num_populations
+    population_sum = sum(space["population_size"]) * sum(space["num_populations"])
+    others = grid_size(space) // (len(space["population_size"]) * len(space["num_populations"]))
+    return unit_cost * population_sum * others * generations * num_seeds
+
+
+def tune(locations, distance_matrix, configurations=40, space=None, min_generations=25, max_generations=400,
+         eta=3, seeds=(0, 1), max_workers=None, rng=None):
+
+    """
+    Função que ajusta os parâmetros para uma instância
+
+    :param locations: lista de locais da instância
+    :param distance_matrix: matriz de distâncias da instância
+    :param configurations: número de configurações sorteadas
+    :param space: espaço de busca (padrão: SEARCH_SPACE)
+    :param min_generations: gerações da primeira rodada
+    :param max_generations: gerações máximas de uma avaliação
+    :param eta: fator de redução por rodada
+    :param seeds: sementes usadas em cada avaliação
+    :param max_workers: número de processos do pool
+    :param rng: np.random.Generator do sorteio das configurações
+    :return: resultado de successive_halving acrescido da estimativa de custo da grade completa
+    """
+
+    space = space or SEARCH_SPACE
+    rng = rng if rng is not None else np.random.default_rng(0)
+    sampled = sample_configurations(space, configurations, rng)
+
+    result = successive_halving(locations, distance_matrix, sampled, min_generations, max_generations,
+                                eta, seeds, max_workers)
+    result["sampled_cpu_time"] = configurations_cost(sampled, result["unit_cost"], max_generations, len(seeds))
+    result["grid_size"] = grid_size(space)
+    result["grid_cpu_time"] = full_budget_cost(space, result["unit_cost"], max_generations, len(seeds))
+    return result
+
+
+def print_result(name, result):
+
+    """
+    Função que imprime o resultado do ajuste de uma instância
+
+    :param name: nome da instância
+    :param result: resultado de tune
+    """
+
+    print(f"\nInstância: {name}")
+    print(f"{'Gerações':>10}{'Configurações':>15}{'Melhor dist.':>14}{'CPU (s)':>10}")
+    for entry in result["rounds"]:
+        print(f"{entry['generations']:>10}{entry['configurations']:>15}"
+              f"{entry['best_distance']:>14.2f}{entry['cpu_time']:>10.2f}")
+    print(f"Melhor configuração: {result['best_configuration']}")
+    print(f"Melhor distância média: {result['best_distance']:.2f}")
+    print(f"CPU usada: {result['cpu_time']:.1f} s "
+          f"(refazendo gerações de rodadas anteriores: {result['rerun_cpu_time']:.1f} s)")
+    for label, total in (("configurações sorteadas", result["sampled_cpu_time"]),
+                         (f"grade completa ({result['grid_size']} configurações)", result["grid_cpu_time"])):
+        saved = total - result["cpu_time"]
+        print(f"Orçamento máximo em {label} (estimado): {total:.1f} s | "
+              f"economia: {saved:.1f} s ({saved / total * 100:.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste de parâmetros do algoritmo genético por successive halving")
+    parser.add_argument("--random", type=int, nargs="*", default=[],
+                        help="Tamanhos de instâncias euclidianas aleatórias ajustadas além da instância padrão")
+    parser.add_argument("--configurations", type=int, default=40)
+    parser.add_argument("--min-generations", type=int, default=25)
+    parser.add_argument("--max-generations", type=int, default=400)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--seeds", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    locations = get_mock_data()
+    instances = {"padrão": (locations, build_distance_matrix(locations, 'explicit'))}
+    for size in args.random:
+        instances[f"aleatória ({size} locais)"] = random_instance(size, seed=size)
+
+    for name, (locations, distance_matrix) in instances.items():
+        result = tune(locations, distance_matrix, args.configurations, min_generations=args.min_generations,
+                      max_generations=args.max_generations, eta=args.eta, seeds=tuple(range(args.seeds)),
+                      max_workers=args.workers)
+        print_result(name, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.adaptive import AdaptiveParameters
+
+
+def test_success_intensifies_and_failure_diversifies():
+    adaptive = AdaptiveParameters(2, 0.1, 0.8, tournament_size=3, population_size=50)
+    parents = np.array([1.0, 2.0, 3.0, 4.0])
+
+    # Todos os filhos melhores que a média dos pais: intensifica apenas a ilha 0
+    adaptive.update(0, parents, np.full(4, 10.0))
+    assert adaptive.parameters(0) == pytest.approx((0.1 / 1.2, 0.8 * 1.2, 4))
+    assert adaptive.parameters(1) == pytest.approx((0.1, 0.8, 3))
+
+    # Nenhum filho melhor: diversifica
+    adaptive.update(1, parents, np.zeros(4))
+    assert adaptive.parameters(1) == pytest.approx((0.1 * 1.2, 0.8 / 1.2, 2))
+    assert [island["success_rate"] for island in adaptive.snapshot()] == [1.0, 0.0]
+
+
+def test_success_at_target_keeps_parameters():
+    adaptive = AdaptiveParameters(1, 0.1, 0.8, tournament_size=3, population_size=50)
+    adaptive.update(0, np.zeros(5), np.array([1.0, 0.0, 0.0, 0.0, 0.0]))
+    assert adaptive.parameters(0) == pytest.approx((0.1, 0.8, 3))
+
+
+def test_parameters_stay_within_bounds():
+    adaptive = AdaptiveParameters(1, 0.3, 0.9, tournament_size=3, population_size=30)
+    parents = np.ones(10)
+    for _ in range(50):
+        adaptive.update(0, parents, np.full(10, 2.0))
+    assert adaptive.parameters(0) == pytest.approx((0.01, 1.0, 6))
+
+    for _ in range(50):
+        adaptive.update(0, parents, np.zeros(10))
+    assert adaptive.parameters(0) == pytest.approx((0.5, 0.5, 2))
+
+
+@pytest.mark.parametrize('parameters', [
+    {'num_populations': 1},
+    {'num_populations': 3, 'island_execution': 'stacked'},
+    {'num_populations': 2, 'model': 'steady_state'},
+])
+def test_engine_reports_adaptive_parameters(parameters):
+    ga = GeneticAlgorithm(population_size=30, mutation_rate=0.2, crossover_rate=0.8, elitism_count=2,
+                          selection_method='tournament', tournament_size=3, adaptive=True, seed=4,
+                          verbose=False, **parameters)
+    snapshots = []
+    ga.run(10, lambda parameters, **kwargs: snapshots.append(parameters))
+
+    assert len(snapshots) == 10 and len(snapshots[-1]) == ga.num_populations
+    for island in snapshots[-1]:
+        assert 0.01 <= island["mutation_rate"] <= 0.5 and 0.5 <= island["crossover_rate"] <= 1.0
+        assert 2 <= island["tournament_size"] <= 6
+    # As taxas mudaram em relação às iniciais
+    assert any(island["mutation_rate"] != 0.2 for island in snapshots[-1])
@@ -0,0 +1,180 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.backends import (PythonBackend, NumpyBackend, cycle_positions, mutation_plan,
+                                               mutation_deltas, mutation_probabilities)
+from tsp_genetic_algorithm_ai.distance_matrix import build_distance_matrix
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.Location import Location
+from tsp_genetic_algorithm_ai.mock_data import get_mock_data
+
+SEEDS = [0, 1, 42]
+
+
+def mock_matrix():
+    return build_distance_matrix(get_mock_data(), metric='explicit')
+
+
+def random_matrix(rng, n):
+    points = rng.random((n, 2)) * 100
+    return np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+
+
+def random_population(rng, size, n):
+    population = np.zeros((size, n + 1), dtype=np.intp)
+    population[:, 1:-1] = rng.permuted(np.tile(np.arange(1, n), (size, 1)), axis=1)
+    return population
+
+
+def instances():
+    yield 'mock', mock_matrix()
+    rng = np.random.default_rng(123)
+    for n in (5, 17, 60):
+        yield f'random-{n}', random_matrix(rng, n)
+
+
+def assert_valid(population, n):
+    assert np.all(population[:, 0] == 0) and np.all(population[:, -1] == 0)
+    assert np.array_equal(np.sort(population[:, 1:-1], axis=1), np.tile(np.arange(1, n), (len(population), 1)))
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('name,matrix', list(instances()))
+def test_fitness_identical(seed, name, matrix):
+    population = random_population(np.random.default_rng(seed), 51, len(matrix))
+    reference = PythonBackend().fitness(matrix, population)
+    vectorized = NumpyBackend().fitness(matrix, population)
+    assert np.array_equal(reference, vectorized)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('name,matrix', list(instances()))
+def test_selection_identical(seed, name, matrix):
+    population = random_population(np.random.default_rng(seed), 51, len(matrix))
+    distances = NumpyBackend().fitness(matrix, population)
+    fitness_values = distances.max() - distances + 1
+
+    reference = PythonBackend().roulette_selection(fitness_values, 51, np.random.default_rng(seed))
+    vectorized = NumpyBackend().roulette_selection(fitness_values, 51, np.random.default_rng(seed))
+    assert np.array_equal(reference, vectorized)
+
+    reference = PythonBackend().tournament_selection(fitness_values, 51, 4, np.random.default_rng(seed))
+    vectorized = NumpyBackend().tournament_selection(fitness_values, 51, 4, np.random.default_rng(seed))
+    assert np.array_equal(reference, vectorized)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('name,matrix', list(instances()))
+def test_crossover_identical(seed, name, matrix):
+    population = random_population(np.random.default_rng(seed), 51, len(matrix))
+
+    reference = PythonBackend().crossover(population.copy(), 0.8, np.random.default_rng(seed))
+    vectorized = NumpyBackend().crossover(population.copy(), 0.8, np.random.default_rng(seed))
+    assert np.array_equal(reference, vectorized)
+    assert_valid(vectorized, len(matrix))
+
+
+OPERATORS = [None, 'inversion', 'insertion', {'swap': 1, 'inversion': 2, 'insertion': 1}]
+
+
+@pytest.mark.parametrize('operators', OPERATORS)
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('name,matrix', list(instances()))
+def test_mutation_identical(operators, seed, name, matrix):
+    population = random_population(np.random.default_rng(seed), 51, len(matrix))
+    probabilities = None if operators is None else mutation_probabilities(operators)
+
+    reference = PythonBackend().mutation(population.copy(), 0.3, np.random.default_rng(seed), probabilities)
+    vectorized = NumpyBackend().mutation(population.copy(), 0.3, np.random.default_rng(seed), probabilities)
+    assert np.array_equal(reference, vectorized)
+    assert_valid(vectorized, len(matrix))
+
+
+@pytest.mark.parametrize('symmetric', [True, False])
+@pytest.mark.parametrize('operators', OPERATORS)
+def test_mutation_deltas_match_full_evaluation(operators, symmetric):
+    rng = np.random.default_rng(9)
+    matrix = random_matrix(rng, 40) if symmetric else rng.random((40, 40)) * 100
+    population = random_population(rng, 80, 40)
+    probabilities = None if operators is None else mutation_probabilities(operators)
+    plan = mutation_plan(*population.shape, 0.5, rng, probabilities)
+
+    deltas = mutation_deltas(population, *plan, matrix)
+    before = NumpyBackend().fitness(matrix, population)
+    after = NumpyBackend().fitness(matrix, NumpyBackend().mutate(population, *plan))
+    expected = np.zeros(len(population))
+    expected[plan[0]] = deltas
+    assert np.allclose(after - before, expected)
+
+
+def test_cycle_positions_matches_definition():
+    parent1 = np.array([[1, 2, 3, 4, 5, 6, 7, 8]])
+    parent2 = np.array([[8, 5, 2, 1, 3, 6, 4, 7]])
+    # Ciclo a partir da posição 0: 1 -> 8 -> 7 -> 4 -> 1
+    expected = np.array([[True, False, False, True, False, False, True, True]])
+    assert np.array_equal(cycle_positions(parent1, parent2), expected)
+
+
+@pytest.mark.parametrize('mutation_operators', [None, {'swap': 1, 'inversion': 1, 'insertion': 1}])
+@pytest.mark.parametrize('selection_method', ['roulette', 'tournament'])
+@pytest.mark.parametrize('num_populations', [1, 3])
+def test_full_run_identical(selection_method, num_populations, mutation_operators):
+    results = []
+    for backend in ('python', 'numpy'):
+        ga = GeneticAlgorithm(
+            population_size=40, mutation_rate=0.2, crossover_rate=0.8, elitism_count=2,
+            selection_method=selection_method, tournament_size=3, num_populations=num_populations,
+            migration_interval=5, migration_count=1, backend=backend, seed=2024,
+            mutation_operators=mutation_operators, verbose=False
+        )
+        _, best_fitness = ga.run(25)
+        results.append((best_fitness, ga.global_best_tour, [population.copy() for population in ga.populations]))
+
+    (fitness_python, tour_python, populations_python), (fitness_numpy, tour_numpy, populations_numpy) = results
+    assert fitness_python == fitness_numpy
+    assert np.array_equal(tour_python, tour_numpy)
+    for population_python, population_numpy in zip(populations_python, populations_numpy):
+        assert np.array_equal(population_python, population_numpy)
+
+
+def test_random_instance_run_identical():
+    matrix = random_matrix(np.random.default_rng(7), 30)
+    locations = [Location(i, str(i)) for i in range(30)]
+    results = []
+    for backend in ('python', 'numpy'):
+        ga = GeneticAlgorithm(
+            population_size=30, mutation_rate=0.3, crossover_rate=0.9, elitism_count=1,
+            selection_method='tournament', tournament_size=3, locations=locations,
+            distance_matrix=matrix, backend=backend, seed=5, verbose=False
+        )
+        _, best_fitness = ga.run(20)
+        results.append((best_fitness, ga.global_best_tour))
+
+    assert results[0][0] == results[1][0]
+    assert np.array_equal(results[0][1], results[1][1])
+
+
+@pytest.mark.parametrize('parameters', [
+    {'num_populations': 1},
+    {'num_populations': 3, 'island_execution': 'threads'},
+    {'num_populations': 3, 'island_execution': 'stacked'},
+    {'num_populations': 2, 'model': 'steady_state'},
+])
+def test_incremental_fitness_does_not_drift(parameters):
+    rng = np.random.default_rng(11)
+    matrix = rng.random((40, 40)) * 1e4
+    locations = [Location(i, str(i)) for i in range(40)]
+    ga = GeneticAlgorithm(
+        population_size=40, mutation_rate=0.9, crossover_rate=0.2, elitism_count=2,
+        selection_method='tournament', tournament_size=3, locations=locations, distance_matrix=matrix,
+        mutation_operators={'swap': 1, 'inversion': 1, 'insertion': 1}, history_points=None, seed=3,
+        verbose=False, **parameters
+    )
+    _, best_fitness = ga.run(300)
+
+    for population, fitness_values in zip(ga.populations, ga.population_fitness):
+        assert np.allclose(fitness_values, ga.maximum_route_distance_function(population), rtol=0, atol=1e-9)
+    # O melhor é registrado com o fitness recalculado por completo
+    for tour, fitness in zip(ga.best_tours, ga.best_fitnesses):
+        assert fitness == ga.maximum_route_distance_function(tour[None])[0]
+    assert best_fitness == ga.maximum_route_distance_function(ga.global_best_tour[None])[0]
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.backends import PythonBackend, NumpyBackend
+from tsp_genetic_algorithm_ai.initialization import random_tours
+
+
+@pytest.mark.parametrize('backend', [PythonBackend(), NumpyBackend()])
+def test_crossover_into_buffer_matches_copy(backend):
+    population = random_tours(20, 12, np.random.default_rng(0))
+    expected = backend.crossover(population, 0.7, np.random.default_rng(1))
+    out = np.empty_like(population)
+    children = backend.crossover(population, 0.7, np.random.default_rng(1), out=out)
+    assert children is out and np.array_equal(children, expected)
+
+
+@pytest.mark.parametrize('island_execution', ['threads', 'stacked'])
+def test_islands_alternate_between_two_arrays(island_execution):
+    ga = GeneticAlgorithm(20, 0.2, 0.8, 2, selection_method='tournament', tournament_size=3, num_populations=2,
+                          island_execution=island_execution, seed=0, verbose=False)
+    seen = []
+    # Mantém as referências: os ids não podem ser reaproveitados durante o teste
+    ga.run(6, lambda **kwargs: seen.append([population.base if island_execution == 'stacked' else population
+                                            for population in ga.populations]))
+
+    for island in range(2):
+        arrays = [generation[island] for generation in seen]
+        assert len({id(array) for array in arrays}) == 2
+        assert all(current is not previous for current, previous in zip(arrays[1:], arrays[:-1]))
+        assert all(current is before for current, before in zip(arrays[2:], arrays[:-2]))
+
+
+@pytest.mark.parametrize('island_execution', ['threads', 'stacked'])
+def test_best_tours_are_read_only_snapshots(island_execution):
+    ga = GeneticAlgorithm(20, 0.3, 0.8, 1, selection_method='tournament', tournament_size=3, num_populations=2,
+                          island_execution=island_execution, migration_interval=2, seed=1, verbose=False)
+    snapshots = []
+    ga.run(8, lambda **kwargs: snapshots.append((ga.global_best_tour, ga.global_best_tour.copy(),
+                                                  list(ga.best_tours))))
+
+    for tour, copy, best_tours in snapshots:
+        # As rotas registradas não mudam com as gerações seguintes
+        assert np.array_equal(tour, copy)
+        for best in [tour, *best_tours]:
+            assert not best.flags.writeable
+            with pytest.raises(ValueError):
+                best[1] = best[2]
+    for best in ga.best_tours:
+        assert not any(np.shares_memory(best, population) for population in ga.populations)
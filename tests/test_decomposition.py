@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.Location import Location
+from tsp_genetic_algorithm_ai.decomposition import CLUSTER_PARAMETERS, solve_cluster, solve_decomposed
+from tsp_genetic_algorithm_ai.distance_matrix import build_distance_matrix, paired_distances
+
+
+def coordinate_instance(metric, size=150, seed=0):
+    scale = 100 if metric == 'euclidean' else 5
+    points = np.random.default_rng(seed).random((size, 2)) * scale
+    return [Location(i, f"Local {i}", *point) for i, point in enumerate(points)], points
+
+
+@pytest.mark.parametrize('metric', ['euclidean', 'haversine'])
+def test_paired_distances_match_matrix(metric):
+    locations, points = coordinate_instance(metric, size=20)
+    matrix = build_distance_matrix(locations, metric)
+    origins, destinations = np.random.default_rng(1).integers(0, 20, (2, 50))
+    assert np.allclose(paired_distances(points[origins], points[destinations], metric),
+                       matrix[origins, destinations])
+    # Destino único aplicado a todas as origens
+    assert np.allclose(paired_distances(points, points[3], metric), matrix[:, 3])
+
+
+@pytest.mark.parametrize('metric', ['euclidean', 'haversine'])
+def test_merged_tour_is_valid_permutation(metric):
+    locations, points = coordinate_instance(metric)
+    result = solve_decomposed(locations, metric, cluster_size=50, generations=30, max_workers=1, seed=0)
+
+    assert result["clusters"] > 1
+    tour = result["tour"]
+    assert tour[0] == tour[-1] == 0
+    assert sorted(tour[:-1]) == list(range(len(locations)))
+    assert [location.id for location in result["route"].locations] == tour
+    indices = np.array(tour)
+    assert np.isclose(result["distance"], paired_distances(points[indices[:-1]], points[indices[1:]], metric).sum())
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_decomposition_close_to_undecomposed(seed):
+    locations, points = coordinate_instance('euclidean', seed=seed)
+    result = solve_decomposed(locations, 'euclidean', cluster_size=50, generations=30, max_workers=1, seed=0)
+
+    # Mesmo pipeline (vizinho mais próximo + GA + 2-opt) sobre a instância inteira
+    cycle = solve_cluster(points, 'euclidean', 30, CLUSTER_PARAMETERS, 0)
+    cycle = np.r_[cycle, cycle[0]]
+    undecomposed = paired_distances(points[cycle[:-1]], points[cycle[1:]], 'euclidean').sum()
+    assert result["distance"] <= 1.1 * undecomposed
@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.distance_matrix import EARTH_RADIUS_KM, euclidean_matrix, haversine_matrix
+
+
+def reference_haversine(a, b):
+    latitude_a, longitude_a, latitude_b, longitude_b = map(math.radians, (*a, *b))
+    h = (math.sin((latitude_b - latitude_a) / 2) ** 2
+         + math.cos(latitude_a) * math.cos(latitude_b) * math.sin((longitude_b - longitude_a) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(h, 1.0)))
+
+
+def random_coordinates(n, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(-80, 80, n), rng.uniform(-180, 180, n)])
+
+
+# Blocos menores que n, que não dividem n, e um único bloco
+@pytest.mark.parametrize('block_size', [1, 7, 64])
+def test_haversine_matrix_matches_scalar_reference(block_size):
+    coordinates = random_coordinates(23, block_size)
+    matrix = haversine_matrix(coordinates, block_size=block_size)
+    expected = [[reference_haversine(a, b) for b in coordinates] for a in coordinates]
+    assert matrix.shape == (23, 23)
+    assert np.allclose(matrix, expected, rtol=1e-9, atol=1e-6)
+    assert np.array_equal(np.diag(matrix), np.zeros(23))
+
+
+def test_haversine_matrix_known_distances():
+    # Quarto de meridiano e pontos antipodais
+    coordinates = np.array([[0.0, 0.0], [90.0, 0.0], [0.0, 180.0]])
+    matrix = haversine_matrix(coordinates)
+    assert matrix[0, 1] == pytest.approx(math.pi / 2 * EARTH_RADIUS_KM)
+    assert matrix[0, 2] == pytest.approx(math.pi * EARTH_RADIUS_KM)
+
+
+@pytest.mark.parametrize('block_size', [1, 7, 64])
+def test_euclidean_matrix_matches_scalar_reference(block_size):
+    coordinates = np.random.default_rng(block_size).normal(scale=100, size=(23, 2))
+    matrix = euclidean_matrix(coordinates, block_size=block_size)
+    expected = [[math.dist(a, b) for b in coordinates] for a in coordinates]
+    assert np.allclose(matrix, expected, rtol=1e-12, atol=1e-9)
+    assert np.array_equal(matrix, matrix.T)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.diversity import PopulationDiversity
+from tsp_genetic_algorithm_ai.initialization import random_tours
+
+
+def recount(tours, num_locations):
+    # Contagem completa das arestas não direcionadas, sem estado
+    counts = np.zeros((num_locations, num_locations), dtype=np.int64)
+    low = np.minimum(tours[:, :-1], tours[:, 1:]).ravel()
+    high = np.maximum(tours[:, :-1], tours[:, 1:]).ravel()
+    np.add.at(counts, (low, high), 1)
+    return counts
+
+
+def assert_matches_recount(tracker, tours):
+    fresh = PopulationDiversity(tracker.num_locations)
+    fresh.update(tours)
+    assert np.array_equal(tracker.edge_counts, recount(tours, tracker.num_locations))
+    assert np.isclose(tracker.sum_squares, fresh.sum_squares)
+    assert np.isclose(tracker.sum_x_log_x, fresh.sum_x_log_x)
+    assert tracker.unique_tours() == len({tour.tobytes() for tour in tours})
+    for name, value in fresh.metrics().items():
+        assert np.isclose(tracker.metrics()[name], value)
+
+
+def test_row_updates_match_full_recount():
+    rng = np.random.default_rng(0)
+    tours = random_tours(30, 15, rng)
+    tracker = PopulationDiversity(15)
+    tracker.update(tours)
+
+    for _ in range(50):
+        rows = rng.choice(30, 4, replace=False)
+        # Algumas posições recebem cópias de outras (duplicatas), outras rotas novas
+        tours[rows[:2]] = tours[rng.integers(0, 30, 2)]
+        tours[rows[2:]] = random_tours(2, 15, rng)
+        assert tracker.update(tours, rows) <= 4
+        assert_matches_recount(tracker, tours)
+
+    # Sem rows todas as posições são comparadas
+    tours[::3] = random_tours(10, 15, rng)
+    tracker.update(tours)
+    assert_matches_recount(tracker, tours)
+
+
+@pytest.mark.parametrize('parameters', [
+    {'model': 'steady_state', 'restart': 'reseed', 'restart_stagnation': 5},
+    {'model': 'generational', 'restart': 'mutation_burst', 'restart_stagnation': 5},
+])
+def test_engine_trackers_match_full_recount(parameters):
+    ga = GeneticAlgorithm(population_size=30, mutation_rate=0.3, crossover_rate=0.8, elitism_count=2,
+                          selection_method='tournament', tournament_size=3, num_populations=2, migration_interval=3,
+                          track_diversity=True, seed=1, verbose=False, **parameters)
+    ga.run(40)
+    assert sum(ga.stagnation_monitor.counts) > 0
+    for tracker, population in zip(ga.diversity_trackers, ga.populations):
+        assert_matches_recount(tracker, population)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.duplicates import TourFingerprint, duplicate_mask
+from tsp_genetic_algorithm_ai.initialization import random_tours
+
+
+def test_fingerprint_separates_distinct_tours():
+    tours = random_tours(200, 12, np.random.default_rng(0))
+    fingerprint = TourFingerprint(12, 13, symmetric=False)
+    distinct = len({tour.tobytes() for tour in tours})
+    assert len(np.unique(fingerprint(tours))) == distinct
+
+
+def test_symmetric_fingerprint_ignores_direction():
+    tours = random_tours(20, 10, np.random.default_rng(1))
+    reversed_tours = tours[:, ::-1].copy()
+    assert np.array_equal(TourFingerprint(10, 11)(tours), TourFingerprint(10, 11)(reversed_tours))
+    directed = TourFingerprint(10, 11, symmetric=False)
+    assert not np.array_equal(directed(tours), directed(reversed_tours))
+
+
+def test_rotation_fingerprint_ignores_starting_point():
+    cycle = np.random.default_rng(2).permutation(9)
+    rotations = np.array([np.roll(cycle, shift) for shift in range(9)])
+    fingerprint = TourFingerprint(9, 9, symmetric=False, rotation=True)
+    assert len(np.unique(fingerprint(rotations))) == 1
+
+    closed = np.hstack([rotations, rotations[:, :1]])
+    assert len(np.unique(TourFingerprint(9, 10, rotation=True)(closed))) == 1
+
+
+def test_duplicate_mask_keeps_first_occurrence():
+    mask = duplicate_mask(np.array([5, 3, 5, 7, 3, 5], dtype=np.uint64))
+    assert mask.tolist() == [False, False, True, False, True, True]
+
+
+@pytest.mark.parametrize('duplicate_control', ['perturb', 'replace'])
+def test_eliminate_duplicates_keeps_valid_tours(duplicate_control):
+    ga = GeneticAlgorithm(20, 0.2, 0.8, 1, duplicate_control=duplicate_control, seed=0, verbose=False)
+    num_locations = len(ga.locations)
+    tours = random_tours(5, num_locations, np.random.default_rng(3))
+    population = np.vstack([tours, tours, tours[:2]])
+
+    replaced = ga.eliminate_duplicates(population, np.random.default_rng(4))
+    assert replaced.tolist() == list(range(5, 12))
+    assert np.array_equal(population[:5], tours)
+    assert np.all(population[:, 0] == 0) and np.all(population[:, -1] == 0)
+    assert np.all(np.sort(population[:, 1:-1], axis=1) == np.arange(1, num_locations))
+    assert not duplicate_mask(ga.fingerprint(population)).any()
+
+
+@pytest.mark.parametrize('model', ['generational', 'steady_state'])
+def test_engine_with_duplicate_control_tracks_fitness(model):
+    ga = GeneticAlgorithm(30, 0.2, 0.8, 2, selection_method='tournament', tournament_size=3,
+                          duplicate_control='replace', model=model, seed=5, verbose=False)
+    ga.run(20)
+    population = ga.populations[0]
+    assert np.allclose(ga.population_fitness[0], ga.fitness(population))
+    if model == 'steady_state':
+        # Um filho repetido nunca entra na população
+        assert not duplicate_mask(ga.fingerprint(population)).any()
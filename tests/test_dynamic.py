@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.Location import Location
+from tsp_genetic_algorithm_ai.distance_matrix import build_distance_matrix
+from tsp_genetic_algorithm_ai.dynamic import DistanceBuffer
+
+
+def coordinate_ga(metric, detour_factor=1.0, size=20, **parameters):
+    points = np.random.default_rng(1).random((size, 2))
+    locations = [Location(i, f"Local {i}", *point) for i, point in enumerate(points)]
+    ga = GeneticAlgorithm(**{
+        'population_size': 20, 'mutation_rate': 0.2, 'crossover_rate': 0.8, 'elitism_count': 2,
+        'selection_method': 'tournament', 'tournament_size': 3, 'seed': 0, 'verbose': False, **parameters
+    }, locations=locations, distance_matrix=build_distance_matrix(locations, metric, detour_factor),
+        metric=metric, detour_factor=detour_factor)
+    return ga, locations
+
+
+def assert_consistent(ga):
+    num_locations = len(ga.locations)
+    for population in ga.populations:
+        assert np.all(population[:, 0] == 0) and np.all(population[:, -1] == 0)
+        assert np.all(np.sort(population[:, 1:-1], axis=1) == np.arange(1, num_locations))
+    tour = ga.global_best_tour
+    distance = ga.distance_matrix[tour[:-1], tour[1:]].sum()
+    assert np.isclose(ga.fitness_distance(ga.global_best_fitness), distance)
+
+
+@pytest.mark.parametrize('metric', ['euclidean', 'haversine'])
+def test_add_location_during_run_uses_instance_metric(metric):
+    ga, locations = coordinate_ga(metric, detour_factor=1.3)
+    new = Location(100, "Novo", 0.5, 0.5)
+
+    def callback(generation, **kwargs):
+        if generation == 2:
+            ga.add_location(new)
+
+    ga.run(5, callback)
+
+    assert len(ga.locations) == 21 and ga.locations[-1] is new
+    expected = build_distance_matrix(locations + [new], metric, 1.3)
+    assert np.allclose(ga.distance_matrix, expected)
+    assert_consistent(ga)
+
+
+def test_remove_location_during_run():
+    ga, _ = coordinate_ga('euclidean')
+
+    def callback(generation, **kwargs):
+        if generation == 2:
+            ga.remove_location(5)
+
+    ga.run(5, callback)
+
+    assert 5 not in ga.location_index and len(ga.locations) == 19
+    assert_consistent(ga)
+
+
+def test_add_location_rejected_before_run():
+    # Instância padrão: distâncias explícitas, sem coordenadas
+    ga = GeneticAlgorithm(20, 0.2, 0.8, 2, seed=0, verbose=False)
+    with pytest.raises(ValueError):
+        ga.add_location(Location(99, "Novo", -19.9, -47.9))
+    with pytest.raises(ValueError):
+        ga.add_location(Location(99, "Novo"), distances={ga.locations[0].id: 1.0})
+    assert ga.pending_changes == []
+    ga.run(3)
+
+    coordinates, _ = coordinate_ga('euclidean')
+    with pytest.raises(ValueError):
+        coordinates.add_location(Location(99, "Sem coordenadas"))
+    with pytest.raises(ValueError):
+        coordinates.remove_location(0)
+
+
+def test_remove_location_validates_id():
+    ga, _ = coordinate_ga('euclidean')
+    with pytest.raises(ValueError):
+        ga.remove_location(999)
+    ga.remove_location(3)
+    with pytest.raises(ValueError):
+        ga.remove_location(3)
+    # Um local com inclusão pendente pode ser removido
+    ga.add_location(Location(50, "Novo", 0.2, 0.3))
+    ga.remove_location(50)
+    assert [change[0] for change in ga.pending_changes] == ['remove', 'add', 'remove']
+
+    ga.run(2)
+    assert 3 not in ga.location_index and 50 not in ga.location_index and len(ga.locations) == 19
+    assert_consistent(ga)
+
+
+def test_distance_buffer_reserves_only_pending_additions():
+    ga, _ = coordinate_ga('euclidean', size=40)
+    ga.add_location(Location(100, "Novo", 0.5, 0.5))
+    ga.add_location(Location(101, "Novo", 0.1, 0.9))
+    ga.run(2)
+    assert ga.distance_buffer.buffer.shape == (42, 42)
+
+    # Depois de cheio, cresce por um fator pequeno
+    buffer = DistanceBuffer(np.ones((40, 40)))
+    for _ in range(3):
+        buffer.add(np.ones(buffer.size), np.ones(buffer.size))
+    assert buffer.size == 43 and buffer.buffer.shape == (50, 50)
+    assert np.array_equal(buffer.matrix[:40, :40], np.ones((40, 40)))
+
+
+def test_history_keeps_distances_across_location_changes():
+    ga, _ = coordinate_ga('euclidean')
+    distances, references = [], []
+
+    def callback(generation, **kwargs):
+        distances.append(ga.fitness_distance(ga.global_best_fitness))
+        references.append(ga.fitness_reference)
+        if generation == 3:
+            ga.add_location(Location(100, "Novo", 0.5, 0.5))
+        if generation == 6:
+            ga.remove_location(5)
+
+    ga.run(9, callback)
+
+    # A referência do fitness muda, mas os pontos antigos do histórico continuam na mesma escala (distância)
+    assert len(set(references)) > 1
+    arrays = ga.history.arrays()
+    assert np.array_equal(arrays["first"], np.arange(1, 10))
+    assert np.allclose(arrays["minimum"][:, 0], distances)
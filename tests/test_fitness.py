@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.Location import Location
+from tsp_genetic_algorithm_ai.distance_matrix import build_distance_matrix
+from tsp_genetic_algorithm_ai.solver import solve
+
+
+def large_haversine_instance(size=100, seed=0):
+    # Pontos espalhados pelo Brasil: as rotas têm dezenas de milhares de km
+    rng = np.random.default_rng(seed)
+    points = np.column_stack((rng.uniform(-30, -5, size), rng.uniform(-60, -35, size)))
+    locations = [Location(i, f"Local {i}", *point) for i, point in enumerate(points)]
+    return locations, build_distance_matrix(locations)
+
+
+@pytest.mark.parametrize('selection_method', ['roulette', 'tournament'])
+def test_large_coordinate_instance_has_non_negative_fitness(selection_method):
+    locations, distance_matrix = large_haversine_instance()
+    ga = GeneticAlgorithm(50, 0.2, 0.8, 2, selection_method=selection_method, tournament_size=3,
+                          locations=locations, distance_matrix=distance_matrix, seed=0, verbose=False)
+    received = []
+    _, best_fitness = ga.run(5, lambda global_best_distance, **kwargs: received.append(global_best_distance))
+
+    tour = ga.global_best_tour
+    distance = distance_matrix[tour[:-1], tour[1:]].sum()
+    assert distance > 1000
+    assert np.isclose(ga.fitness_distance(best_fitness), distance)
+    assert np.isclose(received[-1], distance)
+    for population in ga.populations:
+        assert np.all(ga.fitness(population) >= 0)
+
+
+def test_fitness_reference_bounds_any_split():
+    locations, distance_matrix = large_haversine_instance(30, 1)
+    demands = np.ones(30)
+    demands[0] = 0
+    ga = GeneticAlgorithm(20, 0.2, 0.8, 1, locations=locations, distance_matrix=distance_matrix,
+                          demands=demands, vehicle_capacity=1, seed=0, verbose=False)
+    # Um veículo por local: o pior particionamento possível
+    tours = np.array([np.r_[0, np.random.default_rng(i).permutation(np.arange(1, 30)), 0] for i in range(5)])
+    assert np.all(ga.fitness(tours) >= 0)
+    ga.run(3)
+
+
+def test_solve_reports_distance_on_large_instance():
+    locations, distance_matrix = large_haversine_instance(60, 2)
+    result = solve(locations, 0.5, distance_matrix=distance_matrix, seed=0,
+                   parameters={"selection_method": "roulette"})
+    tour = np.array(result["tour"])
+    assert np.isclose(result["distance"], distance_matrix[tour[:-1], tour[1:]].sum())
@@ -0,0 +1,58 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.Location import Location
+from tsp_genetic_algorithm_ai.held_karp import held_karp, held_karp_memory
+
+
+def enumerate_optimum(matrix, depot=0):
+    # Todas as permutações dos locais, com o depósito fixo nas pontas
+    stops = [i for i in range(len(matrix)) if i != depot]
+    return min(sum(matrix[a, b] for a, b in zip((depot, *order), (*order, depot)))
+               for order in itertools.permutations(stops))
+
+
+def random_matrix(rng, n, symmetric):
+    if symmetric:
+        points = rng.random((n, 2)) * 100
+        return np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    matrix = rng.random((n, n)) * 100
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+@pytest.mark.parametrize('symmetric', [True, False])
+@pytest.mark.parametrize('n', [1, 2, 3, 5, 8])
+def test_held_karp_matches_enumeration(n, symmetric):
+    rng = np.random.default_rng(n)
+    for _ in range(3):
+        matrix = random_matrix(rng, n, symmetric)
+        distance, tour = held_karp(matrix)
+        assert tour[0] == tour[-1] == 0 and sorted(tour[:-1].tolist()) == list(range(n))
+        assert np.isclose(distance, matrix[tour[:-1], tour[1:]].sum())
+        assert np.isclose(distance, enumerate_optimum(matrix))
+
+
+def test_held_karp_other_depot():
+    matrix = random_matrix(np.random.default_rng(0), 7, False)
+    distance, tour = held_karp(matrix, depot=3)
+    assert tour[0] == tour[-1] == 3
+    assert np.isclose(distance, enumerate_optimum(matrix, depot=3))
+
+
+def test_held_karp_memory_limit():
+    with pytest.raises(MemoryError):
+        held_karp(np.zeros((12, 12)), max_memory=held_karp_memory(12) - 1)
+
+
+def test_engine_uses_exact_solver_for_small_instances():
+    matrix = random_matrix(np.random.default_rng(5), 8, True)
+    locations = [Location(i, str(i)) for i in range(8)]
+    ga = GeneticAlgorithm(20, 0.2, 0.8, 1, locations=locations, distance_matrix=matrix, solver='auto',
+                          seed=0, verbose=False)
+    assert ga.use_exact_solver()
+    _, best_fitness = ga.run(50)
+    assert np.isclose(ga.fitness_distance(best_fitness), enumerate_optimum(matrix))
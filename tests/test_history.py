@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.history import ConvergenceHistory
+
+
+@pytest.mark.parametrize('generations', [5, 8, 9, 37, 1000])
+def test_decimation_keeps_extremes_of_each_interval(generations):
+    rng = np.random.default_rng(generations)
+    values = rng.normal(size=(generations, 3))
+    history = ConvergenceHistory(3, max_points=8)
+    for generation, row in enumerate(values, start=1):
+        history.append(generation, row)
+
+    arrays = history.arrays()
+    assert len(history) <= 8
+    # Os intervalos cobrem todas as gerações, em ordem e sem sobreposição
+    assert arrays["first"][0] == 1 and arrays["last"][-1] == generations
+    assert np.array_equal(arrays["first"][1:], arrays["last"][:-1] + 1)
+    for first, last, minimum, maximum in zip(arrays["first"], arrays["last"], arrays["minimum"], arrays["maximum"]):
+        interval = values[first - 1:last]
+        assert np.array_equal(minimum, interval.min(axis=0))
+        assert np.array_equal(maximum, interval.max(axis=0))
+    # Mínimo e máximo globais nunca se perdem
+    assert np.array_equal(arrays["minimum"].min(axis=0), values.min(axis=0))
+    assert np.array_equal(arrays["maximum"].max(axis=0), values.max(axis=0))
+
+
+def test_history_without_decimation_keeps_every_generation():
+    history = ConvergenceHistory(1, max_points=16)
+    for generation in range(1, 11):
+        history.append(generation, [float(generation)])
+    arrays = history.arrays()
+    assert np.array_equal(arrays["first"], np.arange(1, 11))
+    assert np.array_equal(arrays["minimum"][:, 0], arrays["maximum"][:, 0])
+
+    history.clear()
+    assert len(history) == 0
+
+
+@pytest.mark.parametrize('max_points', [0, 1, 7])
+def test_invalid_max_points(max_points):
+    with pytest.raises(ValueError):
+        ConvergenceHistory(1, max_points)
+
+
+def test_engine_history_is_bounded():
+    ga = GeneticAlgorithm(20, 0.2, 0.8, 1, num_populations=2, history_points=16, seed=0, verbose=False)
+    histories = []
+    ga.run(100, lambda history, **kwargs: histories.append(history))
+
+    arrays = histories[-1].arrays()
+    assert len(arrays["first"]) <= 16 and arrays["last"][-1] == 100
+    # Séries: melhor distância global seguida da melhor de cada população
+    assert arrays["maximum"].shape[1] == 3
+    assert arrays["minimum"][-1, 0] == ga.fitness_distance(ga.global_best_fitness)
+    assert np.all(arrays["minimum"][:, 0] <= arrays["minimum"][:, 1:].min(axis=1))
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tsp_genetic_algorithm_ai.distances_map import get_distances_table
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Tempo máximo (µs) de importação do núcleo do solver, descontado o próprio NumPy
+CORE_IMPORT_BUDGET_US = 150_000
+
+# Módulos que só podem ser carregados quando a funcionalidade correspondente é usada
+LAZY_MODULES = ("tkinter", "matplotlib", "sqlite3", "multiprocessing")
+
+
+def import_times(module):
+    """Importa o módulo em um interpretador novo com -X importtime e retorna {módulo: (self, acumulado)}."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(SRC), os.environ.get("PYTHONPATH", "")])}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env, check=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+@pytest.mark.parametrize("module", ["tsp_genetic_algorithm_ai.GeneticAlgorithm", "tsp_genetic_algorithm_ai.main"])
+def test_core_import_does_not_load_gui_or_optional_modules(module):
+    loaded = {name.split(".")[0] for name in import_times(module)}
+    assert not loaded & set(LAZY_MODULES)
+
+
+@pytest.mark.skipif(not os.environ.get("TSP_TIMING_TESTS"),
+                    reason="medição de tempo depende da máquina: defina TSP_TIMING_TESTS=1 para executar")
+def test_core_import_within_budget():
+    times = import_times("tsp_genetic_algorithm_ai.GeneticAlgorithm")
+    core = times["tsp_genetic_algorithm_ai.GeneticAlgorithm"][1] - times["numpy"][1]
+    assert core < CORE_IMPORT_BUDGET_US, f"Importação do núcleo levou {core / 1000:.1f} ms"
+
+
+def test_distances_table_built_once():
+    assert get_distances_table() is get_distances_table()
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.initialization import (STRATEGIES, close_tours, greedy_edge_tour, initial_population,
+                                                     nearest_neighbor_tours, random_insertion_tour, random_tours,
+                                                     space_filling_curve_tour)
+
+
+def coordinate_instance(n=40, seed=0):
+    points = np.random.default_rng(seed).random((n, 2)) * 100
+    return points, np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+
+
+def cycle_length(cycle, matrix):
+    return matrix[cycle, np.roll(cycle, -1)].sum()
+
+
+def assert_cycle(cycle, n):
+    assert sorted(np.asarray(cycle).tolist()) == list(range(n))
+
+
+def test_nearest_neighbor_follows_closest_unvisited():
+    points, matrix = coordinate_instance(15)
+    cycles = nearest_neighbor_tours(matrix, [0, 4, 9])
+    for start, cycle in zip([0, 4, 9], cycles):
+        assert cycle[0] == start
+        assert_cycle(cycle, 15)
+        for step in range(1, 15):
+            unvisited = np.setdiff1d(np.arange(15), cycle[:step])
+            assert matrix[cycle[step - 1], cycle[step]] == matrix[cycle[step - 1], unvisited].min()
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_heuristics_are_valid_and_beat_random(seed):
+    points, matrix = coordinate_instance(seed=seed)
+    rng = np.random.default_rng(seed)
+    random_length = np.mean([cycle_length(tour[:-1], matrix) for tour in random_tours(20, 40, rng)])
+
+    cycles = [nearest_neighbor_tours(matrix, [0])[0], greedy_edge_tour(matrix),
+              space_filling_curve_tour(points), random_insertion_tour(matrix, rng)]
+    for cycle in cycles:
+        assert_cycle(cycle, 40)
+        assert cycle_length(cycle, matrix) < 0.5 * random_length
+
+
+def test_close_tours_rotates_depot_to_ends():
+    cycles = np.array([[3, 1, 0, 2], [0, 2, 3, 1]])
+    assert close_tours(cycles).tolist() == [[0, 2, 3, 1, 0], [0, 2, 3, 1, 0]]
+
+
+@pytest.mark.parametrize('strategies', [None, {'nearest_neighbor': 0.2, 'greedy_edge': 0.1,
+                                               'space_filling_curve': 0.1, 'random_insertion': 0.1},
+                                        {strategy: 0.25 for strategy in STRATEGIES}])
+def test_initial_population_is_valid(strategies):
+    points, matrix = coordinate_instance()
+    population = initial_population(matrix, 30, np.random.default_rng(1), strategies, points)
+    assert population.shape == (30, 41)
+    assert np.all(population[:, 0] == 0) and np.all(population[:, -1] == 0)
+    assert np.all(np.sort(population[:, 1:-1], axis=1) == np.arange(1, 40))
+
+
+@pytest.mark.parametrize('strategies, coordinates', [
+    ({'unknown': 0.5}, None),
+    ({'nearest_neighbor': 0.7, 'random_insertion': 0.5}, None),
+    ({'space_filling_curve': 0.5}, None),
+])
+def test_initial_population_rejects_invalid_strategies(strategies, coordinates):
+    _, matrix = coordinate_instance(10)
+    with pytest.raises(ValueError):
+        initial_population(matrix, 10, np.random.default_rng(0), strategies, coordinates)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+
+
+def run_islands(island_execution, **parameters):
+    ga = GeneticAlgorithm(**{
+        'population_size': 40, 'mutation_rate': 0.2, 'crossover_rate': 0.8, 'elitism_count': 2,
+        'selection_method': 'tournament', 'tournament_size': 3, 'num_populations': 4,
+        'migration_interval': 3, 'migration_count': 2, 'seed': 5, 'verbose': False,
+        'island_execution': island_execution, **parameters
+    })
+    fitnesses = []
+    ga.run(20, lambda global_best_fitness, **kwargs: fitnesses.append(global_best_fitness))
+    return ga, fitnesses
+
+
+@pytest.mark.parametrize('parameters', [
+    {},
+    {'population_size': 41},
+    {'duplicate_control': 'replace', 'mutation_operators': {'swap': 1, 'insertion': 1}},
+    {'adaptive': True, 'selection_method': 'roulette'},
+])
+def test_stacked_matches_threads(parameters):
+    threads, threads_fitnesses = run_islands('threads', **parameters)
+    stacked, stacked_fitnesses = run_islands('stacked', **parameters)
+
+    assert threads_fitnesses == stacked_fitnesses
+    assert np.array_equal(threads.global_best_tour, stacked.global_best_tour)
+    for population_threads, population_stacked in zip(threads.populations, stacked.populations):
+        assert np.array_equal(population_threads, population_stacked)
+    # As populações são vistas do array único
+    assert all(population.base is stacked.population_stack for population in stacked.populations)
+    assert np.allclose(np.stack(stacked.population_fitness), [stacked.fitness(p) for p in stacked.populations])
+
+
+def test_stacked_requires_generational_model():
+    with pytest.raises(ValueError):
+        GeneticAlgorithm(population_size=10, mutation_rate=0.1, crossover_rate=0.8, num_populations=2,
+                         model='steady_state', island_execution='stacked')
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.Location import Location
+from tsp_genetic_algorithm_ai.distance_matrix import candidate_lists, euclidean_matrix
+from tsp_genetic_algorithm_ai.held_karp import held_karp
+from tsp_genetic_algorithm_ai.initialization import close_tours, nearest_neighbor_tours
+from tsp_genetic_algorithm_ai.local_search import tour_length, two_opt
+from tsp_genetic_algorithm_ai.lower_bound import held_karp_bound, start_lower_bound
+
+
+def random_matrix(rng, n, symmetric):
+    if symmetric:
+        return euclidean_matrix(rng.random((n, 2)))
+    matrix = rng.random((n, n))
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+def seeded_ga(size=40, seed=0, **parameters):
+    # Semeada com vizinho mais próximo + 2-opt: a rota inicial já está perto do limite inferior
+    matrix = euclidean_matrix(np.random.default_rng(seed).random((size, 2)))
+    cycle = two_opt(nearest_neighbor_tours(matrix, [0])[0], matrix, candidate_lists(matrix))
+    locations = [Location(i, str(i)) for i in range(size)]
+    return GeneticAlgorithm(20, 0.2, 0.8, 2, selection_method='tournament', tournament_size=3, locations=locations,
+                            distance_matrix=matrix, initial_tours=close_tours(cycle[None]), seed=seed,
+                            verbose=False, **parameters)
+
+
+@pytest.mark.parametrize('symmetric', [True, False])
+@pytest.mark.parametrize('n', [4, 6, 9, 12])
+def test_bound_never_exceeds_optimum(n, symmetric):
+    rng = np.random.default_rng(n)
+    for _ in range(3):
+        matrix = random_matrix(rng, n, symmetric)
+        optimum, _ = held_karp(matrix)
+        bound = held_karp_bound(matrix)
+        assert bound <= optimum + 1e-9
+        if symmetric:
+            # A 1-árvore com subgradiente fica perto do ótimo em instâncias euclidianas
+            assert bound >= 0.8 * optimum
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_two_opt_never_lengthens_tour(seed):
+    rng = np.random.default_rng(seed)
+    matrix = random_matrix(rng, 60, True)
+    neighbors = candidate_lists(matrix)
+    for cycle in [rng.permutation(60), nearest_neighbor_tours(matrix, [0])[0]]:
+        improved = two_opt(cycle, matrix, neighbors)
+        assert sorted(improved.tolist()) == list(range(60))
+        assert tour_length(improved, matrix) <= tour_length(cycle, matrix) + 1e-9
+
+
+def test_background_bound_matches_in_process():
+    matrix = random_matrix(np.random.default_rng(0), 30, True)
+    future, executor = start_lower_bound(matrix)
+    try:
+        # O processo do limite é iniciado com spawn, não com fork
+        assert executor._mp_context.get_start_method() == 'spawn'
+        assert future.result(timeout=60) == held_karp_bound(matrix)
+    finally:
+        executor.shutdown()
+    assert start_lower_bound(matrix, background=False) == (held_karp_bound(matrix), None)
+
+
+def test_gap_is_non_negative():
+    ga = seeded_ga(lower_bound='sync')
+    gaps = []
+    ga.run(10, lambda **kwargs: gaps.append(ga.gap()))
+    assert all(gap is not None and gap >= 0 for gap in gaps)
+    assert ga.fitness_distance(ga.global_best_fitness) >= ga.lower_bound
+
+
+@pytest.mark.parametrize('lower_bound', ['sync', 'background'])
+def test_target_gap_stops_run_early(lower_bound):
+    ga = seeded_ga(lower_bound=lower_bound, target_gap=0.5, deadline=60)
+    ga.run(10 ** 6)
+    assert ga.generations_run < 10 ** 6
+    assert ga.gap() <= 0.5
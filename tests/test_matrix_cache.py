@@ -0,0 +1,90 @@
+import os
+import time
+
+import numpy as np
+
+from tsp_genetic_algorithm_ai import distance_matrix, distances_map
+from tsp_genetic_algorithm_ai.distance_matrix import build_distance_matrix
+from tsp_genetic_algorithm_ai.matrix_cache import STALE_TEMP_SECONDS, DistanceMatrixCache, location_fingerprint
+from tsp_genetic_algorithm_ai.mock_data import get_mock_data
+
+
+def test_explicit_cache_follows_table_values(monkeypatch, tmp_path):
+    locations = get_mock_data()[:5]
+    cache = DistanceMatrixCache(tmp_path)
+    original_key = location_fingerprint(locations, 'explicit')
+    original = np.array(build_distance_matrix(locations, 'explicit', cache=cache))
+    assert np.array_equal(build_distance_matrix(locations, 'explicit', cache=cache), original)
+
+    # Edita um valor da tabela explícita
+    table = dict(distances_map.get_distances_table())
+    table[(locations[0].name, locations[1].name)] += 1.0
+    monkeypatch.setattr(distances_map, "get_distances_table", lambda: table)
+    monkeypatch.setattr(distance_matrix, "get_distances_table", lambda: table)
+    distances_map.get_distances_table_digest.cache_clear()
+    try:
+        assert location_fingerprint(locations, 'explicit') != original_key
+        edited = build_distance_matrix(locations, 'explicit', cache=cache)
+    finally:
+        distances_map.get_distances_table_digest.cache_clear()
+
+    assert edited[0, 1] == original[0, 1] + 1.0
+
+
+def counting_builder(calls):
+    def builder(locations, metric, detour_factor):
+        calls.append(metric)
+        return build_distance_matrix(locations, metric, detour_factor)
+    return builder
+
+
+def test_hit_after_miss_returns_read_only_memory_map(tmp_path):
+    locations = get_mock_data()[:6]
+    cache = DistanceMatrixCache(tmp_path)
+    calls = []
+    first = cache.get_or_build(locations, 'explicit', builder=counting_builder(calls))
+    second = cache.get_or_build(locations, 'explicit', builder=counting_builder(calls))
+
+    assert calls == ['explicit']
+    assert np.array_equal(first, second)
+    for matrix in (first, second):
+        assert isinstance(matrix, np.memmap) and not matrix.flags.writeable
+    assert np.array_equal(second, build_distance_matrix(locations, 'explicit'))
+
+
+def test_least_recently_used_entry_evicted(tmp_path):
+    matrix = np.ones((10, 10))
+    cache = DistanceMatrixCache(tmp_path)
+    cache.put("a", matrix)
+    cache.put("b", 2 * matrix)
+    # Cabem exatamente duas entradas
+    cache.max_bytes = 2 * cache.path("a").stat().st_size
+    # "a" fica mais recente que "b" ao ser lido
+    os.utime(cache.path("a"), (1000, 1000))
+    os.utime(cache.path("b"), (2000, 2000))
+    cache.get("a")
+
+    cache.put("c", 3 * matrix)
+    assert cache.get("b") is None
+    assert cache.get("a")[0, 0] == 1 and cache.get("c")[0, 0] == 3
+
+
+def test_matrix_larger_than_limit_not_cached(tmp_path):
+    cache = DistanceMatrixCache(tmp_path, max_bytes=100)
+    matrix = np.arange(100.0).reshape(10, 10)
+    result = cache.put("big", matrix)
+    assert not isinstance(result, np.memmap) and np.array_equal(result, matrix)
+    assert cache.get("big") is None and list(tmp_path.iterdir()) == []
+
+
+def test_stale_temporary_files_removed(tmp_path):
+    cache = DistanceMatrixCache(tmp_path)
+    stale, recent = tmp_path / "stale.tmp", tmp_path / "recent.tmp"
+    stale.write_bytes(b"partial")
+    recent.write_bytes(b"partial")
+    old = time.time() - 2 * STALE_TEMP_SECONDS
+    os.utime(stale, (old, old))
+
+    cache.put("a", np.ones((3, 3)))
+    # Um temporário recente pode ser a gravação em andamento de outro processo
+    assert not stale.exists() and recent.exists()
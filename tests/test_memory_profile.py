@@ -0,0 +1,31 @@
+import json
+import tracemalloc
+
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.memory_profile import MemoryProfiler
+
+
+@pytest.mark.parametrize('island_execution', ['threads', 'stacked'])
+def test_profiled_generations_exported(tmp_path, island_execution):
+    path = tmp_path / "memory.jsonl"
+    profiler = MemoryProfiler(interval=2, path=str(path))
+    ga = GeneticAlgorithm(population_size=20, mutation_rate=0.2, crossover_rate=0.8, elitism_count=1,
+                          selection_method='tournament', tournament_size=3, num_populations=2,
+                          migration_interval=2, seed=0, verbose=False, memory_profile=profiler,
+                          island_execution=island_execution)
+    received = {}
+    ga.run(5, lambda generation, memory, **kwargs: received.setdefault(generation, memory))
+
+    assert [record["generation"] for record in profiler.records] == [0, 2, 4]
+    assert "initialize_populations" in profiler.records[0]["phases"]
+    for name in ('selection', 'crossover', 'evaluation', 'mutation', 'elitism', 'migration', 'callback'):
+        assert profiler.records[1]["phases"][name]["calls"] >= 1
+    assert len(profiler.records[-1]["island_bytes"]) == 2
+    assert "retained" in profiler.records[-1]
+
+    # O registro é entregue ao callback apenas nas gerações perfiladas
+    assert [generation for generation, memory in received.items() if memory is not None] == [2, 4]
+    assert [json.loads(line)["generation"] for line in path.read_text().splitlines()] == [0, 2, 4]
+    assert not tracemalloc.is_tracing()
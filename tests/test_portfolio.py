@@ -0,0 +1,75 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.distance_matrix import candidate_lists
+from tsp_genetic_algorithm_ai.initialization import close_tours, nearest_neighbor_tours
+from tsp_genetic_algorithm_ai.local_search import two_opt
+from tsp_genetic_algorithm_ai.Location import Location
+from tsp_genetic_algorithm_ai.distance_matrix import build_distance_matrix, random_instance
+from tsp_genetic_algorithm_ai.portfolio import DEFAULT_ENGINES, Exchange, Incumbent, solve_portfolio
+
+
+def test_inject_tours_replaces_worst_and_updates_best():
+    locations, distance_matrix = random_instance(40, 2)
+    ga = GeneticAlgorithm(population_size=30, mutation_rate=0.2, crossover_rate=0.8, elitism_count=2,
+                          selection_method='tournament', tournament_size=3, num_populations=2,
+                          locations=locations, distance_matrix=distance_matrix, seed=0, verbose=False)
+    ga.run(3)
+    cycle = two_opt(nearest_neighbor_tours(distance_matrix, [0])[0], distance_matrix, candidate_lists(distance_matrix))
+    tour = close_tours(cycle[None])[0]
+    assert ga.fitness(tour[None])[0] > ga.global_best_fitness
+
+    ga.inject_tours(tour)
+    for population, fitness_values in zip(ga.populations, ga.population_fitness):
+        assert any(np.array_equal(individual, tour) for individual in population)
+        assert np.allclose(fitness_values, ga.fitness(population))
+    assert np.array_equal(ga.global_best_tour, tour)
+
+
+@pytest.mark.parametrize('name', [name for name, parameters in DEFAULT_ENGINES.items() if parameters is not None])
+def test_default_engines_run_on_large_haversine_instance(name):
+    # Rotas de dezenas de milhares de km: nenhum motor pode depender de uma escala fixa de fitness
+    rng = np.random.default_rng(0)
+    points = np.column_stack((rng.uniform(-30, -5, 80), rng.uniform(-60, -35, 80)))
+    locations = [Location(i, f"Local {i}", *point) for i, point in enumerate(points)]
+    ga = GeneticAlgorithm(**DEFAULT_ENGINES[name], locations=locations, distance_matrix=build_distance_matrix(locations),
+                          seed=0, verbose=False, history_points=None)
+    _, best_fitness = ga.run(5)
+    assert ga.fitness_distance(best_fitness) > 1000
+
+
+def test_exchange_publishes_and_adopts():
+    incumbent = Incumbent(5, multiprocessing.get_context('spawn'))
+    stop = multiprocessing.get_context('spawn').Event()
+    first = Exchange(0, incumbent, stop, target=1.0, share_interval=0.0)
+    second = Exchange(1, incumbent, stop, target=1.0, share_interval=0.0)
+
+    assert first.exchange(3.0, np.array([0, 1, 2, 3, 0])) is None
+    assert np.array_equal(second.exchange(4.0, np.array([0, 3, 2, 1, 0])), [0, 1, 2, 3, 0])
+    assert (first.published, second.adopted) == (1, 1)
+    assert not stop.is_set()
+
+    assert second.exchange(0.5, np.array([0, 2, 1, 3, 0])) is None
+    assert stop.is_set()
+    distance, tour, engine, _ = incumbent.read()
+    assert (distance, engine) == (0.5, 1) and np.array_equal(tour, [0, 2, 1, 3, 0])
+
+
+def test_portfolio_stops_at_target():
+    locations, distance_matrix = random_instance(30, 4)
+    engines = {
+        "tournament": {"population_size": 20, "mutation_rate": 0.2, "crossover_rate": 0.8, "elitism_count": 1,
+                       "selection_method": "tournament", "tournament_size": 3},
+        "local_search": None,
+    }
+    result = solve_portfolio(locations, 30, distance_matrix, engines=engines, target=1e9, seed=0)
+
+    assert result["target_reached"]
+    assert result["elapsed"] < 20
+    assert [engine["engine"] for engine in result["engines"]] == ["tournament", "local_search"]
+    assert all("error" not in engine for engine in result["engines"])
+    assert sorted(result["tour"][1:-1]) == list(range(1, 30))
+    assert np.isclose(result["distance"], distance_matrix[result["tour"][:-1], result["tour"][1:]].sum())
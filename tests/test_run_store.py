@@ -0,0 +1,115 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.mock_data import get_mock_data
+from tsp_genetic_algorithm_ai.run_store import RunStore, instance_key, parameters_key
+
+
+def test_run_round_trip(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite3", batch_size=4)
+    try:
+        first = store.start_run("instance", {"population_size": 10, "mutation_rate": 0.1}, seed=7)
+        for generation, distance in enumerate([30.0, 25.0, 21.5], start=1):
+            store.record_generation(first, generation, distance, generation * 0.1)
+        store.finish_run(first, [0, 2, 1, 0], 21.5, 0.3, 3)
+
+        second = store.start_run("instance", {"mutation_rate": 0.1, "population_size": 10})
+        store.record_generation(second, 1, 40.0, 0.1)
+        store.finish_run(second, [0, 1, 2, 0], 40.0, 0.1, 1)
+
+        # Execução não concluída e de outra instância ficam fora da consulta
+        store.start_run("instance", {"population_size": 10, "mutation_rate": 0.1})
+        other = store.start_run("other", {"population_size": 10, "mutation_rate": 0.1})
+        store.finish_run(other, [0, 0], 1.0, 0.1, 1)
+
+        runs = store.query_runs("instance", {"population_size": 10, "mutation_rate": 0.1})
+        assert sorted(runs["id"].tolist()) == sorted([first, second])
+        # Ordem de started_at: empates de relógio não devem tornar o teste instável
+        order = np.argsort(runs["id"] != first, kind='stable')
+        assert np.array_equal(runs["distance"][order], [21.5, 40.0])
+        assert np.array_equal(runs["generations"][order], [3, 1])
+        assert runs["seed"][order[0]] == 7 and np.isnan(runs["seed"][order[1]])
+        assert [runs["best_tour"][i] for i in order] == [[0, 2, 1, 0], [0, 1, 2, 0]]
+
+        curves = store.convergence([first, second])
+        assert np.array_equal(curves[0], [30.0, 25.0, 21.5])
+        assert curves[1, 0] == 40.0 and np.all(np.isnan(curves[1, 1:]))
+    finally:
+        store.close()
+
+    # Os dados persistem para uma nova instância do RunStore
+    reopened = RunStore(tmp_path / "runs.sqlite3")
+    try:
+        assert len(reopened.query_runs("instance")["id"]) == 2
+    finally:
+        reopened.close()
+
+
+def test_keys_are_stable():
+    locations = get_mock_data()
+    matrix = np.arange(16.0).reshape(4, 4)
+    assert instance_key(locations[:4], matrix) == instance_key(locations[:4], matrix.copy())
+    assert instance_key(locations[:4], matrix) != instance_key(locations[:4], matrix + 1)
+    assert parameters_key({"a": 1, "b": 2}) == parameters_key({"b": 2, "a": 1})
+    assert parameters_key({"a": 1}) != parameters_key({"a": 2})
+
+
+def test_engine_records_runs(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite3")
+    try:
+        ga = GeneticAlgorithm(20, 0.2, 0.8, 1, run_store=store, seed=3, verbose=False)
+        _, best_fitness = ga.run(8)
+        runs = store.query_runs(instance_key(ga.locations, ga.distance_matrix))
+
+        assert len(runs["id"]) == 1 and runs["generations"][0] == 8
+        assert np.isclose(runs["distance"][0], ga.fitness_distance(best_fitness))
+        assert runs["best_tour"][0] == [ga.locations[i].id for i in ga.global_best_tour]
+        curve = store.convergence(runs["id"])[0]
+        assert len(curve) == 8 and np.all(np.diff(curve) <= 0) and np.isclose(curve[-1], runs["distance"][0])
+    finally:
+        store.close()
+
+
+def test_finish_run_persists_without_close(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite3")
+    run_id = store.start_run("instance", {"population_size": 10})
+    store.finish_run(run_id, [0, 1, 0], 5.0, 0.1, 1)
+    # finish_run espera a gravação: outra conexão já enxerga o resultado
+    with sqlite3.connect(tmp_path / "runs.sqlite3") as connection:
+        assert connection.execute("SELECT distance FROM runs WHERE id = ?", (run_id,)).fetchone() == (5.0,)
+    store.close()
+
+
+def test_write_errors_are_raised(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite3")
+    run_id = store.start_run("instance", {"population_size": 10})
+    store.flush()
+    with sqlite3.connect(tmp_path / "runs.sqlite3") as connection:
+        connection.execute("DROP TABLE generations")
+
+    store.record_generation(run_id, 1, 5.0, 0.1)
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    # O erro é relançado uma única vez, e a thread de gravação continua ativa
+    store.finish_run(run_id, [0, 1, 0], 5.0, 0.1, 1)
+
+    store.record_generation(run_id, 2, 3.0, 0.3)
+    with pytest.raises(sqlite3.OperationalError):
+        store.close()
+
+
+def test_engine_records_numpy_ids(tmp_path):
+    locations = get_mock_data()[:8]
+    for index, location in enumerate(locations):
+        location.id = np.int64(index)
+    store = RunStore(tmp_path / "runs.sqlite3")
+    try:
+        ga = GeneticAlgorithm(10, 0.2, 0.8, 1, locations=locations, run_store=store, seed=0, verbose=False)
+        ga.run(3)
+        runs = store.query_runs()
+        assert runs["best_tour"][0] == [int(ga.locations[i].id) for i in ga.global_best_tour]
+    finally:
+        store.close()
@@ -0,0 +1,192 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tsp_genetic_algorithm_ai import service
+from tsp_genetic_algorithm_ai.distance_matrix import random_instance
+from tsp_genetic_algorithm_ai.service import ServiceUnavailable, SolveService, create_server, solve_request
+
+
+def instance_request(**fields):
+    locations, distance_matrix = random_instance(12, 0)
+    return {
+        "locations": [{"id": location.id, "name": location.name} for location in locations],
+        "distance_matrix": distance_matrix.tolist(),
+        "deadline": 0.2,
+        **fields,
+    }
+
+
+@pytest.mark.parametrize('fields', [
+    {"parameters": {"seed": 1}},
+    {"parameters": {"history_points": 10}},
+    {"parameters": {"no_such_parameter": 1}},
+    {"parameters": [1, 2]},
+    {"seed": "1"},
+    {"distance_matrix": [[0.0, 1.0], [1.0, 0.0]]},
+    {"locations": [{"id": 0}]},
+])
+def test_invalid_requests_rejected(fields):
+    with pytest.raises(ValueError):
+        solve_request(instance_request(**fields))
+
+
+def test_valid_request_solved():
+    result = solve_request(instance_request(seed=3, generations=5, parameters={
+        "population_size": 10, "mutation_rate": 0.2, "crossover_rate": 0.8, "elitism_count": 1,
+        "selection_method": "tournament", "tournament_size": 3}))
+    assert sorted(result["tour"][1:-1]) == list(range(1, 12)) and result["generations"] == 5
+
+
+def test_queue_full_rejected():
+    solve_service = SolveService(workers=1, queue_size=1)
+    try:
+        solve_service.admit(1.0)
+        solve_service.admit(1.0)
+        with pytest.raises(ServiceUnavailable) as error:
+            solve_service.admit(1.0)
+        assert error.value.retry_after >= 1
+        # A espera estimada (1 s na fila) não cabe em max_latency
+        solve_service.release(1.0)
+        with pytest.raises(ServiceUnavailable):
+            solve_service.admit(1.0, max_latency=1.5)
+        assert solve_service.status()["requests"]["rejected"] == 2
+    finally:
+        solve_service.close()
+
+
+def queued_service(monkeypatch, solve_seconds):
+    # Um único executor em processo: a segunda requisição espera a primeira na fila
+    deadlines = []
+
+    def slow_solve(locations, deadline, **kwargs):
+        deadlines.append(deadline)
+        time.sleep(solve_seconds)
+        return {"tour": [location.id for location in locations] + [locations[0].id], "distance": 1.0,
+                "mode": "ga", "generations": 1}
+
+    monkeypatch.setattr(service, "solve", slow_solve)
+    solve_service = SolveService(workers=1, queue_size=1)
+    solve_service.executor.shutdown()
+    solve_service.executor = ThreadPoolExecutor(max_workers=1)
+    return solve_service, deadlines
+
+
+def run_concurrently(solve_service, requests):
+    results = [None] * len(requests)
+
+    def run(idx):
+        try:
+            results[idx] = solve_service.solve(requests[idx])
+        except Exception as error:
+            results[idx] = error
+
+    threads = []
+    for idx in range(len(requests)):
+        threads.append(threading.Thread(target=run, args=(idx,)))
+        threads[-1].start()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_queue_wait_deducted_from_deadline(monkeypatch):
+    solve_service, deadlines = queued_service(monkeypatch, 0.3)
+    try:
+        results = run_concurrently(solve_service, [instance_request(deadline=1.0), instance_request(deadline=1.0)])
+    finally:
+        solve_service.close()
+
+    assert all(isinstance(result, dict) for result in results)
+    # A segunda requisição esperou a primeira (0,3 s) antes de sair da fila
+    assert deadlines[0] > 0.9 and deadlines[1] < 0.75
+
+
+def test_deadline_expired_in_queue(monkeypatch):
+    solve_service, deadlines = queued_service(monkeypatch, 0.3)
+    try:
+        results = run_concurrently(solve_service, [instance_request(deadline=1.0), instance_request(deadline=0.1)])
+        status = solve_service.status()
+    finally:
+        solve_service.close()
+
+    assert isinstance(results[0], dict) and isinstance(results[1], TimeoutError)
+    assert len(deadlines) == 1
+    assert status["requests"]["expired"] == 1
+
+
+def test_deadline_spent_loading_instance(monkeypatch):
+    load_instance = service.load_instance
+
+    def slow_load(request):
+        time.sleep(0.15)
+        return load_instance(request)
+
+    monkeypatch.setattr(service, "load_instance", slow_load)
+    # Ainda havia prazo ao sair da fila, mas ele acaba durante a carga
+    with pytest.raises(TimeoutError):
+        solve_request(instance_request(deadline=0.1, deadline_at=time.time() + 0.1))
+
+
+@pytest.fixture
+def http_server():
+    server = create_server(port=0, workers=1, queue_size=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.service.close()
+
+
+def http(url, body=None):
+    data = None if body is None else json.dumps(body).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=30) as response:
+            return response.status, dict(response.headers), json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, dict(error.headers), json.loads(error.read())
+
+
+def test_http_endpoints(http_server):
+    server, url = http_server
+    status, _, body = http(f"{url}/health")
+    assert status == 200 and body == {"status": "ok"}
+
+    status, _, result = http(f"{url}/solve", instance_request(seed=0))
+    assert status == 200 and sorted(result["tour"][1:-1]) == list(range(1, 12))
+    assert result["latency"] >= result["elapsed"]
+
+    status, _, metrics = http(f"{url}/metrics")
+    assert status == 200 and metrics["requests"]["accepted"] == 1 and metrics["workers"] == 1
+
+    assert http(f"{url}/solve", [1, 2])[0] == 400
+    assert http(f"{url}/solve", instance_request(deadline=-1))[0] == 400
+    assert http(f"{url}/unknown")[0] == 404
+    assert http(f"{url}/unknown", {})[0] == 404
+
+
+def test_http_rejection_and_timeout(http_server, monkeypatch):
+    server, url = http_server
+    # O único processo está ocupado e a fila tem tamanho zero: a admissão recusa com 429
+    server.service.admit(1.0)
+    try:
+        status, headers, body = http(f"{url}/solve", instance_request())
+    finally:
+        server.service.release(1.0)
+    assert status == 429 and int(headers["Retry-After"]) >= 1 and "Fila cheia" in body["error"]
+
+    def expired(request):
+        raise TimeoutError("O prazo terminou antes de a requisição sair da fila")
+
+    monkeypatch.setattr(server.service, "solve", expired)
+    status, headers, _ = http(f"{url}/solve", instance_request())
+    assert status == 503 and int(headers["Retry-After"]) >= 1
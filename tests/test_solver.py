@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.Location import Location
+from tsp_genetic_algorithm_ai.distance_matrix import random_instance
+from tsp_genetic_algorithm_ai.held_karp import held_karp
+from tsp_genetic_algorithm_ai.solver import choose_mode, solve
+
+# Folga sobre o prazo: cobre o agendamento do sistema e a montagem do resultado em máquinas lentas
+DEADLINE_SLACK = 0.25
+
+
+def assert_valid_result(result, locations, distance_matrix):
+    tour = result["tour"]
+    assert tour[0] == tour[-1] == locations[0].id
+    assert sorted(tour[:-1]) == sorted(location.id for location in locations)
+    indices = np.array(tour)
+    assert np.isclose(result["distance"], distance_matrix[indices[:-1], indices[1:]].sum())
+
+
+@pytest.mark.parametrize('size, deadline', [(60, 0.3), (200, 0.5), (400, 0.05)])
+def test_solve_respects_deadline(size, deadline):
+    locations, distance_matrix = random_instance(size, 0)
+    start = time.perf_counter()
+    result = solve(locations, deadline, distance_matrix=distance_matrix, seed=0)
+    wall = time.perf_counter() - start
+
+    assert result["mode"] == 'ga'
+    assert wall <= deadline + DEADLINE_SLACK
+    assert result["elapsed"] <= wall and result["budget_used"] == pytest.approx(result["elapsed"] / deadline)
+    assert_valid_result(result, locations, distance_matrix)
+
+
+def test_solve_uses_exact_solver_when_it_fits():
+    locations, distance_matrix = random_instance(9, 1)
+    assert choose_mode(9, 1.0) == 'exact'
+    result = solve(locations, 1.0, distance_matrix=distance_matrix)
+    assert result["mode"] == 'exact' and result["generations"] == 0
+    assert np.isclose(result["distance"], held_karp(distance_matrix)[0])
+    assert_valid_result(result, locations, distance_matrix)
+
+
+def test_solve_builds_matrix_from_coordinates():
+    points = np.random.default_rng(2).random((30, 2))
+    locations = [Location(i, f"Local {i}", *point) for i, point in enumerate(points)]
+    result = solve(locations, 0.2, metric='euclidean', seed=0)
+    assert result["mode"] == 'ga' and result["generations"] > 0
+    assert sorted(result["tour"][:-1]) == list(range(30))
+
+
+@pytest.mark.parametrize('deadline', [0, -1.0, float('nan')])
+def test_solve_rejects_non_positive_deadline(deadline):
+    locations, distance_matrix = random_instance(20, 0)
+    with pytest.raises(ValueError):
+        solve(locations, deadline, distance_matrix=distance_matrix)
@@ -0,0 +1,70 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.split import split_giant_tour
+
+
+def route_cost(route, matrix):
+    stops = [0, *route, 0]
+    return sum(matrix[a, b] for a, b in zip(stops[:-1], stops[1:]))
+
+
+def brute_force_split(tour, matrix, demands, capacity, max_route_length=None):
+    # Todas as 2^(n-1) escolhas de cortes entre locais consecutivos da rota gigante
+    best = np.inf
+    for cuts in itertools.product([False, True], repeat=len(tour) - 1):
+        bounds = [0, *(i + 1 for i, cut in enumerate(cuts) if cut), len(tour)]
+        routes = [tour[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        costs = [route_cost(route, matrix) for route in routes]
+        if any(demands[route].sum() > capacity for route in routes):
+            continue
+        if max_route_length is not None and max(costs) > max_route_length:
+            continue
+        best = min(best, sum(costs))
+    return best
+
+
+def random_instance(rng, n, symmetric=True):
+    if symmetric:
+        points = rng.random((n, 2)) * 100
+        matrix = np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    else:
+        matrix = rng.random((n, n)) * 100
+        np.fill_diagonal(matrix, 0)
+    demands = rng.integers(1, 6, n).astype(float)
+    demands[0] = 0
+    return matrix, demands
+
+
+@pytest.mark.parametrize('max_route_length', [None, 250.0])
+@pytest.mark.parametrize('symmetric', [True, False])
+@pytest.mark.parametrize('seed', range(5))
+def test_split_matches_brute_force(seed, symmetric, max_route_length):
+    rng = np.random.default_rng(seed)
+    matrix, demands = random_instance(rng, 10, symmetric)
+    tour = rng.permutation(np.arange(1, 10))
+    capacity = 10.0
+
+    expected = brute_force_split(tour, matrix, demands, capacity, max_route_length)
+    if not np.isfinite(expected):
+        with pytest.raises(ValueError):
+            split_giant_tour(tour, matrix, demands, capacity, max_route_length)
+        return
+
+    distance, routes = split_giant_tour(tour, matrix, demands, capacity, max_route_length)
+    assert np.isclose(distance, expected)
+    # As rotas são trechos contíguos da rota gigante, viáveis e com o custo informado
+    assert [stop for route in routes for stop in route] == tour.tolist()
+    assert all(demands[route].sum() <= capacity for route in routes)
+    assert np.isclose(sum(route_cost(route, matrix) for route in routes), distance)
+    if max_route_length is not None:
+        assert all(route_cost(route, matrix) <= max_route_length + 1e-9 for route in routes)
+
+
+def test_split_rejects_oversized_demand():
+    matrix, demands = random_instance(np.random.default_rng(0), 5)
+    demands[2] = 20
+    with pytest.raises(ValueError):
+        split_giant_tour([1, 2, 3, 4], matrix, demands, 10)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.GeneticAlgorithm import GeneticAlgorithm
+from tsp_genetic_algorithm_ai.steady_state import FitnessIndex
+
+
+def test_fitness_index_tracks_worst_and_best():
+    rng = np.random.default_rng(0)
+    fitness_values = rng.integers(0, 20, 30).astype(float)
+    index = FitnessIndex(fitness_values)
+    for _ in range(500):
+        position = int(rng.integers(0, 30))
+        fitness_values[position] = float(rng.integers(0, 20))
+        index.update(position, fitness_values[position])
+        assert index.worst() == np.argmin(fitness_values)
+        assert index.best() == np.argmax(fitness_values)
+    assert len(index.minimum) <= 4 * len(fitness_values) + 1
+
+
+@pytest.mark.parametrize('replacement', ['worst', 'tournament'])
+@pytest.mark.parametrize('duplicate_control', [None, 'replace'])
+def test_steady_state_run_identical(replacement, duplicate_control):
+    results = []
+    for backend in ('python', 'numpy'):
+        ga = GeneticAlgorithm(
+            population_size=40, mutation_rate=0.2, crossover_rate=0.8, selection_method='tournament',
+            tournament_size=3, backend=backend, seed=2024, model='steady_state', replacement=replacement,
+            duplicate_control=duplicate_control, mutation_operators={'swap': 1, 'inversion': 1}, verbose=False
+        )
+        fitnesses = []
+        ga.run(25, lambda global_best_fitness, **kwargs: fitnesses.append(global_best_fitness))
+        results.append((fitnesses, ga.populations[0].copy()))
+
+        # Fitness mantido incrementalmente igual ao da avaliação completa
+        assert np.allclose(ga.population_fitness[0], ga.fitness(ga.populations[0]))
+        assert ga.evaluations == 25 * 40
+        # Substituição apenas por filhos melhores: o melhor nunca piora
+        assert fitnesses == sorted(fitnesses)
+
+    (fitness_python, population_python), (fitness_numpy, population_numpy) = results
+    assert fitness_python == fitness_numpy
+    assert np.array_equal(population_python, population_numpy)
+
+
+def test_steady_state_rejects_invalid_parameters():
+    with pytest.raises(ValueError):
+        GeneticAlgorithm(population_size=10, mutation_rate=0.1, crossover_rate=0.8, model='incremental')
+    with pytest.raises(ValueError):
+        GeneticAlgorithm(population_size=10, mutation_rate=0.1, crossover_rate=0.8, model='steady_state',
+                         steady_state_offspring=3)
@@ -0,0 +1,65 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from tsp_genetic_algorithm_ai.distance_matrix import random_instance
+from tsp_genetic_algorithm_ai.tuning import (configurations_cost, evaluate, full_budget_cost, grid_size,
+                                             sample_configurations, successive_halving, tune)
+
+SMALL_SPACE = {
+    "population_size": [10, 20],
+    "mutation_rate": [0.05, 0.3],
+    "crossover_rate": [0.8],
+    "elitism_count": [0, 2],
+    "tournament_size": [2, 3],
+    "num_populations": [1, 2],
+    "migration_interval": [5],
+    "migration_count": [1],
+}
+
+
+def test_sample_configurations_are_distinct_and_in_space():
+    configurations = sample_configurations(SMALL_SPACE, 20, np.random.default_rng(0))
+    assert len(configurations) == 20
+    assert len({tuple(sorted(c.items())) for c in configurations}) == 20
+    for configuration in configurations:
+        assert all(configuration[name] in values for name, values in SMALL_SPACE.items())
+
+    # Pedidos maiores que a grade devolvem a grade inteira
+    assert len(sample_configurations(SMALL_SPACE, 1000, np.random.default_rng(1))) == grid_size(SMALL_SPACE) == 32
+
+
+def test_full_budget_cost_matches_enumerated_grid():
+    grid = [dict(zip(SMALL_SPACE, values)) for values in itertools.product(*SMALL_SPACE.values())]
+    assert len(grid) == grid_size(SMALL_SPACE)
+    assert full_budget_cost(SMALL_SPACE, 1e-6, 100, 2) == pytest.approx(configurations_cost(grid, 1e-6, 100, 2))
+    assert configurations_cost(grid[:1], 2.0, 3, 2) == 2.0 * 10 * 1 * 3 * 2
+
+
+def test_successive_halving_rounds():
+    locations, distance_matrix = random_instance(15, 0)
+    configurations = sample_configurations(SMALL_SPACE, 9, np.random.default_rng(2))
+    result = successive_halving(locations, distance_matrix, configurations, min_generations=4, max_generations=36,
+                                eta=3, seeds=(0, 1), max_workers=1)
+
+    assert [entry["configurations"] for entry in result["rounds"]] == [9, 3, 1]
+    assert [entry["generations"] for entry in result["rounds"]] == [4, 12, 36]
+    assert result["best_configuration"] in configurations
+    assert result["cpu_time"] == pytest.approx(sum(entry["cpu_time"] for entry in result["rounds"]))
+    # Rodadas 2 e 3 refazem 4 e 12 gerações das suas 12 e 36
+    rounds = result["rounds"]
+    assert result["rerun_cpu_time"] == pytest.approx(rounds[1]["cpu_time"] / 3 + rounds[2]["cpu_time"] / 3)
+
+    # Cada rodada executa desde a geração 0: a última rodada é uma execução independente com 36 gerações
+    fresh = [evaluate(result["best_configuration"], locations, distance_matrix, 36, seed)[0] for seed in (0, 1)]
+    assert result["best_distance"] == pytest.approx(np.mean(fresh))
+
+
+def test_tune_reports_budget_estimates():
+    locations, distance_matrix = random_instance(12, 1)
+    result = tune(locations, distance_matrix, configurations=4, space=SMALL_SPACE, min_generations=3,
+                  max_generations=9, seeds=(0,), max_workers=1)
+    assert result["grid_size"] == 32
+    assert 0 < result["sampled_cpu_time"] < result["grid_cpu_time"]
+    assert result["best_distance"] > 0